@@ -0,0 +1,99 @@
+"""Benchmark: ANN (IVF/HNSW) recall@k and latency vs. exact search.
+
+실행: python -m benchmarks.bench_ann [--rows 100000] [--dim 128]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.indexing.ann_index import AnnIndex
+from src.indexing.embeddings import LocalHashEmbeddings
+from src.indexing.vector_store import MmapVectorStore
+
+
+def make_vectors(rng, rows: int, dim: int, clusters: int, latent_dim: int = 32) -> np.ndarray:
+    """임베딩처럼 저차원 구조를 가진 군집 벡터 (잠재 공간 군집 → 선형 사상 + 잡음)"""
+    projection = np.random.default_rng(1).normal(size=(latent_dim, dim)).astype(np.float32)
+    centers = np.random.default_rng(2).normal(size=(clusters, latent_dim)).astype(np.float32)
+    latent = centers[rng.integers(clusters, size=rows)]
+    latent += 0.5 * rng.normal(size=(rows, latent_dim)).astype(np.float32)
+    vectors = latent @ projection
+    vectors += 0.1 * np.sqrt(latent_dim) * rng.normal(size=(rows, dim)).astype(np.float32)
+    return vectors
+
+
+def run_queries(store: MmapVectorStore, queries: np.ndarray, k: int):
+    """쿼리별 (결과 행 집합, 지연 초)"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows, _ = store.top_k(query, k)
+        latencies.append(time.perf_counter() - start)
+        results.append(set(int(r) for r in rows))
+    return results, np.array(latencies)
+
+
+def fill(store: MmapVectorStore, vectors: np.ndarray, batch: int = 50000):
+    for start in range(0, len(vectors), batch):
+        part = vectors[start:start + batch]
+        store.add_vectors(
+            part, [""] * len(part), ids=[str(start + i) for i in range(len(part))]
+        )
+
+
+def report(name: str, truth, results, latencies, k: int):
+    recall = np.mean([len(t & r) / k for t, r in zip(truth, results)])
+    print(
+        f"{name:>22} {recall:>9.3f} {np.percentile(latencies, 50) * 1000:>9.2f}"
+        f" {np.percentile(latencies, 95) * 1000:>9.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(rng, args.rows, args.dim, args.clusters)
+    queries = make_vectors(rng, args.queries, args.dim, args.clusters)
+    embeddings = LocalHashEmbeddings(dim=args.dim)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        exact = MmapVectorStore(str(root / "exact"), embeddings)
+        fill(exact, vectors)
+        truth, latencies = run_queries(exact, queries, args.k)
+
+        print(f"rows={args.rows} dim={args.dim} k={args.k}")
+        print(f"{'index':>22} {'recall@k':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        report("exact", truth, truth, latencies, args.k)
+
+        configs = [
+            ("ivf", {}, "nprobe", [1, 4, 16, 64]),
+            ("hnsw", {}, "ef_search", [16, 32, 64, 128]),
+        ]
+        for kind, params, knob, values in configs:
+            store = MmapVectorStore(
+                str(root / kind), embeddings, ann=AnnIndex(kind, min_rows=0, **params)
+            )
+            fill(store, vectors)
+            start = time.perf_counter()
+            store.persist()
+            build_time = time.perf_counter() - start
+            for value in values:
+                store.ann.set_search_params(**{knob: value})
+                results, latencies = run_queries(store, queries, args.k)
+                report(f"{kind} {knob}={value}", truth, results, latencies, args.k)
+            print(f"{kind} build+save: {build_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: chunk_file cost vs. file size.
+
+실행: python -m benchmarks.bench_chunking [--language typescript]
+"""
+import argparse
+import ast
+import tempfile
+import time
+from pathlib import Path
+
+from src.indexing.codebase_indexer import extract_chunks
+
+
+def make_source(num_functions: int) -> str:
+    """함수 num_functions개를 가진 Python 소스 생성"""
+    parts = []
+    for i in range(num_functions):
+        parts.append(
+            f"def function_{i}(a, b):\n"
+            f"    \"\"\"Docstring {i}.\"\"\"\n"
+            f"    total = a + b + {i}\n"
+            f"    return total * 2\n"
+        )
+    return "\n\n".join(parts)
+
+
+def make_ts_source(num_functions: int) -> str:
+    """Python 소스와 같은 구조의 TypeScript 소스 생성"""
+    parts = []
+    for i in range(num_functions):
+        parts.append(
+            f"/** Docstring {i}. */\n"
+            f"export function function_{i}(a: number, b: number): number {{\n"
+            f"    const total = a + b + {i};\n"
+            f"    return total * 2;\n"
+            f"}}\n"
+        )
+    return "\n\n".join(parts)
+
+
+def legacy_chunk(file_path: Path):
+    """기존 구현: 노드마다 파일을 다시 읽고 get_source_segment 호출"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return [
+        ast.get_source_segment(open(file_path).read(), node) or ""
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef))
+    ]
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="50,100,200,400,800,1600")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--language", choices=["python", "typescript"], default="python",
+        help="typescript는 tree-sitter 경로 측정 (기존 구현 없음)"
+    )
+    parser.add_argument(
+        "--legacy-max", type=int, default=400,
+        help="기존 구현은 이차 시간이 걸리므로 이 크기까지만 측정"
+    )
+    args = parser.parse_args()
+
+    print(f"{'functions':>10} {'bytes':>10} {'new ms':>9} {'us/KB':>8} {'legacy ms':>10} {'us/KB':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        for size in (int(s) for s in args.sizes.split(",")):
+            if args.language == "typescript":
+                file_path = root / f"bench_{size}.ts"
+                file_path.write_text(make_ts_source(size))
+            else:
+                file_path = root / f"bench_{size}.py"
+                file_path.write_text(make_source(size))
+            kb = file_path.stat().st_size / 1024
+
+            new = best_of(lambda: extract_chunks(file_path, root), args.repeat)
+            line = f"{size:>10} {file_path.stat().st_size:>10} {new * 1e3:>9.2f} {new * 1e6 / kb:>8.1f}"
+            if args.language == "python" and size <= args.legacy_max:
+                legacy = best_of(lambda: legacy_chunk(file_path), args.repeat)
+                line += f" {legacy * 1e3:>10.2f} {legacy * 1e6 / kb:>8.1f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
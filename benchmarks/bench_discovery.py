@@ -0,0 +1,74 @@
+"""Benchmark: file discovery on a tree with a large node_modules.
+
+실행: python -m benchmarks.bench_discovery
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.file_walker import FileWalker
+
+
+EXTENSIONS = [".py", ".js", ".ts", ".jsx", ".tsx"]
+
+
+def make_tree(root: Path, source_files: int, vendor_packages: int, files_per_package: int):
+    """소스 파일과 큰 node_modules를 가진 합성 프로젝트 생성"""
+    for i in range(source_files):
+        ext = EXTENSIONS[i % len(EXTENSIONS)]
+        path = root / "src" / f"module_{i % 20}" / f"file_{i}{ext}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+    for p in range(vendor_packages):
+        package = root / "node_modules" / f"package_{p}" / "lib"
+        package.mkdir(parents=True, exist_ok=True)
+        for f in range(files_per_package):
+            (package / f"index_{f}.js").write_text("module.exports = {};\n")
+    (root / ".gitignore").write_text("node_modules/\n*.log\n")
+
+
+def legacy_discover(root: Path):
+    """기존 구현: 확장자마다 rglob로 전체 트리 순회"""
+    files = []
+    for ext in EXTENSIONS:
+        files.extend(root.rglob(f"*{ext}"))
+    return files
+
+
+def walker_discover(root: Path):
+    return list(FileWalker(str(root), extensions=EXTENSIONS).iter_files())
+
+
+def best_of(func, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source-files", type=int, default=2000)
+    parser.add_argument("--vendor-packages", type=int, default=1000)
+    parser.add_argument("--files-per-package", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_tree(root, args.source_files, args.vendor_packages, args.files_per_package)
+
+        legacy_time, legacy_files = best_of(lambda: legacy_discover(root), args.repeat)
+        walker_time, walker_files = best_of(lambda: walker_discover(root), args.repeat)
+
+    print(f"{'method':>10} {'files':>8} {'ms':>10}")
+    print(f"{'rglob':>10} {len(legacy_files):>8} {legacy_time * 1000:>10.1f}")
+    print(f"{'walker':>10} {len(walker_files):>8} {walker_time * 1000:>10.1f}")
+    print(f"speedup: {legacy_time / walker_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
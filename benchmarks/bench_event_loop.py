@@ -0,0 +1,112 @@
+"""Benchmark: event-loop lag while concurrent sessions use FileSystemTools.
+
+실행: python -m benchmarks.bench_event_loop [--sessions 8] [--large-mb 32]
+
+각 세션은 큰 파일 읽기, 작은 파일 여러 개 읽기, 재귀 목록 조회, 내용 검색을 반복한다.
+1ms마다 깨어나는 코루틴이 예정 시각보다 얼마나 늦게 실행되는지(이벤트 루프 지연)를
+이벤트 루프에서 직접 블로킹 I/O를 하는 방식(blocking)과 I/O 스레드 풀(pool)로 비교한다.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.mcp.tools import file_system
+from src.mcp.tools.file_system import FileSystemTools
+
+
+def make_tree(root: Path, small_files: int, large_mb: int):
+    """작은 소스 파일 여러 개와 큰 로그 파일 하나 생성"""
+    for i in range(small_files):
+        path = root / "src" / f"pkg_{i % 16}" / f"module_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("def handler_%d(request):\n    return request.body\n" % i * 40)
+    line = "2024-01-01T00:00:00 INFO request handled in 3ms path=/api/v1/items\n"
+    with open(root / "large.log", "w") as f:
+        f.write(line * (large_mb * 2**20 // len(line)))
+
+
+class BlockingTools:
+    """변경 전 동작: async 함수 안에서 블로킹 I/O를 바로 실행"""
+
+    @staticmethod
+    async def read_file(path: str) -> str:
+        return file_system._read_text(path)
+
+    @staticmethod
+    async def read_many(paths: List[str]) -> List[str]:
+        return [file_system._read_text(path) for path in paths]
+
+    @staticmethod
+    async def list_files(directory: str, pattern: str = "*", recursive: bool = False) -> List[str]:
+        return file_system._list_files(directory, pattern, recursive)
+
+    @staticmethod
+    async def search_files(directory: str, query: str, file_extensions=None) -> List[str]:
+        return file_system._search_files(directory, query, file_extensions)
+
+
+async def session(tools, root: Path, small: List[str], rounds: int):
+    for i in range(rounds):
+        await tools.read_file(str(root / "large.log"))
+        await tools.read_many(small[i * 20:(i + 1) * 20])
+        await tools.list_files(str(root / "src"), "*.py", recursive=True)
+        await tools.search_files(str(root / "src"), f"handler_{i}(", [".py"])
+
+
+async def measure(tools, root: Path, sessions: int, rounds: int) -> Dict[str, float]:
+    small = sorted(str(p) for p in (root / "src").rglob("*.py"))
+    lags: List[float] = []
+    running = True
+
+    async def monitor():
+        interval = 0.001
+        while running:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    monitor_task = asyncio.create_task(monitor())
+    start = time.perf_counter()
+    await asyncio.gather(*(session(tools, root, small, rounds) for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    running = False
+    await monitor_task
+
+    values = np.asarray(lags) * 1000
+    return {
+        "wall_seconds": elapsed,
+        "lag_p50_ms": float(np.percentile(values, 50)),
+        "lag_p99_ms": float(np.percentile(values, 99)),
+        "lag_max_ms": float(values.max()),
+        "ticks": len(values)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--small-files", type=int, default=400)
+    parser.add_argument("--large-mb", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        make_tree(root, args.small_files, args.large_mb)
+        print(f"sessions={args.sessions} rounds={args.rounds} io_workers={file_system.IO_WORKERS}")
+        print(f"{'mode':>9} {'wall s':>8} {'lag p50':>9} {'lag p99':>9} {'lag max':>9} {'ticks':>7}")
+        for mode, tools in (("blocking", BlockingTools), ("pool", FileSystemTools)):
+            result = asyncio.run(measure(tools, root, args.sessions, args.rounds))
+            print(
+                f"{mode:>9} {result['wall_seconds']:>8.2f} {result['lag_p50_ms']:>9.2f}"
+                f" {result['lag_p99_ms']:>9.2f} {result['lag_max_ms']:>9.2f} {result['ticks']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
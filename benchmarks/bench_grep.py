@@ -0,0 +1,125 @@
+"""Benchmark: content search (search_files / grep) on a large synthetic tree.
+
+실행: python -m benchmarks.bench_grep [--files 100000] [--workers N] [--keep DIR]
+
+작은 소스 파일 여러 개, 큰 로그 파일 몇 개, 바이너리 파일, node_modules가 섞인 트리를 만들고
+변경 전 구현(파일 전체를 str로 읽고 소문자 복사본에서 검색)과 grep 엔진(바이트 패턴,
+mmap, 프로세스 풀)을 비교한다. 드문 검색어(모든 파일 스캔), 흔한 검색어, max_results로
+조기 종료하는 줄 단위 grep과 첫 매치까지의 지연을 측정한다.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from src.utils.file_walker import FileWalker
+from src.utils.grep_engine import iter_grep
+
+
+def make_tree(root: Path, files: int, seed: int = 0):
+    """소스 파일, 큰 로그, 바이너리, node_modules가 섞인 트리 생성"""
+    rng = random.Random(seed)
+    words = ["request", "response", "handler", "session", "config", "payload", "cache", "token"]
+    for i in range(files):
+        body = "".join(
+            f"def {rng.choice(words)}_{rng.randrange(1000)}(value):\n"
+            f"    return value.{rng.choice(words)} + {rng.randrange(100)}\n"
+            for _ in range(rng.randrange(5, 60))
+        )
+        if i % 5000 == 0:
+            body += "RARE_MARKER = True\n"
+        path = root / "src" / f"pkg_{i % 100}" / f"mod_{i // 100 % 100}" / f"file_{i}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body)
+    line = "2024-01-01T00:00:00 INFO request handled in 3ms path=/api/v1/items\n"
+    for i in range(4):
+        (root / "logs").mkdir(exist_ok=True)
+        (root / "logs" / f"app_{i}.log").write_text(line * 120000)
+    for i in range(200):
+        (root / "assets").mkdir(exist_ok=True)
+        (root / "assets" / f"blob_{i}.bin").write_bytes(os.urandom(32 * 1024) + b"\0")
+    (root / "node_modules" / "lib").mkdir(parents=True, exist_ok=True)
+    for i in range(1000):
+        (root / "node_modules" / "lib" / f"dep_{i}.js").write_text("RARE_MARKER\n" * 50)
+
+
+def legacy_search(directory: str, query: str) -> List[str]:
+    """변경 전 search_files: 파일마다 전체를 디코딩하고 소문자 복사본에서 검색"""
+    results = []
+    needle = query.lower()
+    for file_path in FileWalker(directory).iter_files():
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                if needle in f.read().lower():
+                    results.append(str(file_path))
+        except (UnicodeDecodeError, PermissionError):
+            continue
+    return results
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def first_result_seconds(iterator) -> float:
+    start = time.perf_counter()
+    next(iterator, None)
+    elapsed = time.perf_counter() - start
+    iterator.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=None, help="grep 엔진 프로세스 수")
+    parser.add_argument("--keep", type=Path, help="트리를 임시 디렉토리 대신 이 경로에 생성/재사용")
+    args = parser.parse_args()
+
+    def run(root: Path):
+        if not (root / "src").exists():
+            elapsed, _ = timed(lambda: make_tree(root, args.files))
+            print(f"generated {args.files} files in {elapsed:.1f}s")
+        directory = str(root)
+        # 파일 시스템 캐시 데우기
+        legacy_search(directory, "warmup")
+
+        print(f"cpu_count={os.cpu_count()} workers={args.workers or os.cpu_count()}")
+        print(f"{'case':<34} {'legacy s':>9} {'engine s':>9} {'speedup':>8} {'hits':>7}")
+        for query in ("RARE_MARKER", "handler_42("):
+            legacy_time, legacy = timed(lambda: legacy_search(directory, query))
+            engine_time, engine = timed(lambda: [
+                m["file_path"] for m in iter_grep(directory, query, files_only=True, workers=args.workers)
+            ])
+            assert sorted(legacy) == sorted(engine), "engine and legacy results differ"
+            print(
+                f"{'search_files ' + query:<34} {legacy_time:>9.2f} {engine_time:>9.2f}"
+                f" {legacy_time / engine_time:>7.1f}x {len(engine):>7}"
+            )
+
+        elapsed, matches = timed(lambda: list(iter_grep(
+            directory, r"def \w+_7\d\d\(", regex=True, context=2, workers=args.workers
+        )))
+        print(f"{'grep regex context=2 (all)':<34} {'-':>9} {elapsed:>9.2f} {'-':>8} {len(matches):>7}")
+        elapsed, matches = timed(lambda: list(iter_grep(
+            directory, "handler", max_results=100, workers=args.workers
+        )))
+        print(f"{'grep max_results=100':<34} {'-':>9} {elapsed:>9.3f} {'-':>8} {len(matches):>7}")
+        elapsed = first_result_seconds(iter_grep(directory, "RARE_MARKER", workers=args.workers))
+        print(f"{'grep first result (rare)':<34} {'-':>9} {elapsed:>9.3f} {'-':>8} {'-':>7}")
+
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+        run(args.keep)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            run(Path(temp_dir))
+
+
+if __name__ == "__main__":
+    main()
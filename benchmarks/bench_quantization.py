@@ -0,0 +1,72 @@
+"""Benchmark: memory and recall@k of quantized vector storage (int8, PQ).
+
+실행: python -m benchmarks.bench_quantization [--rows 100000] [--dim 384]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_ann import fill, make_vectors, run_queries
+from src.indexing.ann_index import AnnIndex
+from src.indexing.embeddings import LocalHashEmbeddings
+from src.indexing.vector_store import MmapVectorStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(rng, args.rows, args.dim, args.clusters)
+    queries = make_vectors(rng, args.queries, args.dim, args.clusters)
+    embeddings = LocalHashEmbeddings(dim=args.dim)
+
+    configs = [
+        ("float32", "float32", None, 0),
+        ("float16", "float16", None, 0),
+        ("int8", "int8", None, 0),
+        (f"int8 rescore={args.rescore}", "int8", None, args.rescore),
+        ("ivfpq", "float32", {}, 0),
+        (f"ivfpq rescore={args.rescore}", "float32", {}, args.rescore),
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        truth = None
+        baseline_bytes = None
+        print(f"rows={args.rows} dim={args.dim} k={args.k}")
+        print(
+            f"{'storage':>20} {'scan MB':>9} {'B/vector':>9} {'reduction':>9}"
+            f" {'recall@k':>9} {'p50 ms':>9}"
+        )
+        for i, (name, dtype, ann_params, rescore) in enumerate(configs):
+            ann = AnnIndex("ivfpq", min_rows=0, **ann_params) if ann_params is not None else None
+            store = MmapVectorStore(
+                str(root / str(i)), embeddings, dtype=dtype, ann=ann, rescore=rescore
+            )
+            fill(store, vectors)
+            store.persist()
+            results, latencies = run_queries(store, queries, args.k)
+            if truth is None:
+                truth = results
+            # 검색 시 상주해야 하는 데이터: ANN이면 색인 코드, 아니면 스캔하는 행렬
+            scan_bytes = ann.memory_bytes() if ann is not None else store.memory_bytes()
+            baseline_bytes = baseline_bytes or scan_bytes
+            recall = np.mean([len(t & r) / args.k for t, r in zip(truth, results)])
+            print(
+                f"{name:>20} {scan_bytes / 2**20:>9.1f} {scan_bytes / args.rows:>9.1f}"
+                f" {baseline_bytes / scan_bytes:>8.1f}x {recall:>9.3f}"
+                f" {np.percentile(latencies, 50) * 1000:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Benchmark suite: indexing throughput and search latency on a synthetic repository.
+
+실행: python -m benchmarks.bench_suite [--files 500] [--output results.json] [--baseline old.json]
+
+로컬 해시 임베딩으로 discover_files, chunk_file, index_project, semantic_search를 측정하고
+결과를 JSON으로 저장한다. --baseline을 주면 이전 결과와 지표별 비율을 출력한다.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from benchmarks.synthetic_repo import generate_repo, make_queries
+from src.indexing.codebase_indexer import CodebaseIndexer
+from src.indexing.embeddings import LocalHashEmbeddings
+
+
+class CountingEmbeddings(LocalHashEmbeddings):
+    """임베딩한 텍스트 수를 세는 로컬 임베딩"""
+    def __init__(self, dim: int):
+        super().__init__(dim=dim)
+        self.embedded = 0
+
+    def embed_array(self, texts):
+        self.embedded += len(texts)
+        return super().embed_array(texts)
+
+
+def peak_rss_mb() -> Dict[str, float]:
+    """현재 프로세스와 종료된 자식 프로세스(청킹 워커)의 최대 RSS (MB)"""
+    # Linux는 KB, macOS는 바이트 단위
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20
+    }
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies) * 1000
+    return {
+        "queries": len(values),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "mean_ms": float(values.mean())
+    }
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def make_indexer(root: Path, args, embeddings: CountingEmbeddings) -> CodebaseIndexer:
+    return CodebaseIndexer(
+        str(root),
+        persist_directory=".bench_index",
+        embeddings=embeddings,
+        use_embedding_cache=False,
+        workers=args.workers,
+        vector_backend=args.vector_backend,
+        vector_index=args.vector_index
+    )
+
+
+def run_suite(root: Path, args) -> Dict[str, Any]:
+    """합성 저장소 생성 후 단계별 측정"""
+    results: Dict[str, Any] = {}
+
+    elapsed, repo = timed(lambda: generate_repo(
+        root, args.files, args.functions_per_file, args.duplication, args.ts_ratio, seed=args.seed
+    ))
+    identifiers = repo.pop("identifiers")
+    results["repo"] = {**repo, "generate_seconds": elapsed}
+
+    embeddings = CountingEmbeddings(args.dim)
+    indexer = make_indexer(root, args, embeddings)
+
+    # discover_files: 파일 시스템 캐시가 데워진 상태의 최선값
+    best, files = float("inf"), []
+    for _ in range(args.repeat):
+        elapsed, files = timed(indexer.discover_files)
+        best = min(best, elapsed)
+    results["discover_files"] = {
+        "files": len(files), "seconds": best, "files_per_sec": len(files) / best
+    }
+
+    # chunk_file: 단일 프로세스 청킹 처리량
+    elapsed, chunk_lists = timed(lambda: [indexer.chunk_file(path) for path in files])
+    chunks = sum(len(c) for c in chunk_lists)
+    results["chunk_file"] = {
+        "files": len(files),
+        "chunks": chunks,
+        "seconds": elapsed,
+        "files_per_sec": len(files) / elapsed,
+        "chunks_per_sec": chunks / elapsed,
+        "mb_per_sec": repo["bytes"] / 2**20 / elapsed
+    }
+
+    # index_project: 청킹 → 임베딩 → 저장 전체
+    elapsed, summary = timed(indexer.index_project)
+    locations = len(indexer.locations)
+    results["index_project"] = {
+        "files": summary["added"],
+        "chunks": locations,
+        "stored_documents": indexer.locations.num_contents(),
+        "embedded_texts": embeddings.embedded,
+        "seconds": elapsed,
+        "files_per_sec": summary["added"] / elapsed,
+        "chunks_per_sec": locations / elapsed,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+    elapsed, _ = timed(indexer.index_project)
+    results["index_project_noop"] = {"seconds": elapsed}
+
+    # 일부 파일 수정 후 증분 인덱싱
+    changed = files[:max(1, int(len(files) * args.change_ratio))]
+    for path in changed:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n\nBENCH_MARKER = 1\n" if path.suffix == ".py" else "\n\nexport const BENCH_MARKER = 1;\n")
+    embedded_before = embeddings.embedded
+    elapsed, summary = timed(indexer.index_project)
+    results["index_project_incremental"] = {
+        "changed_files": summary["changed"],
+        "embedded_texts": embeddings.embedded - embedded_before,
+        "seconds": elapsed
+    }
+
+    # semantic_search: 서로 다른 쿼리로 캐시 미적중 지연, 같은 쿼리 반복으로 캐시 적중 지연
+    queries = make_queries(identifiers, args.queries, seed=args.seed + 1)
+    for name, search in (
+        ("semantic_search", indexer.semantic_search),
+        ("keyword_search", indexer.keyword_search),
+        ("hybrid_search", indexer.hybrid_search)
+    ):
+        indexer.query_cache.clear()
+        latencies = []
+        for query in queries:
+            elapsed, _ = timed(lambda: search(query, k=args.k))
+            latencies.append(elapsed)
+        results[name] = latency_stats(latencies)
+        if name == "semantic_search":
+            latencies = [timed(lambda: search(query, k=args.k))[0] for query in queries]
+            results["semantic_search_cached"] = latency_stats(latencies)
+
+    # 다중 쿼리 검색: 16개씩 한 번에 임베딩/스캔 (쿼리당 지연으로 환산)
+    indexer.query_cache.clear()
+    batch = 16
+    elapsed, _ = timed(lambda: [
+        indexer.semantic_search_many(queries[i:i + batch], k=args.k)
+        for i in range(0, len(queries), batch)
+    ])
+    results["semantic_search_many"] = {
+        "queries": len(queries), "batch": batch, "per_query_ms": elapsed * 1000 / len(queries)
+    }
+
+    # 스트리밍 검색: 첫 결과까지와 complete까지의 지연
+    indexer.query_cache.clear()
+    first, total = [], []
+    for query in queries:
+        start = time.perf_counter()
+        events = indexer.stream_search(query, k=args.k)
+        next(events)
+        first.append(time.perf_counter() - start)
+        for _ in events:
+            pass
+        total.append(time.perf_counter() - start)
+    results["stream_search_first_result"] = latency_stats(first)
+    results["stream_search_complete"] = latency_stats(total)
+
+    # 경로 필터 검색: 쿼리 도메인의 services/<domain> 아래로 제한 (전체의 약 1/32)
+    indexer.query_cache.clear()
+    latencies = []
+    for query in queries:
+        scope = {"path": f"services/{query.split()[1]}"}
+        elapsed, _ = timed(lambda: indexer.semantic_search(query, k=args.k, filters=scope))
+        latencies.append(elapsed)
+    results["semantic_search_filtered"] = latency_stats(latencies)
+
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """중첩 결과를 "단계.지표" 키의 숫자 딕셔너리로 평탄화"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def print_report(results: Dict[str, Any], baseline: Dict[str, Any] = None):
+    current = flatten(results)
+    previous = flatten(baseline["results"]) if baseline else {}
+    header = f"{'metric':<48} {'value':>12}"
+    print(header + (f" {'baseline':>12} {'ratio':>7}" if baseline else ""))
+    for name, value in current.items():
+        line = f"{name:<48} {value:>12.3f}"
+        if name in previous:
+            ratio = value / previous[name] if previous[name] else float("nan")
+            line += f" {previous[name]:>12.3f} {ratio:>6.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--functions-per-file", type=int, default=20)
+    parser.add_argument("--duplication", type=float, default=0.1, help="중복 함수 비율")
+    parser.add_argument("--ts-ratio", type=float, default=0.3, help="TypeScript 파일 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="청킹 프로세스 수")
+    parser.add_argument("--vector-backend", choices=["mmap", "chroma"], default="mmap")
+    parser.add_argument("--vector-index", default="flat")
+    parser.add_argument("--dim", type=int, default=512, help="로컬 임베딩 차원")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--change-ratio", type=float, default=0.05, help="증분 측정 시 수정할 파일 비율")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--keep", type=Path, help="합성 저장소를 임시 디렉토리 대신 이 경로에 생성")
+    args = parser.parse_args()
+
+    if args.keep:
+        args.keep.mkdir(parents=True, exist_ok=True)
+        results = run_suite(args.keep, args)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = run_suite(Path(temp_dir), args)
+
+    report = {
+        "config": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(results, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Synthetic Python/TypeScript repository generator for benchmarks.
+
+실행: python -m benchmarks.synthetic_repo OUTPUT_DIR [--files 500] [--functions-per-file 20]
+"""
+import argparse
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+# 식별자와 디렉토리 이름을 만드는 어휘 (검색 쿼리도 같은 어휘로 생성)
+DOMAINS = ["billing", "auth", "search", "inventory", "shipping", "analytics", "notifications", "users"]
+VERBS = [
+    "parse", "validate", "load", "render", "compute", "fetch", "update", "merge",
+    "encode", "schedule", "resolve", "export", "filter", "normalize", "retry", "sync"
+]
+NOUNS = [
+    "invoice", "token", "session", "query", "order", "payment", "report", "config",
+    "customer", "address", "event", "record", "template", "cache", "batch", "schema"
+]
+LAYERS = ["services", "models", "handlers", "utils"]
+
+
+def identifier(rng: random.Random, domain: str) -> str:
+    return f"{rng.choice(VERBS)}_{domain}_{rng.choice(NOUNS)}"
+
+
+def camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def python_function(name: str, seed: int, indent: str = "") -> str:
+    """본문 길이가 조금씩 다른 Python 함수 소스"""
+    noun = name.split("_")[2]
+    # 메서드는 staticmethod로 만들어 같은 함수가 최상위/클래스 어디에 복사되든 같은 청크가 됨
+    lines = ["@staticmethod"] if indent else []
+    lines += [
+        f"def {name}({noun}, options=None):",
+        f'    """{name.replace("_", " ").capitalize()}."""',
+        "    options = options or {}",
+        "    result = []",
+    ]
+    for i in range(3 + seed % 5):
+        lines.append(f"    if {noun}.get('field_{i}') is not None:")
+        lines.append(f"        result.append({noun}['field_{i}'] * {seed % 97 + i})")
+    lines.append("    return result")
+    return "\n".join(indent + line if line else line for line in lines)
+
+
+def ts_function(name: str, seed: int, method: bool = False) -> str:
+    """Python 함수와 같은 구조의 TypeScript 함수/메서드 소스"""
+    noun = name.split("_")[2]
+    fn = camel(name)
+    indent = "  " if method else ""
+    lines = [f"/** {name.replace('_', ' ').capitalize()}. */"]
+    if method:
+        lines.append(f"{fn}({noun}: Record<string, number>): number[] {{")
+    else:
+        lines.append(f"export function {fn}({noun}: Record<string, number>): number[] {{")
+    lines.append("  const result: number[] = [];")
+    for i in range(3 + seed % 5):
+        lines.append(f"  if ({noun}.field{i} !== undefined) {{")
+        lines.append(f"    result.push({noun}.field{i} * {seed % 97 + i});")
+        lines.append("  }")
+    lines.append("  return result;")
+    lines.append("}")
+    return "\n".join(indent + line for line in lines)
+
+
+def generate_repo(
+    root: Path,
+    files: int = 200,
+    functions_per_file: int = 20,
+    duplication: float = 0.1,
+    ts_ratio: float = 0.3,
+    class_ratio: float = 0.5,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    합성 저장소 생성
+
+    도메인/계층 디렉토리(services/billing/... 등)에 Python과 TypeScript 파일을 만든다.
+    파일의 일부 함수는 클래스 메서드로 묶이고, duplication 비율만큼의 함수는 공유 풀의
+    함수를 그대로 복사하여 (vendored 유틸 등) 중복 청크를 만든다.
+
+    Args:
+        root: 생성할 디렉토리
+        files: 파일 수
+        functions_per_file: 파일당 함수 수
+        duplication: 다른 파일과 내용이 같은 함수의 비율 (0~1)
+        ts_ratio: TypeScript 파일 비율 (0~1)
+        class_ratio: 클래스 메서드로 묶이는 함수의 비율 (0~1)
+        seed: 난수 시드
+
+    Returns:
+        생성 통계 (files, functions, duplicated_functions, bytes, identifiers)
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    # 공유 풀: 여러 파일에 그대로 복사되는 함수 (이름과 본문이 같아야 같은 청크)
+    shared = [(f"{identifier(rng, 'common')}_{i}", seed * 7919 + i) for i in range(64)]
+    stats = {"files": 0, "functions": 0, "duplicated_functions": 0, "bytes": 0}
+    identifiers: List[str] = []
+
+    for index in range(files):
+        domain = DOMAINS[index % len(DOMAINS)]
+        layer = LAYERS[(index // len(DOMAINS)) % len(LAYERS)]
+        is_ts = rng.random() < ts_ratio
+        path = root / layer / domain / f"{domain}_{layer}_{index}{'.ts' if is_ts else '.py'}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        functions = []
+        for i in range(functions_per_file):
+            if rng.random() < duplication:
+                functions.append(rng.choice(shared) + (True,))
+            else:
+                name = f"{identifier(rng, domain)}_{index}_{i}"
+                identifiers.append(name)
+                functions.append((name, index * 1000 + i, False))
+        in_class = int(len(functions) * class_ratio)
+        class_name = f"{domain.title()}{layer.title()}{index}"
+
+        if is_ts:
+            parts = [f'import {{ Base }} from "../../utils/{domain}/base";\n\nconst LIMIT_{index} = {index};']
+            parts.extend(ts_function(name, seed_) for name, seed_, _ in functions[in_class:])
+            if in_class:
+                methods = "\n\n".join(ts_function(n, s, method=True) for n, s, _ in functions[:in_class])
+                parts.append(f"export class {class_name} extends Base {{\n{methods}\n}}")
+        else:
+            parts = [f'"""{domain.title()} {layer}."""\nimport os\n\nLIMIT_{index} = {index}']
+            parts.extend(python_function(name, seed_) for name, seed_, _ in functions[in_class:])
+            if in_class:
+                methods = "\n\n".join(
+                    python_function(n, s, indent="    ") for n, s, _ in functions[:in_class]
+                )
+                parts.append(f"class {class_name}:\n{methods}")
+        text = "\n\n\n".join(parts) + "\n"
+        path.write_text(text)
+
+        stats["files"] += 1
+        stats["functions"] += len(functions)
+        stats["duplicated_functions"] += sum(1 for *_, duplicated in functions if duplicated)
+        stats["bytes"] += len(text.encode("utf-8"))
+
+    stats["identifiers"] = identifiers
+    return stats
+
+
+def make_queries(identifiers: List[str], count: int, seed: int = 1) -> List[str]:
+    """생성된 식별자에서 자연어 쿼리 생성 (예: "validate billing invoice")"""
+    rng = random.Random(seed)
+    queries = []
+    for name in rng.sample(identifiers, min(count, len(identifiers))):
+        verb, domain, noun = name.split("_")[:3]
+        queries.append(f"{verb} {domain} {noun}")
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--functions-per-file", type=int, default=20)
+    parser.add_argument("--duplication", type=float, default=0.1)
+    parser.add_argument("--ts-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = generate_repo(
+        args.output, args.files, args.functions_per_file, args.duplication,
+        args.ts_ratio, seed=args.seed
+    )
+    stats.pop("identifiers")
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
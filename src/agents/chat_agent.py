@@ -1,5 +1,6 @@
 """Basic Chat Agent implementation."""
 from typing import Dict, Any, Optional, List
+from pathlib import Path
 from langchain_openai import ChatOpenAI
 from langchain.agents import create_openai_tools_agent, AgentExecutor
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -7,6 +8,7 @@ from langchain_core.tools import Tool
 
 from ..mcp.client import CursorMCPClient
 from ..context.context_manager import ContextManager
+from ..indexing.codebase_indexer import CodebaseIndexer
 
 
 class ChatAgent:
@@ -16,7 +18,9 @@ class ChatAgent:
         self,
         mcp_client: Optional[CursorMCPClient] = None,
         context_manager: Optional[ContextManager] = None,
-        model: str = "gpt-4-turbo-preview"
+        model: str = "gpt-4-turbo-preview",
+        indexer: Optional[CodebaseIndexer] = None,
+        persist_directory: str = ".cursor_index"
     ):
         """
         Chat Agent 초기화
@@ -25,10 +29,14 @@ class ChatAgent:
             mcp_client: MCP 클라이언트 인스턴스
             context_manager: 컨텍스트 매니저 인스턴스
             model: 사용할 LLM 모델
+            indexer: 코드베이스 인덱서 (심볼 색인/import 그래프를 공유)
+            persist_directory: indexer가 없을 때 색인을 읽을 디렉토리 (프로젝트 루트 기준)
         """
         self.llm = ChatOpenAI(model=model, temperature=0)
         self.mcp_client = mcp_client or CursorMCPClient()
         self.context_manager = context_manager or ContextManager()
+        self.indexer = indexer
+        self.persist_directory = persist_directory
         self.tools = []
         self.agent_executor: Optional[AgentExecutor] = None
     
@@ -36,6 +44,8 @@ class ChatAgent:
         """MCP 도구를 LangChain 도구로 변환"""
         # File System 도구 로드
         from ..mcp.tools.file_system import FileSystemTools
+        from ..indexing.import_graph import IMPORT_GRAPH_FILE, ImportGraph
+        from ..indexing.symbol_index import SYMBOL_INDEX_FILE, SymbolIndex
         import asyncio
         
         # Async 함수를 동기 함수로 래핑
@@ -66,6 +76,22 @@ class ChatAgent:
                 asyncio.set_event_loop(loop)
             return loop.run_until_complete(FileSystemTools.list_files(directory, pattern))
         
+        # 심볼 색인(정의 위치 조회)과 import 그래프: 인덱서가 있으면 인덱서가 갱신하는
+        # 인스턴스를 그대로 쓰고, 없으면 인덱서가 persist_directory에 저장한 색인을 읽기 전용으로 연다
+        if self.indexer is not None:
+            symbol_index = self.indexer.symbol_index
+            import_graph = self.indexer.import_graph
+        else:
+            persist_path = Path(self.context_manager.project_root) / self.persist_directory
+            symbol_index = SymbolIndex(persist_path / SYMBOL_INDEX_FILE)
+            import_graph = ImportGraph(persist_path / IMPORT_GRAPH_FILE)
+        
+        def find_importers(target: str) -> List[str]:
+            if self.indexer is None:
+                # 다른 프로세스의 인덱서가 그래프를 다시 저장했으면 새로 로드
+                import_graph.refresh()
+            return import_graph.dependents(target.strip(), transitive=True)
+        
         self.tools = [
             Tool(
                 name="read_file",
@@ -82,6 +108,21 @@ class ChatAgent:
                 description="List files in a directory. Input should be a directory path string, optionally with a glob pattern as second argument.",
                 func=list_files_sync
             ),
+            Tool(
+                name="find_definition",
+                description="Find where a function, class or method is defined. Input should be a symbol name such as 'parse_config' or 'ClassName.method'. Returns file paths and line ranges.",
+                func=lambda name: symbol_index.find_definition(name.strip())
+            ),
+            Tool(
+                name="list_class_methods",
+                description="List the methods of a class with their file paths and line ranges. Input should be a class name.",
+                func=lambda class_name: symbol_index.list_methods(class_name.strip())
+            ),
+            Tool(
+                name="find_importers",
+                description="List project files that import a module, directly or transitively. Input should be a file path such as 'src/utils/config.py' or a module name such as 'src.utils.config'.",
+                func=find_importers
+            ),
         ]
     
     def _build_prompt(self) -> ChatPromptTemplate:
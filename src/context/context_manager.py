@@ -4,6 +4,8 @@ from pathlib import Path
 import subprocess
 import json
 
+from ..utils.file_walker import FileWalker
+
 
 class ContextManager:
     """프로젝트 컨텍스트 수집 및 관리"""
@@ -57,34 +59,30 @@ class ContextManager:
         structure = {
             "root": str(self.project_root),
             "files": [],
-            "directories": []
+            "directories": [{"path": ".", "children": []}]
         }
-        
-        def traverse(path: Path, depth: int = 0):
-            if depth > max_depth:
-                return
-            
-            if path.is_file():
-                structure["files"].append({
-                    "path": str(path.relative_to(self.project_root)),
-                    "size": path.stat().st_size
-                })
-            elif path.is_dir():
-                dir_info = {
-                    "path": str(path.relative_to(self.project_root)),
-                    "children": []
-                }
-                structure["directories"].append(dir_info)
-                
-                try:
-                    for child in path.iterdir():
-                        if child.name.startswith('.'):
-                            continue
-                        traverse(child, depth + 1)
-                except PermissionError:
-                    pass
-        
-        traverse(self.project_root)
+
+        # .gitignore/.cursorignore와 기본 제외 목록(node_modules 등)을 적용한 단일 순회
+        walker = FileWalker(
+            str(self.project_root),
+            include_hidden=False,
+            max_depth=max_depth
+        )
+        for entry, rel_path, _ in walker.iter_entries():
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    structure["directories"].append({
+                        "path": rel_path,
+                        "children": []
+                    })
+                elif entry.is_file(follow_symlinks=False):
+                    structure["files"].append({
+                        "path": rel_path,
+                        "size": entry.stat(follow_symlinks=False).st_size
+                    })
+            except OSError:
+                continue
+
         return structure
     
     def get_git_status(self) -> Dict[str, Any]:
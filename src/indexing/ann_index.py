@@ -0,0 +1,266 @@
+"""Approximate nearest neighbor index over vector store rows (faiss)."""
+from typing import Any, Dict, Tuple
+from pathlib import Path
+import math
+import os
+import pickle
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # 선택 의존성: 없으면 정확 검색만 사용
+    faiss = None
+
+
+ANN_KINDS = ("ivf", "ivfpq", "hnsw")
+
+# 종류별 기본 파라미터 (nlist=None이면 학습 시 행 수로 결정)
+DEFAULT_PARAMS: Dict[str, Dict[str, Any]] = {
+    "ivf": {"nlist": None, "nprobe": 16, "min_rows": 10000, "retrain_growth": 4.0},
+    "ivfpq": {
+        "nlist": None, "nprobe": 16, "pq_m": None, "pq_bits": 8,
+        "min_rows": 10000, "retrain_growth": 4.0
+    },
+    "hnsw": {"m": 32, "ef_construction": 80, "ef_search": 64, "min_rows": 10000},
+}
+
+# IVF 학습에 쓰는 리스트당 샘플 수 (faiss 권장 하한, 학습 시간은 샘플 수에 비례)
+TRAIN_SAMPLES_PER_LIST = 39
+
+
+def auto_nlist(rows: int) -> int:
+    """행 수에 맞는 IVF 리스트 수 (약 4·√n, 리스트당 최소 39개 샘플)"""
+    return max(1, min(int(4 * math.sqrt(rows)), rows // 39))
+
+
+def auto_pq_m(dim: int) -> int:
+    """PQ 부분 양자화기 수: 부분 벡터가 8차원 이상이 되는 dim의 최대 약수"""
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+class AnnIndex:
+    """
+    벡터 스토어 행 번호를 ID로 갖는 faiss 근사 최근접 이웃 색인
+
+    - ivf: k-means 조대 양자화기 + 역리스트 (IndexIVFFlat). nprobe로 재현율/지연 조절
+    - ivfpq: IVF + 곱 양자화 코드 (IndexIVFPQ). 행당 pq_m 바이트로 메모리를 줄이고,
+      점수가 근사값이므로 스토어의 rescore와 함께 쓴다
+    - hnsw: 계층적 그래프 (IndexHNSWFlat). ef_search로 재현율/지연 조절
+
+    스토어의 행렬은 추가 전용이므로, 색인은 "앞에서부터 몇 행까지 넣었는지"만 기억하고
+    새 행은 add()로 뒤에 이어 넣는다. 삭제된 행은 색인에 남아 있다가 검색 후 생존 마스크로
+    걸러지고, 스토어가 압축되어 행 번호가 바뀌면 다시 만든다.
+    """
+
+    def __init__(self, kind: str = "ivf", **params: Any):
+        """
+        ANN Index 초기화
+
+        Args:
+            kind: "ivf" 또는 "hnsw"
+            **params: 종류별 파라미터 (DEFAULT_PARAMS 참조)
+                - min_rows: 이 행 수 미만이면 색인을 만들지 않고 정확 검색 사용
+                - ivf: nlist, nprobe, retrain_growth (학습 시점 대비 이 배수만큼 커지면 재학습)
+                - ivfpq: ivf 파라미터 + pq_m (부분 양자화기 수, dim의 약수), pq_bits
+                - hnsw: m, ef_construction, ef_search
+        """
+        if faiss is None:
+            raise ImportError("faiss-cpu is required for approximate vector search")
+        if kind not in ANN_KINDS:
+            raise ValueError(f"Unsupported ANN index: {kind}")
+        unknown = set(params) - set(DEFAULT_PARAMS[kind])
+        if unknown:
+            raise ValueError(f"Unknown {kind} parameters: {', '.join(sorted(unknown))}")
+        self.kind = kind
+        self.params = {**DEFAULT_PARAMS[kind], **params}
+        self.index = None
+        # 색인에 들어간 스토어 행 수 (행 0..rows-1)
+        self.rows = 0
+        self.trained_rows = 0
+
+    @property
+    def built(self) -> bool:
+        return self.index is not None
+
+    def _build_params(self) -> Dict[str, Any]:
+        """색인 구조를 결정하는 파라미터 (검색 파라미터 제외)"""
+        if self.kind == "ivf":
+            return {"nlist": self.params["nlist"]}
+        if self.kind == "ivfpq":
+            return {
+                "nlist": self.params["nlist"],
+                "pq_m": self.params["pq_m"],
+                "pq_bits": self.params["pq_bits"]
+            }
+        return {"m": self.params["m"], "ef_construction": self.params["ef_construction"]}
+
+    def set_search_params(self, **params: Any):
+        """
+        검색 시점 파라미터 변경 (재구축 없이 재현율/지연 조절)
+
+        Args:
+            **params: nprobe (ivf) 또는 ef_search (hnsw)
+        """
+        self.params.update(params)
+        self._apply_search_params()
+
+    def _apply_search_params(self):
+        if self.index is None:
+            return
+        if self.kind != "hnsw":
+            faiss.extract_index_ivf(self.index).nprobe = int(self.params["nprobe"])
+        else:
+            faiss.downcast_index(self.index.index).hnsw.efSearch = int(self.params["ef_search"])
+
+    def should_rebuild(self, live_rows: int) -> bool:
+        """IVF 중심점이 데이터 분포를 대표하지 못할 만큼 커졌는지 여부"""
+        return (
+            self.kind != "hnsw"
+            and self.trained_rows > 0
+            and live_rows > self.trained_rows * self.params["retrain_growth"]
+        )
+
+    def build(self, matrix: np.ndarray, live: np.ndarray, block_rows: int = 16384):
+        """
+        스토어 행렬 전체로 색인 생성
+
+        Args:
+            matrix: (n, dim) 정규화된 벡터 행렬 (memmap 가능)
+            live: 생존 행 마스크
+            block_rows: 한 번에 float32로 변환하여 추가하는 행 수
+        """
+        dim = matrix.shape[1]
+        live_rows = np.flatnonzero(live)
+        if self.kind != "hnsw":
+            nlist = self.params["nlist"] or auto_nlist(len(live_rows))
+            quantizer = faiss.IndexFlatIP(dim)
+            sample_size = nlist * TRAIN_SAMPLES_PER_LIST
+            if self.kind == "ivf":
+                ivf = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            else:
+                bits = int(self.params["pq_bits"])
+                ivf = faiss.IndexIVFPQ(
+                    quantizer, dim, nlist, int(self.params["pq_m"] or auto_pq_m(dim)), bits,
+                    faiss.METRIC_INNER_PRODUCT
+                )
+                # 부분 양자화기마다 2^bits개 중심점을 학습
+                sample_size = max(sample_size, (1 << bits) * TRAIN_SAMPLES_PER_LIST)
+            sample_size = min(len(live_rows), sample_size)
+            sample = np.sort(
+                np.random.default_rng(0).choice(live_rows, size=sample_size, replace=False)
+            )
+            ivf.train(np.ascontiguousarray(matrix[sample], dtype=np.float32))
+            index = ivf
+            self.trained_rows = len(live_rows)
+        else:
+            hnsw = faiss.IndexHNSWFlat(dim, int(self.params["m"]), faiss.METRIC_INNER_PRODUCT)
+            hnsw.hnsw.efConstruction = int(self.params["ef_construction"])
+            index = faiss.IndexIDMap(hnsw)
+            self.trained_rows = 0
+        self.index = index
+        self.rows = 0
+        self._apply_search_params()
+        for start in range(0, len(matrix), block_rows):
+            block = slice(start, start + block_rows)
+            rows = np.arange(start, min(start + block_rows, len(matrix)), dtype=np.int64)
+            keep = live[block]
+            self.add(matrix[block][keep], rows[keep])
+        self.rows = len(matrix)
+
+    def add(self, vectors: np.ndarray, rows: np.ndarray):
+        """
+        행 추가 (증분 삽입)
+
+        Args:
+            vectors: (n, dim) 정규화된 벡터
+            rows: 스토어 행 번호
+        """
+        if len(rows):
+            self.index.add_with_ids(
+                np.ascontiguousarray(vectors, dtype=np.float32),
+                np.ascontiguousarray(rows, dtype=np.int64)
+            )
+            self.rows = max(self.rows, int(rows[-1]) + 1)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        근사 top-k 검색
+
+        Args:
+            query: 정규화된 쿼리 벡터
+            k: 후보 수
+
+        Returns:
+            (행 번호 배열, 내적 점수 배열) - 점수 내림차순, 빈 자리 제외
+        """
+        scores, rows = self.index.search(
+            np.ascontiguousarray(query.reshape(1, -1), dtype=np.float32), k
+        )
+        found = rows[0] >= 0
+        return rows[0][found], scores[0][found]
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal if self.index is not None else 0
+
+    def memory_bytes(self) -> int:
+        """색인에 저장된 벡터 코드와 ID의 대략적인 크기 (HNSW 그래프 링크 제외)"""
+        if self.index is None:
+            return 0
+        if self.kind == "hnsw":
+            return self.ntotal * (self.index.d * 4 + 8)
+        return self.ntotal * (faiss.extract_index_ivf(self.index).code_size + 8)
+
+    def reset(self):
+        """색인 폐기 (스토어 행 번호가 바뀐 경우)"""
+        self.index = None
+        self.rows = 0
+        self.trained_rows = 0
+
+    def save(self, index_path: Path):
+        """색인과 메타데이터를 한 파일에 원자적으로 저장"""
+        index_path = Path(index_path)
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                "version": 1,
+                "kind": self.kind,
+                "build_params": self._build_params(),
+                "rows": self.rows,
+                "trained_rows": self.trained_rows,
+                "index": faiss.serialize_index(self.index)
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_path)
+
+    def load(self, index_path: Path) -> bool:
+        """
+        저장된 색인 로드 (종류/구조 파라미터가 다르면 로드하지 않음)
+
+        Args:
+            index_path: 색인 파일 경로
+
+        Returns:
+            로드 여부
+        """
+        index_path = Path(index_path)
+        if not index_path.exists():
+            return False
+        try:
+            with open(index_path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        if (
+            state.get("version") != 1
+            or state.get("kind") != self.kind
+            or state.get("build_params") != self._build_params()
+        ):
+            return False
+        self.index = faiss.deserialize_index(state["index"])
+        self.rows = state["rows"]
+        self.trained_rows = state["trained_rows"]
+        self._apply_search_params()
+        return True
@@ -0,0 +1,265 @@
+"""Content-addressed chunk locations for deduplicated storage."""
+from typing import List, Dict, Any, Optional, Iterable, Set
+from pathlib import Path
+import hashlib
+import re
+import sqlite3
+import textwrap
+import threading
+
+from .search_filters import SearchFilters
+
+
+# 인덱스 저장 디렉토리 안의 청크 위치 색인 파일 이름
+LOCATIONS_FILE = "locations.sqlite3"
+
+COLUMNS = ("content_id", "file_path", "chunk_type", "start_line", "end_line", "symbol", "parent", "language")
+
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def normalize_content(content: str) -> str:
+    """
+    중복 판정용 청크 정규화
+
+    줄바꿈 통일, 줄 끝 공백 제거, 들여쓰기 정규화. 청크는 정의의 컬럼에서 잘리므로 첫 줄에는
+    들여쓰기가 없고 나머지 줄만 원래 깊이를 가진다. 그래서 첫 줄과 나머지를 따로 dedent하여
+    메서드로 복사된 함수처럼 다른 깊이에 있는 같은 코드도 같게 본다.
+    """
+    text = _TRAILING_SPACE.sub("", content.replace("\r\n", "\n").replace("\r", "\n"))
+    head, _, rest = text.strip("\n").partition("\n")
+    return f"{head.strip()}\n{textwrap.dedent(rest)}"
+
+
+def content_id(content: str, language: str) -> str:
+    """정규화된 내용과 언어로부터 결정되는 청크 ID (벡터 스토어 문서 ID)"""
+    key = f"{language}\0{normalize_content(content)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def location_from_metadata(metadata: Dict[str, Any]) -> tuple:
+    """청크 메타데이터를 위치 행으로 변환"""
+    start, _, end = str(metadata.get("lines", "0-0")).partition("-")
+    return (
+        metadata["chunk_id"],
+        metadata["file_path"],
+        metadata.get("chunk_type", ""),
+        int(start),
+        int(end or start),
+        metadata.get("symbol") or "",
+        metadata.get("parent") or "",
+        metadata.get("language", "")
+    )
+
+
+class ChunkLocations:
+    """
+    청크 내용 ID → (파일, 줄 범위, 심볼) 위치 목록
+
+    같은 내용의 청크는 벡터 스토어/키워드 색인에 한 번만 저장하고, 이 테이블이 그 문서가
+    나타나는 모든 위치를 기록한다. 파일 단위로 위치를 지우면 그 내용 ID가 stale 테이블로
+    옮겨지고, 갱신이 끝난 뒤 take_orphans()가 더 이상 위치가 없는 ID를 돌려주어 저장소에서
+    지운다. stale 기록은 위치 변경과 같은 트랜잭션으로 커밋되므로, 중간에 중단되어도 다음
+    갱신에서 정리된다.
+    """
+
+    def __init__(self, index_path: Path):
+        """
+        Chunk Locations 초기화
+
+        Args:
+            index_path: SQLite 파일 경로
+        """
+        self.index_path = Path(index_path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS locations ("
+                " content_id TEXT NOT NULL,"
+                " file_path TEXT NOT NULL,"
+                " chunk_type TEXT NOT NULL,"
+                " start_line INTEGER NOT NULL,"
+                " end_line INTEGER NOT NULL,"
+                " symbol TEXT NOT NULL,"
+                " parent TEXT NOT NULL,"
+                " language TEXT NOT NULL"
+                ")"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS locations_content ON locations (content_id)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS locations_file ON locations (file_path)")
+            # 검색 필터용 포스팅 (경로는 locations_file의 범위 검색)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS locations_language ON locations (language)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS locations_kind ON locations (chunk_type)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS stale (content_id TEXT PRIMARY KEY)")
+            self._conn.commit()
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM locations").fetchone()[0]
+
+    def num_contents(self) -> int:
+        """서로 다른 내용 ID 수 (저장된 문서 수)"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(DISTINCT content_id) FROM locations"
+            ).fetchone()[0]
+
+    def add(self, metadatas: Iterable[Dict[str, Any]]):
+        """청크 메타데이터의 위치 추가 (save() 전까지 커밋되지 않음)"""
+        with self._lock:
+            self._db.executemany(
+                f"INSERT INTO locations ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                map(location_from_metadata, metadatas)
+            )
+
+    def is_stored(self, content_id: str) -> bool:
+        """내용 ID의 문서가 저장소에 있는지 여부 (위치가 있거나 정리 대기 중)"""
+        with self._lock:
+            db = self._db
+            return (
+                db.execute(
+                    "SELECT 1 FROM locations WHERE content_id = ? LIMIT 1", (content_id,)
+                ).fetchone() is not None
+                or db.execute(
+                    "SELECT 1 FROM stale WHERE content_id = ?", (content_id,)
+                ).fetchone() is not None
+            )
+
+    def remove_files(self, rel_paths: List[str]):
+        """
+        파일들의 위치 제거 (위치를 잃은 내용 ID는 take_orphans() 대상으로 기록)
+
+        Args:
+            rel_paths: 파일 상대 경로 리스트
+        """
+        with self._lock:
+            db = self._db
+            for rel_path in rel_paths:
+                db.execute(
+                    "INSERT OR IGNORE INTO stale (content_id)"
+                    " SELECT content_id FROM locations WHERE file_path = ?", (rel_path,)
+                )
+                db.execute("DELETE FROM locations WHERE file_path = ?", (rel_path,))
+
+    def take_orphans(self) -> List[str]:
+        """
+        정리 대기 중인 내용 ID 중 위치가 하나도 남지 않은 것 (대기 목록은 비움)
+
+        호출자는 반환된 ID를 저장소에서 지운 뒤 save()로 커밋한다.
+        """
+        with self._lock:
+            db = self._db
+            orphans = [
+                content for (content,) in db.execute(
+                    "SELECT content_id FROM stale WHERE NOT EXISTS"
+                    " (SELECT 1 FROM locations WHERE locations.content_id = stale.content_id)"
+                )
+            ]
+            db.execute("DELETE FROM stale")
+        return orphans
+
+    def locations_for(self, content_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        내용 ID별 위치 목록 (파일, 줄 순서)
+
+        Args:
+            content_ids: 내용 ID 리스트
+
+        Returns:
+            내용 ID → 위치 메타데이터 (file_path, chunk_type, lines, symbol, parent, language) 리스트
+        """
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        unique = list(dict.fromkeys(content_ids))
+        with self._lock:
+            for i in range(0, len(unique), 500):
+                part = unique[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM locations"
+                    f" WHERE content_id IN ({','.join('?' * len(part))})"
+                    " ORDER BY file_path, start_line",
+                    part
+                ).fetchall()
+                for content, file_path, chunk_type, start, end, symbol, parent, language in rows:
+                    result.setdefault(content, []).append({
+                        "file_path": file_path,
+                        "chunk_type": chunk_type,
+                        "lines": f"{start}-{end}",
+                        "symbol": symbol,
+                        "parent": parent,
+                        "language": language
+                    })
+        return result
+
+    def content_ids_matching(
+        self,
+        filters: SearchFilters,
+        files: Optional[List[str]] = None
+    ) -> Set[str]:
+        """
+        필터를 만족하는 위치가 하나라도 있는 내용 ID
+
+        경로 접두사는 file_path 색인의 범위 검색, 언어/청크 종류는 각 색인으로 조회한다.
+
+        Args:
+            filters: 경로/언어/청크 종류 필터 (수정 시각은 files로 전달)
+            files: 이 파일들로 제한 (None이면 제한 없음)
+
+        Returns:
+            내용 ID 집합
+        """
+        conditions, params = [], []
+        if filters.path and filters.is_glob:
+            conditions.append("file_path GLOB ?")
+            params.append(filters.path)
+        elif filters.path:
+            # "dir/" 이상 "dir0" 미만 ('0'은 '/' 다음 문자) = dir/ 아래 모든 경로
+            conditions.append("(file_path = ? OR (file_path >= ? AND file_path < ?))")
+            params.extend([filters.path, filters.path + "/", filters.path + "0"])
+        for column, values in (("language", filters.languages), ("chunk_type", filters.chunk_types)):
+            if values:
+                conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+
+        file_groups: List[Optional[List[str]]] = [None]
+        if files is not None:
+            file_groups = [files[i:i + 500] for i in range(0, len(files), 500)]
+        result: Set[str] = set()
+        with self._lock:
+            for group in file_groups:
+                where, args = list(conditions), list(params)
+                if group is not None:
+                    where.append(f"file_path IN ({','.join('?' * len(group))})")
+                    args.extend(group)
+                sql = "SELECT DISTINCT content_id FROM locations"
+                if where:
+                    sql += " WHERE " + " AND ".join(where)
+                result.update(content for (content,) in self._db.execute(sql, args))
+        return result
+
+    def clear(self):
+        """모든 위치 제거"""
+        with self._lock:
+            self._db.execute("DELETE FROM locations")
+            self._db.execute("DELETE FROM stale")
+            self._db.commit()
+
+    def save(self):
+        """변경 사항 커밋"""
+        with self._lock:
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
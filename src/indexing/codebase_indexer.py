@@ -1,11 +1,47 @@
 """Codebase Indexing System."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import ast
-from langchain.embeddings import OpenAIEmbeddings
+import bisect
+import copy
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+import time
+import chromadb
+import numpy as np
 from langchain.vectorstores import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+from ..utils.file_walker import DEFAULT_EXCLUDES, FileWalker
+from .ann_index import AnnIndex
+from .chunk_locations import LOCATIONS_FILE, ChunkLocations, content_id
+from .embedding_cache import EmbeddingCache, CachedEmbeddings
+from .embeddings import create_embeddings, embed_queries, embed_to_array, embedding_dimension
+from .import_graph import (
+    IMPORT_GRAPH_FILE, Candidates, ImportGraph, js_import_candidates, python_import_candidates
+)
+from .keyword_index import BM25Index
+from .manifest import IndexManifest, ManifestDiff
+from .pipeline import threaded_stage
+from .query_cache import QueryCache
+from .search_filters import SearchFilters
+from .symbol_index import SYMBOL_INDEX_FILE, SymbolIndex, symbol_from_metadata
+from .syntax_chunker import LANGUAGES as SYNTAX_LANGUAGES, ParseCache, extract_syntax_file
+from .ranking import maximal_marginal_relevance, reciprocal_rank_fusion
+from .vector_store import MmapVectorStore
+
+
+# 청킹 프로세스 풀의 시작 방식. 청킹은 파이프라인 스레드에서 돌고 다른 스레드(SQLite, 임베딩,
+# 로깅 등)가 락을 잡고 있을 수 있으므로, 락 상태까지 복사되는 fork 대신 forkserver/spawn 사용
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
 
 
 class CodeChunk:
@@ -17,7 +53,10 @@ class CodeChunk:
         start_line: int,
         end_line: int,
         file_path: str,
-        language: str
+        language: str,
+        name: str = "",
+        parent: str = "",
+        part: int = 0
     ):
         self.content = content
         self.chunk_type = chunk_type
@@ -25,27 +64,490 @@ class CodeChunk:
         self.end_line = end_line
         self.file_path = file_path
         self.language = language
+        # 정의된 심볼 이름과 소속 클래스의 정규화된 이름 (없으면 빈 문자열)
+        self.name = name
+        self.parent = parent
+        # 큰 정의를 나눈 경우 1부터 시작하는 부분 번호 (나누지 않았으면 0)
+        self.part = part
+
+    @property
+    def chunk_id(self) -> str:
+        """파일 경로와 위치로부터 결정되는 청크 ID"""
+        key = f"{self.file_path}:{self.chunk_type}:{self.start_line}-{self.end_line}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @property
+    def content_id(self) -> str:
+        """정규화된 내용으로부터 결정되는 ID (같은 코드가 여러 곳에 있으면 같은 값)"""
+        return content_id(self.content, self.language)
+
+
+_NEWLINE = re.compile(r'\r\n|\r|\n')
+
+# 이 줄 수를 넘는 청크는 겹치는 부분 청크로 나눔 (임베딩 입력 길이 제한 대비)
+MAX_CHUNK_LINES = 120
+CHUNK_OVERLAP_LINES = 16
+
+
+def line_offsets(source: str) -> List[int]:
+    """
+    각 줄의 시작 문자 오프셋 테이블 생성 (ast와 동일한 줄바꿈 규칙)
+    
+    Args:
+        source: 소스 코드 문자열
+        
+    Returns:
+        i번째 원소가 (i+1)번째 줄의 시작 오프셋인 리스트 (마지막 원소는 len(source))
+    """
+    offsets = [0]
+    offsets.extend(m.end() for m in _NEWLINE.finditer(source))
+    offsets.append(len(source))
+    return offsets
+
+
+def _char_col(source: str, offsets: List[int], lineno: int, byte_col: int) -> int:
+    """ast의 UTF-8 바이트 컬럼 오프셋을 문자 오프셋으로 변환"""
+    line = source[offsets[lineno - 1]:offsets[lineno]]
+    if line.isascii():
+        return byte_col
+    return len(line.encode('utf-8')[:byte_col].decode('utf-8', errors='replace'))
+
+
+def slice_segment(source: str, offsets: List[int], node: ast.AST) -> str:
+    """
+    오프셋 테이블로 노드의 소스 구간을 잘라냄 (ast.get_source_segment와 동일한 결과)
+    
+    Args:
+        source: 소스 코드 문자열
+        offsets: line_offsets() 결과
+        node: lineno/col_offset 정보를 가진 AST 노드
+        
+    Returns:
+        노드에 해당하는 소스 문자열
+    """
+    start, end = segment_bounds(source, offsets, node)
+    return source[start:end]
+
+
+def segment_bounds(source: str, offsets: List[int], node: ast.AST) -> Tuple[int, int]:
+    """노드 소스 구간의 (시작, 끝) 문자 오프셋 (위치 정보가 없으면 빈 구간)"""
+    end_lineno = getattr(node, 'end_lineno', None)
+    end_col = getattr(node, 'end_col_offset', None)
+    if end_lineno is None or end_col is None:
+        return 0, 0
+    start = offsets[node.lineno - 1] + _char_col(source, offsets, node.lineno, node.col_offset)
+    end = offsets[end_lineno - 1] + _char_col(source, offsets, end_lineno, end_col)
+    return start, end
+
+
+def extract_chunks(
+    file_path: Path,
+    project_path: Path,
+    parse_cache: Optional[ParseCache] = None
+) -> List[CodeChunk]:
+    """
+    파일을 의미있는 청크로 분할 (프로세스 풀 워커에서도 호출 가능)
+    
+    Args:
+        file_path: 파일 경로
+        project_path: 프로젝트 루트 경로
+        parse_cache: JS/TS 증분 파싱용 트리 캐시 (None이면 매번 전체 파싱)
+        
+    Returns:
+        코드 청크 리스트
+    """
+    return extract_file(file_path, project_path, parse_cache)[0]
+
+
+def extract_file(
+    file_path: Path,
+    project_path: Path,
+    parse_cache: Optional[ParseCache] = None
+) -> Tuple[List[CodeChunk], List[Candidates]]:
+    """
+    파일을 한 번 읽고 한 번 파싱하여 청크와 import 후보를 함께 추출
+    
+    줄 오프셋 테이블로 모든 청크를 잘라낸다. JS/TS 파일은 tree-sitter로 파싱한다.
+    청크는 계층적으로 겹치지 않는다: 클래스 청크는 메서드 본문을 접은 골격이고 메서드는
+    별도 리프 청크이며, 정의 밖의 모듈 코드는 모듈 청크로, 큰 청크는 겹치는 부분으로 나뉜다.
+    
+    Args:
+        file_path: 파일 경로
+        project_path: 프로젝트 루트 경로
+        parse_cache: JS/TS 증분 파싱용 트리 캐시 (None이면 매번 전체 파싱)
+        
+    Returns:
+        (코드 청크 리스트, import별 프로젝트 파일 후보 리스트)
+    """
+    chunks, imports = [], []
+    
+    # JS/TS 파일인 경우 tree-sitter 기반 청킹
+    if file_path.suffix in SYNTAX_LANGUAGES:
+        try:
+            with open(file_path, 'rb') as f:
+                source = f.read()
+        except OSError:
+            return chunks, imports
+        rel_path = str(file_path.relative_to(project_path))
+        language = SYNTAX_LANGUAGES[file_path.suffix][1]
+        raw_chunks, sources = extract_syntax_file(
+            source, file_path.suffix, key=rel_path, parse_cache=parse_cache
+        )
+        for spec in sources:
+            candidates = js_import_candidates(rel_path, spec)
+            if candidates:
+                imports.append(candidates)
+        for chunk_type, start_line, end_line, content, name, parent in raw_chunks:
+            chunks.append(CodeChunk(
+                content=content,
+                chunk_type=chunk_type,
+                start_line=start_line,
+                end_line=end_line,
+                file_path=rel_path,
+                language=language,
+                name=name,
+                parent=parent
+            ))
+        return split_oversized(chunks), imports
+    
+    # Python 파일인 경우 AST 기반 청킹
+    if file_path.suffix == ".py":
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            tree = ast.parse(source, filename=str(file_path))
+        except Exception:
+            return chunks, imports
+        
+        offsets = line_offsets(source)
+        rel_path = str(file_path.relative_to(project_path))
+        # 정의 노드 → 직접 포함하는 정의 노드 목록 (모듈은 tree)
+        children: Dict[ast.AST, List[ast.AST]] = {tree: []}
+        definitions = []
+        # (노드, 노드가 속한 클래스 본문의 정규화된 이름 - 함수 안으로 들어가면 초기화, 소유 정의)
+        stack = [(tree, "", tree)]
+        while stack:
+            parent_node, parent, owner = stack.pop()
+            for node in ast.iter_child_nodes(parent_node):
+                if isinstance(node, ast.Import):
+                    for alias in node.names:
+                        imports.extend(python_import_candidates(rel_path, alias.name))
+                    continue
+                if isinstance(node, ast.ImportFrom):
+                    imports.extend(python_import_candidates(
+                        rel_path, node.module, node.level, [alias.name for alias in node.names]
+                    ))
+                    continue
+                if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    stack.append((node, parent, owner))
+                    continue
+                children[owner].append(node)
+                children[node] = []
+                definitions.append((node, parent))
+                if isinstance(node, ast.ClassDef):
+                    stack.append((node, f"{parent}.{node.name}" if parent else node.name, node))
+                else:
+                    stack.append((node, "", node))
+        
+        # 정의 청크: 포함된 정의의 본문은 시그니처만 남기고 접어 내용이 겹치지 않게 함
+        for node, parent in sorted(definitions, key=lambda item: item[0].lineno):
+            start, end = segment_bounds(source, offsets, node)
+            chunks.append(CodeChunk(
+                content=collapse_definitions(source, offsets, start, end, children[node]),
+                chunk_type=node.__class__.__name__,
+                start_line=node.lineno,
+                end_line=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
+                file_path=rel_path,
+                language="python",
+                name=node.name,
+                parent=parent
+            ))
+        
+        # 모듈 청크: 정의 밖의 코드(import, 상수, 실행 블록)가 있으면 정의를 접은 파일 전체
+        if any(
+            not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            for node in tree.body
+        ):
+            end = len(source.rstrip("\r\n"))
+            chunks.append(CodeChunk(
+                content=collapse_definitions(source, offsets, 0, end, children[tree]),
+                chunk_type="Module",
+                start_line=1,
+                end_line=max(1, bisect.bisect_right(offsets, end - 1)),
+                file_path=rel_path,
+                language="python"
+            ))
+    
+    return split_oversized(chunks), imports
+
+
+def collapse_definitions(
+    source: str,
+    offsets: List[int],
+    start: int,
+    end: int,
+    definitions: List[ast.AST]
+) -> str:
+    """
+    소스 구간에서 포함된 정의의 본문을 "..." 한 줄로 접음
+    
+    데코레이터와 시그니처는 남기므로 접힌 정의는 이름으로 그 정의의 청크를 가리킨다.
+    본문이 시그니처와 같은 줄에 있는 한 줄 정의는 그대로 둔다.
+    
+    Args:
+        source: 소스 코드 문자열
+        offsets: line_offsets() 결과
+        start: 구간 시작 문자 오프셋
+        end: 구간 끝 문자 오프셋
+        definitions: 구간에 직접 포함된 정의 노드
+        
+    Returns:
+        접힌 소스 문자열
+    """
+    parts = []
+    cursor = start
+    for node in sorted(definitions, key=lambda n: n.lineno):
+        body_line = node.body[0].lineno
+        if body_line <= node.lineno or node.end_lineno is None:
+            continue
+        line = source[offsets[body_line - 1]:offsets[body_line]]
+        indent = line[:len(line) - len(line.lstrip(" \t"))]
+        parts.append(source[cursor:offsets[body_line - 1]])
+        parts.append(f"{indent}...\n")
+        cursor = offsets[node.end_lineno]
+    if cursor < end:
+        parts.append(source[cursor:end])
+    return "".join(parts).rstrip("\r\n")
+
+
+def split_oversized(
+    chunks: List[CodeChunk],
+    max_lines: int = MAX_CHUNK_LINES,
+    overlap: int = CHUNK_OVERLAP_LINES
+) -> List[CodeChunk]:
+    """
+    max_lines를 넘는 청크를 overlap 줄씩 겹치는 부분 청크로 분할
+    
+    부분 청크는 원래 청크의 종류와 심볼을 유지하고 part에 1부터 번호를 붙인다.
+    
+    Args:
+        chunks: 코드 청크 리스트
+        max_lines: 청크당 최대 줄 수
+        overlap: 이웃한 부분 청크가 공유하는 줄 수
+        
+    Returns:
+        분할된 청크 리스트
+    """
+    result = []
+    step = max(1, max_lines - overlap)
+    for chunk in chunks:
+        lines = chunk.content.split("\n")
+        if len(lines) <= max_lines:
+            result.append(chunk)
+            continue
+        for part, first in enumerate(range(0, len(lines) - overlap, step), 1):
+            window = lines[first:first + max_lines]
+            result.append(CodeChunk(
+                content="\n".join(window),
+                chunk_type=chunk.chunk_type,
+                start_line=chunk.start_line + first,
+                end_line=chunk.start_line + first + len(window) - 1,
+                file_path=chunk.file_path,
+                language=chunk.language,
+                name=chunk.name,
+                parent=chunk.parent,
+                part=part
+            ))
+    return result
+
+
+def document_key(metadata: Dict[str, Any]) -> str:
+    """문서 메타데이터로부터 청크 ID 결정 (chunk_id가 없는 이전 인덱스 호환)"""
+    if metadata.get("chunk_id"):
+        return metadata["chunk_id"]
+    key = f"{metadata.get('file_path')}:{metadata.get('chunk_type')}:{metadata.get('lines')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+SearchResults = Tuple[Tuple[str, Dict[str, Any]], ...]
+
+
+def freeze_documents(docs: List[Document]) -> SearchResults:
+    """결과 캐시에 넣을 불변 스냅샷 (호출자가 받은 문서를 수정해도 캐시는 바뀌지 않음)"""
+    return tuple((doc.page_content, copy.deepcopy(doc.metadata)) for doc in docs)
+
+
+def thaw_documents(results: SearchResults) -> List[Document]:
+    """캐시된 스냅샷에서 호출마다 새 Document 생성"""
+    return [
+        Document(page_content=content, metadata=copy.deepcopy(metadata))
+        for content, metadata in results
+    ]
+
+
+def _chunk_files_worker(
+    project_path: str,
+    file_paths: List[str]
+) -> List[Tuple[str, List[CodeChunk], List[Candidates]]]:
+    """프로세스 풀 작업 단위: 파일 묶음을 청킹하여 반환"""
+    root = Path(project_path)
+    return [(fp, *extract_file(Path(fp), root)) for fp in file_paths]
+
+
+class IndexBatch:
+    """파이프라인 스테이지 사이를 흐르는 파일 경계 단위의 문서 배치"""
+    def __init__(self):
+        self.ids: List[str] = []
+        self.documents: List[Document] = []
+        # 배치에 포함된 모든 청크 위치의 메타데이터 (중복 내용이라 documents에 없는 것 포함)
+        self.locations: List[Dict[str, Any]] = []
+        # (상대 경로, (크기, mtime_ns, 해시), 청크 ID, import 후보) - 업서트 후 매니페스트/그래프에 반영
+        self.files: List[Tuple[str, Tuple[int, int, str], List[str], List[Candidates]]] = []
+        self.vectors = None
 
 
 class CodebaseIndexer:
     """코드베이스 인덱싱 시스템"""
     
-    def __init__(self, project_path: str, persist_directory: str = ".cursor_index"):
+    # 파일 수가 이보다 적으면 프로세스 풀 기동 비용이 더 크다
+    PARALLEL_MIN_FILES = 64
+    # 워커 한 번의 작업에 묶어 보내는 파일 수 (IPC 오버헤드 분산)
+    FILES_PER_TASK = 32
+    # discover_files 기본 확장자
+    EXTENSIONS = [".py", ".js", ".ts", ".jsx", ".tsx"]
+    
+    def __init__(
+        self,
+        project_path: str,
+        persist_directory: str = ".cursor_index",
+        workers: Optional[int] = None,
+        batch_size: int = 256,
+        embeddings: Optional[Embeddings] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        use_embedding_cache: bool = True,
+        vector_backend: str = "chroma",
+        vector_dtype: str = "float32",
+        vector_index: str = "flat",
+        ann_params: Optional[Dict[str, Any]] = None,
+        vector_rescore: int = 0,
+        queue_size: int = 2,
+        persist_every: int = 16,
+        exclude: Optional[List[str]] = None,
+        query_cache: Optional[QueryCache] = None
+    ):
         """
         Codebase Indexer 초기화
         
         Args:
             project_path: 프로젝트 루트 경로
             persist_directory: 벡터 스토어 저장 디렉토리
+            workers: 청킹 프로세스 수 (None이면 CPU 코어 수, 1이면 직렬 처리)
+            batch_size: 벡터 스토어에 한 번에 추가하는 문서 수
+            embeddings: 임베딩 백엔드 (None이면 create_embeddings()의 기본값)
+            embedding_cache: 임베딩 캐시 (None이면 기본 위치의 공유 캐시)
+            use_embedding_cache: False이면 캐시 없이 매번 임베딩
+            vector_backend: 벡터 스토어 종류 ("chroma" 또는 "mmap")
+            vector_dtype: mmap 벡터 스토어의 저장 정밀도 ("float32", "float16", "int8")
+            vector_index: mmap 벡터 스토어의 검색 방식 ("flat" 정확 검색, "ivf", "ivfpq", "hnsw")
+            ann_params: ANN 색인 파라미터 (AnnIndex 참조, 예: {"nprobe": 32})
+            vector_rescore: 양자화된 점수의 상위 k·vector_rescore 후보를 float32로 재채점 (0이면 끔)
+            queue_size: 파이프라인 스테이지 사이 큐에 대기할 수 있는 배치 수
+            persist_every: 이 배치 수마다 매니페스트/키워드 색인을 저장
+            exclude: 파일 탐색 시 제외할 이름/패턴 (None이면 FileWalker 기본 제외 목록)
+            query_cache: 검색 결과/쿼리 임베딩 캐시 (None이면 인덱서 전용 캐시 생성)
         """
         self.project_path = Path(project_path)
-        self.embeddings = OpenAIEmbeddings()
-        self.vector_store = Chroma(
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.persist_every = persist_every
+        self.persist_path = self.project_path / persist_directory
+        self.exclude = list(exclude) if exclude is not None else None
+        self.embeddings = embeddings or create_embeddings()
+        self.embedding_cache = None
+        if use_embedding_cache:
+            self.embedding_cache = embedding_cache or EmbeddingCache()
+            self.embeddings = CachedEmbeddings(self.embeddings, self.embedding_cache)
+        # chroma 백엔드의 chromadb 컬렉션 (미리 계산한 벡터 업서트용, 그 외 백엔드는 None)
+        self.chroma_collection = None
+        self.vector_store = self._create_vector_store(
+            vector_backend, vector_dtype, vector_index, ann_params, vector_rescore
+        )
+        self.keyword_index = BM25Index(self.persist_path / "keyword_index.pkl")
+        self.symbol_index = SymbolIndex(self.persist_path / SYMBOL_INDEX_FILE)
+        self.import_graph = ImportGraph(self.persist_path / IMPORT_GRAPH_FILE)
+        # 내용 ID → 위치 목록 (같은 내용의 청크는 한 번만 임베딩/저장)
+        self.locations = ChunkLocations(self.persist_path / LOCATIONS_FILE)
+        # 같은 프로세스에서 다시 청킹되는 JS/TS 파일(파일 감시기 갱신)의 증분 파싱용
+        self.parse_cache = ParseCache()
+        # 색인 내용이 바뀔 때마다 증가 (검색 결과 캐시 무효화 및 최신성 확인용)
+        self.generation = 0
+        self.query_cache = query_cache or QueryCache()
+        self.embedding_model = str(
+            getattr(self.embeddings, "model", None) or type(self.embeddings).__name__
+        )
+        # 색인을 만든 임베딩이 바뀌면 매니페스트가 outdated가 되어 전체 재인덱싱
+        self.manifest = IndexManifest(
+            self.persist_path / "manifest.json",
+            embedding={"model": self.embedding_model, "dim": embedding_dimension(self.embeddings)}
+        )
+        # index_project와 파일 감시기의 증분 갱신을 직렬화
+        self._update_lock = threading.RLock()
+    
+    def _create_vector_store(
+        self,
+        backend: str,
+        dtype: str,
+        index: str = "flat",
+        ann_params: Optional[Dict[str, Any]] = None,
+        rescore: int = 0
+    ):
+        """벡터 스토어 백엔드 생성"""
+        if index != "flat" and backend != "mmap":
+            raise ValueError(f"Vector index '{index}' requires the mmap backend")
+        if backend == "chroma":
+            return self._create_chroma_store()
+        if backend == "mmap":
+            return MmapVectorStore(
+                persist_directory=str(self.persist_path / "vectors"),
+                embedding_function=self.embeddings,
+                dtype=dtype,
+                ann=AnnIndex(index, **(ann_params or {})) if index != "flat" else None,
+                rescore=rescore
+            )
+        raise ValueError(f"Unsupported vector backend: {backend}")
+    
+    def _create_chroma_store(self) -> Chroma:
+        """
+        Chroma 벡터 스토어 생성
+
+        임베딩 스테이지에서 계산한 벡터를 그대로 업서트할 수 있도록 클라이언트를 직접 만들어
+        같은 컬렉션을 LangChain 래퍼(검색)와 chromadb 컬렉션(업서트)으로 공유한다.
+        """
+        client = chromadb.PersistentClient(path=str(self.persist_path))
+        self.chroma_collection = client.get_or_create_collection(
+            name="codebase", embedding_function=None
+        )
+        return Chroma(
             collection_name="codebase",
             embedding_function=self.embeddings,
-            persist_directory=str(self.project_path / persist_directory)
+            persist_directory=str(self.persist_path),
+            client=client
         )
     
+    def _clear_vector_store(self):
+        """전체 재인덱싱 전에 벡터 스토어 비우기 (임베딩 차원이 바뀌어도 새 벡터를 넣을 수 있게)"""
+        if isinstance(self.vector_store, MmapVectorStore):
+            self.vector_store.clear()
+        elif isinstance(self.vector_store, Chroma):
+            # 컬렉션은 처음 넣은 벡터의 차원을 유지하므로 컬렉션째 다시 만듦
+            self.vector_store.delete_collection()
+            self.vector_store = self._create_chroma_store()
+        else:
+            stale_ids = self.manifest.chunk_ids_for(list(self.manifest.files))
+            if stale_ids:
+                self.vector_store.delete(ids=stale_ids)
+    
     def discover_files(self, extensions: Optional[List[str]] = None) -> List[Path]:
         """
         프로젝트 내 파일 발견
@@ -56,14 +558,17 @@ class CodebaseIndexer:
         Returns:
             파일 경로 리스트
         """
-        if extensions is None:
-            extensions = [".py", ".js", ".ts", ".jsx", ".tsx"]
-        
-        files = []
-        for ext in extensions:
-            files.extend(self.project_path.rglob(f"*{ext}"))
-        
-        return files
+        # 한 번의 순회로 모든 확장자를 매칭하고, 무시 대상 디렉토리는 내려가지 않음
+        return list(self.file_walker(extensions).iter_files())
+    
+    def file_walker(self, extensions: Optional[List[str]] = None) -> FileWalker:
+        """인덱싱 대상 파일 탐색기 (인덱스 저장 디렉토리는 항상 제외)"""
+        exclude = self.exclude if self.exclude is not None else list(DEFAULT_EXCLUDES)
+        return FileWalker(
+            str(self.project_path),
+            extensions=extensions or self.EXTENSIONS,
+            exclude=exclude + [self.persist_path.name]
+        )
     
     def parse_ast(self, file_path: Path) -> Optional[ast.AST]:
         """
@@ -94,60 +599,799 @@ class CodebaseIndexer:
         Returns:
             코드 청크 리스트
         """
-        chunks = []
-        
-        # Python 파일인 경우 AST 기반 청킹
-        if file_path.suffix == ".py":
-            tree = self.parse_ast(file_path)
-            if tree:
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                        chunk = CodeChunk(
-                            content=ast.get_source_segment(
-                                open(file_path).read(), node
-                            ) or "",
-                            chunk_type=node.__class__.__name__,
-                            start_line=node.lineno,
-                            end_line=node.end_lineno if hasattr(node, 'end_lineno') else node.lineno,
-                            file_path=str(file_path.relative_to(self.project_path)),
-                            language="python"
-                        )
-                        chunks.append(chunk)
-        
-        return chunks
-    
-    def index_project(self):
-        """프로젝트 전체 인덱싱"""
-        files = self.discover_files()
-        
-        documents = []
-        for file_path in files:
-            chunks = self.chunk_file(file_path)
-            for chunk in chunks:
-                documents.append(Document(
-                    page_content=chunk.content,
-                    metadata={
-                        "file_path": chunk.file_path,
-                        "chunk_type": chunk.chunk_type,
-                        "language": chunk.language,
-                        "lines": f"{chunk.start_line}-{chunk.end_line}"
-                    }
-                ))
+        return extract_chunks(file_path, self.project_path, self.parse_cache)
+    
+    def iter_file_chunks(self, files: List[Path]) -> Iterator[Tuple[Path, List[CodeChunk]]]:
+        """
+        파일들을 청킹하여 완료되는 순서대로 (파일, 청크 리스트) 반환
+        
+        Args:
+            files: 청킹할 파일 경로 리스트
+            
+        Yields:
+            (파일 경로, 코드 청크 리스트)
+        """
+        for file_path, chunks, _ in self.iter_parsed_files(files):
+            yield file_path, chunks
+    
+    def iter_parsed_files(
+        self,
+        files: List[Path]
+    ) -> Iterator[Tuple[Path, List[CodeChunk], List[Candidates]]]:
+        """
+        파일들을 파싱하여 완료되는 순서대로 (파일, 청크 리스트, import 후보) 반환
+        
+        workers > 1이고 파일이 충분히 많으면 프로세스 풀로 분산 처리하며,
+        소비자가 결과를 처리하는 동안에도 워커는 계속 파싱한다.
+        동시에 제출되는 작업 수는 워커 수의 두 배로 제한되어 메모리가 일정하다.
+        
+        Args:
+            files: 청킹할 파일 경로 리스트
+            
+        Yields:
+            (파일 경로, 코드 청크 리스트, import 후보 리스트)
+        """
+        if self.workers <= 1 or len(files) < self.PARALLEL_MIN_FILES:
+            for file_path in files:
+                yield (file_path, *extract_file(file_path, self.project_path, self.parse_cache))
+            return
+        
+        tasks = (
+            [str(f) for f in files[i:i + self.FILES_PER_TASK]]
+            for i in range(0, len(files), self.FILES_PER_TASK)
+        )
+        max_inflight = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=MP_CONTEXT) as executor:
+            pending = set()
+            for task in tasks:
+                pending.add(executor.submit(_chunk_files_worker, str(self.project_path), task))
+                if len(pending) < max_inflight:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for file_path, chunks, imports in future.result():
+                        yield Path(file_path), chunks, imports
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for file_path, chunks, imports in future.result():
+                        yield Path(file_path), chunks, imports
+    
+    def index_project(self, force: bool = False) -> Dict[str, Any]:
+        """
+        프로젝트 인덱싱 (변경된 파일만 증분 처리)
+        
+        Args:
+            force: True이면 매니페스트를 무시하고 전체 재인덱싱
+            
+        Returns:
+            추가/변경/삭제/유지 파일 수와 임베딩 캐시 통계
+        """
+        with self._update_lock:
+            # 이전 버전 매니페스트(청크 ID 체계가 다름)나 다른 임베딩으로 만든 색인은 전체 재인덱싱
+            rebuild = force or self.manifest.outdated
+            if rebuild:
+                self._clear_vector_store()
+                self.manifest.clear()
+                self.keyword_index.clear()
+                self.symbol_index.clear()
+                self.import_graph.clear()
+                self.locations.clear()
+            
+            diff = self.manifest.diff(self.discover_files(), self.project_path)
+            self._apply_diff(diff, persist=True)
+            if len(self.import_graph) < len(self.manifest.files):
+                self._backfill_import_graph()
+            if rebuild:
+                self.generation += 1
+        
+        summary: Dict[str, Any] = diff.summary()
+        if self.embedding_cache:
+            summary["embedding_cache"] = self.embedding_cache.stats()
+        return summary
+    
+    def update_files(self, paths: List[Path], persist: bool = True) -> Dict[str, int]:
+        """
+        지정한 파일만 다시 청킹/임베딩 (파일 감시기의 증분 갱신용)
+        
+        존재하지 않는 파일은 색인에서 제거되고, 내용이 그대로인 파일은 건너뛴다.
         
-        if documents:
-            self.vector_store.add_documents(documents)
+        Args:
+            paths: 변경된 파일 경로 리스트
+            persist: False이면 디스크 저장을 호출자에게 맡김 (persist() 참조)
+            
+        Returns:
+            추가/변경/삭제/유지 파일 수
+        """
+        walker = self.file_walker()
+        files, scope = [], []
+        for path in dict.fromkeys(Path(p) for p in paths):
+            if not path.is_absolute():
+                path = self.project_path / path
+            try:
+                rel_path = str(path.relative_to(self.project_path))
+            except ValueError:
+                continue
+            scope.append(rel_path)
+            if path.is_file() and walker.matches(path):
+                files.append(path)
+        
+        with self._update_lock:
+            diff = self.manifest.diff(files, self.project_path, scope=scope)
+            self._apply_diff(diff, persist=persist)
+        return diff.summary()
+    
+    def _apply_diff(self, diff: ManifestDiff, persist: bool):
+        """매니페스트 비교 결과를 색인에 반영하고, 변경이 있으면 generation 증가"""
+        # 변경/삭제된 파일의 기존 위치 제거 (문서는 다른 위치가 남지 않은 경우에만 끝에서 삭제)
+        stale_files = [str(f.relative_to(self.project_path)) for f in diff.changed] + diff.deleted
+        self.locations.remove_files(stale_files)
+        self.symbol_index.remove_files(stale_files)
+        self.import_graph.remove_files(diff.deleted)
+        for rel_path in diff.deleted:
+            self.manifest.remove(rel_path)
+            self.parse_cache.discard(rel_path)
+        
+        # 청킹 → 임베딩 → 업서트 스트리밍 파이프라인 (스테이지 사이 큐는 크기 제한)
+        batches = threaded_stage(
+            self._iter_batches(diff.to_index, diff.fingerprints),
+            maxsize=self.queue_size,
+            name="index-chunk"
+        )
+        embedded = threaded_stage(
+            batches, self._embed_batch, maxsize=self.queue_size, name="index-embed"
+        )
+        try:
+            for count, batch in enumerate(embedded, 1):
+                self._upsert_batch(batch)
+                # 주기적으로 저장하여 중단되어도 완료된 파일은 다시 처리하지 않음
+                if persist and count % self.persist_every == 0:
+                    self.persist()
+        finally:
+            # 업서트가 실패해도 스테이지 스레드와 청킹 프로세스 풀이 남지 않게 모두 닫음
+            for stage in (embedded, batches):
+                stage.close()
+        self._remove_orphans()
+        if persist:
+            self.persist()
+        if diff.to_index or diff.deleted:
+            self.generation += 1
+    
+    def _iter_batches(
+        self,
+        files: List[Path],
+        fingerprints: Dict[str, Tuple[int, int, str]]
+    ) -> Iterator[IndexBatch]:
+        """
+        청킹 결과를 파일 경계에서 batch_size 문서 단위로 묶음
+        
+        이미 저장된 내용(다른 파일의 같은 코드, 변경된 파일에서 그대로인 함수 등)은 위치만
+        기록하고 문서로 만들지 않아 임베딩하지 않는다.
+        """
+        batch = IndexBatch()
+        # 이번 갱신에서 문서를 만든 내용 ID (아직 업서트되지 않았을 수 있음)
+        pending = set()
+        for file_path, chunks, imports in self.iter_parsed_files(files):
+            rel_path = str(file_path.relative_to(self.project_path))
+            chunk_ids, seen = [], set()
+            for chunk in chunks:
+                if chunk.chunk_id in seen:
+                    continue
+                seen.add(chunk.chunk_id)
+                document = self._to_document(chunk)
+                batch.locations.append(document.metadata)
+                doc_id = document.metadata["chunk_id"]
+                if doc_id in chunk_ids:
+                    continue
+                chunk_ids.append(doc_id)
+                if doc_id in pending or self.locations.is_stored(doc_id):
+                    continue
+                pending.add(doc_id)
+                batch.ids.append(doc_id)
+                batch.documents.append(document)
+            batch.files.append((rel_path, fingerprints[rel_path], chunk_ids, imports))
+            if len(batch.documents) >= self.batch_size:
+                yield batch
+                batch = IndexBatch()
+        if batch.files:
+            yield batch
+    
+    def _embed_batch(self, batch: IndexBatch) -> IndexBatch:
+        """벡터를 직접 받을 수 있는 스토어면 업서트와 별도 스테이지에서 임베딩"""
+        if batch.documents and (
+            hasattr(self.vector_store, "add_vectors") or isinstance(self.vector_store, Chroma)
+        ):
+            batch.vectors = embed_to_array(
+                self.embeddings, [doc.page_content for doc in batch.documents]
+            )
+        return batch
+    
+    def _upsert_batch(self, batch: IndexBatch):
+        """배치를 벡터 스토어와 키워드/심볼/위치 색인에 반영한 뒤 매니페스트 갱신"""
+        if batch.documents:
+            texts = [doc.page_content for doc in batch.documents]
+            metadatas = [doc.metadata for doc in batch.documents]
+            if batch.vectors is None:
+                self.vector_store.add_documents(batch.documents, ids=batch.ids)
+            elif hasattr(self.vector_store, "add_vectors"):
+                self.vector_store.add_vectors(batch.vectors, texts, metadatas, batch.ids)
+            else:
+                self.chroma_collection.upsert(
+                    ids=batch.ids,
+                    embeddings=batch.vectors.tolist(),
+                    documents=texts,
+                    metadatas=metadatas
+                )
+            for doc_id, text, metadata in zip(batch.ids, texts, metadatas):
+                self.keyword_index.add(doc_id, text, metadata)
+        self.locations.add(batch.locations)
+        self.symbol_index.add(
+            row for row in map(symbol_from_metadata, batch.locations) if row is not None
+        )
+        for rel_path, (size, mtime_ns, content_hash), chunk_ids, imports in batch.files:
+            self.manifest.update(rel_path, size, mtime_ns, content_hash, chunk_ids)
+            self.import_graph.update_file(rel_path, imports)
+    
+    def _remove_orphans(self):
+        """위치가 하나도 남지 않은 내용의 문서를 벡터 스토어와 키워드 색인에서 삭제"""
+        orphans = self.locations.take_orphans()
+        if orphans:
+            self.vector_store.delete(ids=orphans)
+            self.keyword_index.remove(orphans)
+    
+    def _backfill_import_graph(self):
+        """그래프가 없던 이전 인덱스: 변경 없는 파일의 import만 추출하여 그래프 채움"""
+        missing = [
+            self.project_path / rel_path for rel_path in self.manifest.files
+            if rel_path not in self.import_graph
+        ]
+        for file_path, _, imports in self.iter_parsed_files(missing):
+            self.import_graph.update_file(str(file_path.relative_to(self.project_path)), imports)
+        self.import_graph.save()
+    
+    def persist(self):
+        """벡터 스토어, 키워드/심볼 색인, import 그래프, 청크 위치, 매니페스트 저장"""
+        with self._update_lock:
             self.vector_store.persist()
+            self.keyword_index.save()
+            self.symbol_index.save()
+            self.import_graph.save()
+            self.locations.save()
+            self.manifest.save()
+    
+    @staticmethod
+    def _to_document(chunk: CodeChunk) -> Document:
+        """청크를 벡터 스토어 문서로 변환"""
+        return Document(
+            page_content=chunk.content,
+            metadata={
+                "chunk_id": chunk.content_id,
+                "file_path": chunk.file_path,
+                "chunk_type": chunk.chunk_type,
+                "language": chunk.language,
+                "lines": f"{chunk.start_line}-{chunk.end_line}",
+                "symbol": chunk.name,
+                "parent": chunk.parent,
+                "part": chunk.part
+            }
+        )
+    
+    def expand_locations(
+        self,
+        metadatas: List[Dict[str, Any]],
+        filters: Optional[SearchFilters] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        검색 결과 메타데이터에 같은 내용이 나타나는 모든 위치를 추가
+        
+        저장된 문서의 위치가 여전히 유효하면 그 위치를, 아니면 첫 위치를 대표 위치로 쓴다.
+        필터가 있으면 필터를 만족하는 위치 중에서 대표 위치를 고른다.
+        
+        Args:
+            metadatas: 검색 결과 문서 메타데이터 리스트
+            filters: 검색 필터
+            
+        Returns:
+            "locations"(위치 메타데이터 리스트)와 "duplicates"(다른 위치 수)가 추가된 사본
+        """
+        found = self.locations.locations_for([document_key(m) for m in metadatas])
+        expanded = []
+        for metadata in metadatas:
+            locations = found.get(document_key(metadata))
+            if not locations:
+                expanded.append(metadata)
+                continue
+            candidates = locations
+            if filters:
+                candidates = [l for l in locations if filters.matches(l)] or locations
+            primary = next(
+                (
+                    location for location in candidates
+                    if location["file_path"] == metadata.get("file_path")
+                    and location["lines"] == metadata.get("lines")
+                ),
+                candidates[0]
+            )
+            expanded.append({
+                **metadata,
+                **primary,
+                "locations": [primary] + [l for l in locations if l is not primary],
+                "duplicates": len(locations) - 1
+            })
+        return expanded
+    
+    def filter_ids(self, filters: SearchFilters) -> Optional[frozenset]:
+        """
+        필터를 만족하는 문서(내용 ID) 후보 집합
+        
+        위치 색인의 경로/언어/청크 종류 색인과 매니페스트의 mtime으로 계산하며,
+        색인 generation 단위로 캐시되어 같은 필터의 반복 검색은 다시 조회하지 않는다.
+        
+        Args:
+            filters: 검색 필터
+            
+        Returns:
+            내용 ID 집합 (필터가 비어 있으면 None = 제한 없음)
+        """
+        if not filters:
+            return None
+        
+        def compute() -> frozenset:
+            files = None
+            if filters.modified_since is not None:
+                since_ns = int(filters.modified_since * 1e9)
+                # 파일 감시기가 _update_lock 안에서 레코드를 추가할 수 있으므로 스냅샷을 순회
+                # (검색이 색인 갱신 전체를 기다리지 않도록 락 대신 list()로 한 번에 복사)
+                files = [
+                    rel_path for rel_path, record in list(self.manifest.files.items())
+                    if record.mtime_ns >= since_ns and filters.matches_path(rel_path)
+                ]
+            return frozenset(self.locations.content_ids_matching(filters, files))
+        
+        return self.query_cache.filter(self.generation, ("ids",) + filters.key(), compute)
+    
+    def _vector_search(
+        self,
+        vector: List[float],
+        k: int,
+        filters: SearchFilters
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        필터 후보로 범위를 좁힌 벡터 검색
+        
+        mmap 스토어는 후보 행만 점수를 매기고, Chroma는 chunk_id where 절로 넘긴다.
+        그 밖의 스토어는 후보가 k개 모일 때까지 더 많이 가져와 거른다.
+        
+        Returns:
+            (문서, 코사인 유사도) 리스트 - 점수를 주지 않는 스토어는 None
+        """
+        allowed = self.filter_ids(filters)
+        if allowed is not None and not allowed:
+            return []
+        if hasattr(self.vector_store, "rows_for_ids"):
+            # 행 번호를 구한 뒤 검색이 끝날 때까지 압축으로 행 번호가 바뀌지 않게 함
+            with self.vector_store.reading():
+                rows = None if allowed is None else self._filter_rows(filters, allowed)
+                return self.vector_store.similarity_search_by_vector_with_score(vector, k=k, rows=rows)
+        if isinstance(self.vector_store, Chroma):
+            where = None if allowed is None else {"chunk_id": {"$in": sorted(allowed)}}
+            # 기본 l2 공간의 거리는 제곱 L2이며, 임베딩이 단위 벡터이므로 cos = 1 - d / 2
+            return [
+                (doc, 1.0 - distance / 2)
+                for doc, distance in self.vector_store.similarity_search_by_vector_with_relevance_scores(
+                    vector, k=k, filter=where
+                )
+            ]
+        if allowed is None:
+            return [(doc, None) for doc in self.vector_store.similarity_search_by_vector(vector, k=k)]
+        fetch = max(4 * k, 20)
+        while True:
+            docs = self.vector_store.similarity_search_by_vector(vector, k=fetch)
+            kept = [doc for doc in docs if document_key(doc.metadata) in allowed]
+            if len(kept) >= k or len(docs) < fetch:
+                return [(doc, None) for doc in kept[:k]]
+            fetch *= 4
+    
+    def _filter_rows(self, filters: SearchFilters, allowed: frozenset):
+        """필터 후보의 mmap 스토어 행 번호 (generation과 스토어 압축 횟수 단위 캐시)"""
+        return self.query_cache.filter(
+            self.generation, ("rows", self.vector_store.generation) + filters.key(),
+            lambda: self.vector_store.rows_for_ids(allowed)
+        )
+    
+    def _vector_search_many(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        filters: SearchFilters
+    ) -> List[List[Tuple[Document, Optional[float]]]]:
+        """여러 쿼리 벡터의 벡터 검색 (mmap 스토어는 행렬을 한 번만 스캔)"""
+        if not hasattr(self.vector_store, "similarity_search_by_vectors_with_score"):
+            return [self._vector_search(vector, k, filters) for vector in vectors]
+        allowed = self.filter_ids(filters)
+        if allowed is not None and not allowed:
+            return [[] for _ in vectors]
+        with self.vector_store.reading():
+            rows = None if allowed is None else self._filter_rows(filters, allowed)
+            return self.vector_store.similarity_search_by_vectors_with_score(vectors, k=k, rows=rows)
+    
+    def _candidate_vectors(self, docs: List[Document]) -> Optional[np.ndarray]:
+        """후보 문서의 저장된 임베딩 (스토어가 제공하지 않으면 None)"""
+        ids = [document_key(doc.metadata) for doc in docs]
+        if hasattr(self.vector_store, "vectors_for_ids"):
+            return self.vector_store.vectors_for_ids(ids)
+        if isinstance(self.vector_store, Chroma):
+            stored = self.vector_store.get(ids=ids, include=["embeddings"])
+            by_id = dict(zip(stored["ids"], stored["embeddings"]))
+            if len(by_id) < len(set(ids)):
+                return None
+            return np.asarray([by_id[doc_id] for doc_id in ids], dtype=np.float32)
+        return None
+    
+    def _rerank(
+        self,
+        vector: List[float],
+        scored: List[Tuple[Document, Optional[float]]],
+        k: int,
+        min_score: Optional[float],
+        mmr: bool,
+        lambda_mult: float
+    ) -> List[Tuple[Document, Optional[float]]]:
+        """
+        최소 점수 컷오프 후 (요청 시) MMR로 다양한 k개 선택
+        
+        후보는 점수 내림차순이므로 컷오프는 첫 미달 후보에서 끊는다. MMR은 저장된 후보
+        벡터로 계산하며, 벡터를 얻을 수 없는 스토어에서는 점수 순서를 유지한다.
+        """
+        if min_score is not None:
+            kept = []
+            for doc, score in scored:
+                if score is not None and score < min_score:
+                    break
+                kept.append((doc, score))
+            scored = kept
+        if mmr and len(scored) > 1:
+            vectors = self._candidate_vectors([doc for doc, _ in scored])
+            if vectors is not None:
+                scores = [score for _, score in scored]
+                relevance = None if None in scores else np.asarray(scores, dtype=np.float32)
+                order = maximal_marginal_relevance(
+                    np.asarray(vector, dtype=np.float32), vectors, k,
+                    lambda_mult=lambda_mult, relevance=relevance
+                )
+                scored = [scored[i] for i in order]
+        return scored[:k]
+    
+    def _with_locations(
+        self,
+        scored: List[Tuple[Document, Optional[float]]],
+        filters: SearchFilters
+    ) -> List[Document]:
+        """검색 결과 메타데이터를 expand_locations로 확장하고 "score"(코사인 유사도) 추가"""
+        metadatas = self.expand_locations([doc.metadata for doc, _ in scored], filters)
+        return [
+            Document(page_content=doc.page_content, metadata={**metadata, "score": score})
+            for (doc, score), metadata in zip(scored, metadatas)
+        ]
+    
+    def embed_query(self, query: str) -> List[float]:
+        """
+        쿼리 임베딩 (같은 쿼리는 임베딩 백엔드를 다시 호출하지 않음)
+        
+        Args:
+            query: 검색 쿼리
+            
+        Returns:
+            쿼리 임베딩 벡터
+        """
+        return self.query_cache.embed_query(
+            self.embedding_model, query, self.embeddings.embed_query
+        )
+    
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        여러 쿼리 임베딩 (캐시에 없는 쿼리만 한 번의 백엔드 호출로 임베딩)
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            
+        Returns:
+            쿼리 순서의 임베딩 벡터 리스트
+        """
+        return self.query_cache.embed_queries(
+            self.embedding_model, queries,
+            lambda pending: embed_queries(self.embeddings, pending).tolist()
+        )
     
-    def semantic_search(self, query: str, k: int = 5) -> List[Document]:
+    def semantic_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        min_score: Optional[float] = None,
+        mmr: bool = False,
+        lambda_mult: float = 0.5,
+        fetch_k: Optional[int] = None
+    ) -> List[Document]:
         """
         의미 기반 검색
         
+        결과는 색인 generation 단위로 캐시되어, 색인이 바뀌기 전까지 같은 쿼리는
+        임베딩/벡터 검색 없이 반환된다. 필터는 점수 계산 전에 후보 문서를 제한한다.
+        결과 메타데이터의 "score"는 쿼리와의 코사인 유사도이다.
+        
         Args:
             query: 검색 쿼리
             k: 반환할 결과 수
+            filters: {"path", "language", "chunk_type", "modified_since"} 필터 (SearchFilters 참고)
+            min_score: 이 유사도 미만의 결과는 버림 (k개보다 적게 반환될 수 있음)
+            mmr: True이면 후보 fetch_k개를 MMR로 재순위하여 서로 다른 k개 선택
+            lambda_mult: MMR 관련성 가중치 (1이면 관련성만, 0이면 다양성만)
+            fetch_k: MMR 후보 수 (기본값 max(4k, 20))
             
         Returns:
             검색 결과 문서 리스트
         """
-        return self.vector_store.similarity_search(query, k=k)
+        search_filters = SearchFilters.from_dict(filters)
+        fetch, options = self._rerank_options(k, min_score, mmr, lambda_mult, fetch_k)
+        
+        def search() -> SearchResults:
+            vector = self.embed_query(query)
+            scored = self._vector_search(vector, fetch, search_filters)
+            scored = self._rerank(vector, scored, k, min_score, mmr, lambda_mult)
+            return freeze_documents(self._with_locations(scored, search_filters))
+        
+        return thaw_documents(self.query_cache.search(
+            self.generation, "semantic", query, k, search, filters=filters, options=options
+        ))
+    
+    def semantic_search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        min_score: Optional[float] = None,
+        mmr: bool = False,
+        lambda_mult: float = 0.5,
+        fetch_k: Optional[int] = None
+    ) -> List[List[Document]]:
+        """
+        여러 쿼리의 의미 기반 검색
+        
+        캐시에 없는 쿼리만 모아 한 번의 배치로 임베딩하고, mmap 스토어에서는 행렬을 한 번
+        스캔하여 모든 쿼리의 점수를 행렬 곱으로 계산한다. 결과는 semantic_search와 같은
+        캐시를 공유한다.
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            k: 쿼리당 반환할 결과 수
+            filters: 메타데이터 필터 (semantic_search와 같음)
+            min_score: 최소 유사도 (semantic_search와 같음)
+            mmr: MMR 재순위 여부
+            lambda_mult: MMR 관련성 가중치
+            fetch_k: MMR 후보 수
+            
+        Returns:
+            쿼리 순서의 검색 결과 문서 리스트
+        """
+        search_filters = SearchFilters.from_dict(filters)
+        fetch, options = self._rerank_options(k, min_score, mmr, lambda_mult, fetch_k)
+        
+        def search(pending: List[str]) -> List[SearchResults]:
+            vectors = self.embed_queries(pending)
+            scored_lists = self._vector_search_many(vectors, fetch, search_filters)
+            return [
+                freeze_documents(self._with_locations(
+                    self._rerank(vector, scored, k, min_score, mmr, lambda_mult), search_filters
+                ))
+                for vector, scored in zip(vectors, scored_lists)
+            ]
+        
+        results = self.query_cache.search_many(
+            self.generation, "semantic", queries, k, search, filters=filters, options=options
+        )
+        return [thaw_documents(docs) for docs in results]
+    
+    def iter_semantic_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        min_score: Optional[float] = None
+    ) -> Iterator[List[Document]]:
+        """
+        의미 기반 검색의 중간 결과를 차례로 반환 (스트리밍)
+        
+        mmap 스토어는 샤드를 스캔할 때마다 지금까지 본 문서의 top-k를 반환하고, 그 밖의
+        스토어와 캐시 적중은 최종 결과를 한 번 반환한다. 마지막 값은 semantic_search와 같으며,
+        끝까지 소비하면 semantic_search와 같은 결과 캐시에 저장된다.
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            filters: 메타데이터 필터 (semantic_search와 같음)
+            min_score: 최소 유사도 (semantic_search와 같음)
+            
+        Yields:
+            지금까지의 top-k 검색 결과 문서 리스트
+        """
+        _, options = self._rerank_options(k, min_score, False, 0.5, None)
+        generation = self.generation
+        cached = self.query_cache.cached_search(generation, "semantic", query, k, filters, options)
+        if cached is not None:
+            yield thaw_documents(cached)
+            return
+        if not hasattr(self.vector_store, "iter_similarity_search_by_vector_with_score"):
+            yield self.semantic_search(query, k=k, filters=filters, min_score=min_score)
+            return
+        
+        search_filters = SearchFilters.from_dict(filters)
+        start = time.perf_counter()
+        vector = self.embed_query(query)
+        allowed = self.filter_ids(search_filters)
+        result: SearchResults = ()
+        if allowed is None or allowed:
+            # 스토어는 yield 사이에 락을 놓으므로, 후보 행이 어느 generation 기준인지 함께 기록
+            with self.vector_store.reading():
+                rows = None if allowed is None else self._filter_rows(search_filters, allowed)
+                store_generation = self.vector_store.generation
+            for scored in self.vector_store.iter_similarity_search_by_vector_with_score(
+                vector, k=k, rows=rows
+            ):
+                scored = self._rerank(vector, scored, k, min_score, False, 0.5)
+                docs = self._with_locations(scored, search_filters)
+                # 호출자가 yield된 문서를 수정하기 전에 스냅샷
+                result = freeze_documents(docs)
+                yield docs
+            if rows is not None and self.vector_store.generation != store_generation:
+                # 도중에 압축되어 후보 행 스캔이 멈췄으면 새 행 번호로 한 번에 검색
+                yield self.semantic_search(query, k=k, filters=filters, min_score=min_score)
+                return
+        else:
+            yield []
+        self.query_cache.store_search(
+            generation, "semantic", query, k, result, time.perf_counter() - start,
+            filters=filters, options=options
+        )
+    
+    @staticmethod
+    def _rerank_options(
+        k: int,
+        min_score: Optional[float],
+        mmr: bool,
+        lambda_mult: float,
+        fetch_k: Optional[int]
+    ) -> Tuple[int, Tuple]:
+        """(벡터 검색 후보 수, 결과 캐시 키에 들어갈 옵션)"""
+        if not mmr:
+            return k, (min_score,) if min_score is not None else ()
+        fetch = max(fetch_k or max(4 * k, 20), k)
+        return fetch, (min_score, "mmr", lambda_mult, fetch)
 
+    
+    def keyword_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 키워드 검색 (정확한 식별자 매칭에 강함)
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            filters: 메타데이터 필터 (semantic_search와 같음)
+            
+        Returns:
+            {"id", "content", "metadata", "score"} 리스트
+        """
+        search_filters = SearchFilters.from_dict(filters)
+        allowed = self.filter_ids(search_filters)
+        if allowed is not None and not allowed:
+            return []
+        results = self.keyword_index.search(query, k=k, ids=allowed)
+        metadatas = self.expand_locations([result["metadata"] for result in results], search_filters)
+        return [{**result, "metadata": metadata} for result, metadata in zip(results, metadatas)]
+    
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        candidates: Optional[int] = None,
+        rrf_k: int = 60,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25와 벡터 검색 결과를 RRF로 결합한 하이브리드 검색
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            candidates: 각 검색에서 가져올 후보 수 (기본값 max(4k, 20))
+            rrf_k: RRF 상수
+            filters: 메타데이터 필터 (semantic_search와 같음)
+            
+        Returns:
+            {"id", "content", "metadata", "score"} 리스트 (score는 RRF 점수)
+        """
+        candidates = candidates or max(4 * k, 20)
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        keyword_ranking = []
+        for result in self.keyword_search(query, k=candidates, filters=filters):
+            keyword_ranking.append(result["id"])
+            results.setdefault(result["id"], result)
+        
+        vector_ranking = []
+        for doc in self.semantic_search(query, k=candidates, filters=filters):
+            key = document_key(doc.metadata)
+            vector_ranking.append(key)
+            results.setdefault(key, {
+                "id": key,
+                "content": doc.page_content,
+                "metadata": doc.metadata
+            })
+        
+        fused = reciprocal_rank_fusion([keyword_ranking, vector_ranking], k=rrf_k)
+        return [{**results[key], "score": score} for key, score in fused[:k]]
+    
+    def stream_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        min_score: Optional[float] = None,
+        rrf_k: int = 60
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        키워드 + 의미 검색 결과를 준비되는 대로 반환하는 스트리밍 검색
+        
+        BM25 키워드 결과를 먼저 내보내고, 이어서 벡터 스캔의 샤드마다 지금까지의 top-k에
+        새로 들어온 의미 검색 결과를 내보낸다. 같은 청크는 한 번만 나온다. 마지막에는 두 최종
+        순위를 RRF로 결합한 "complete" 항목을 내보낸다. 소비를 멈추면 남은 스캔도 하지 않는다.
+        
+        Args:
+            query: 검색 쿼리
+            k: 각 검색에서 가져올 결과 수
+            filters: 메타데이터 필터 (semantic_search와 같음)
+            min_score: 의미 검색 결과의 최소 유사도
+            rrf_k: RRF 상수
+            
+        Yields:
+            {"type": "result", "source": "keyword" | "semantic", "id", "content", "metadata", "score"}
+            (score는 BM25 점수 또는 코사인 유사도), 마지막으로
+            {"type": "complete", "ids": RRF 순위의 ID 리스트, "results", "elapsed_ms"}
+        """
+        start = time.perf_counter()
+        seen = set()
+        keyword_ranking = []
+        for result in self.keyword_search(query, k=k, filters=filters):
+            keyword_ranking.append(result["id"])
+            seen.add(result["id"])
+            yield {"type": "result", "source": "keyword", **result}
+        
+        docs: List[Document] = []
+        for docs in self.iter_semantic_search(query, k=k, filters=filters, min_score=min_score):
+            for doc in docs:
+                key = document_key(doc.metadata)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {
+                    "type": "result",
+                    "source": "semantic",
+                    "id": key,
+                    "content": doc.page_content,
+                    "metadata": doc.metadata,
+                    "score": doc.metadata.get("score")
+                }
+        
+        vector_ranking = [document_key(doc.metadata) for doc in docs]
+        fused = reciprocal_rank_fusion([keyword_ranking, vector_ranking], k=rrf_k)
+        yield {
+            "type": "complete",
+            "ids": [key for key, _ in fused[:k]],
+            "results": len(seen),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
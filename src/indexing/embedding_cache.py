@@ -0,0 +1,260 @@
+"""On-disk, content-addressed embedding cache."""
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .embeddings import embed_queries, embed_to_array
+
+
+def default_cache_path() -> Path:
+    """기본 캐시 위치 (CURSOR_EMBEDDING_CACHE 환경 변수로 변경 가능)"""
+    env_path = os.getenv("CURSOR_EMBEDDING_CACHE")
+    if env_path:
+        return Path(env_path)
+    return Path.home() / ".cache" / "deepagent" / "embeddings.sqlite3"
+
+
+def text_digest(text: str) -> bytes:
+    """청크 텍스트의 SHA-256 다이제스트"""
+    return hashlib.sha256(text.encode('utf-8')).digest()
+
+
+class EmbeddingCache:
+    """
+    (모델 이름, 텍스트 SHA-256) → 임베딩 벡터 SQLite 캐시
+
+    같은 텍스트는 브랜치/워크트리가 달라도 한 번만 임베딩된다.
+    전체 벡터 크기가 max_bytes를 넘으면 마지막 사용 시각이 오래된 것부터 제거한다.
+    """
+
+    # 제거 시 max_bytes의 이 비율까지 줄인다 (잦은 제거 방지)
+    EVICT_TARGET_RATIO = 0.9
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = 1 << 30):
+        """
+        Embedding Cache 초기화
+
+        Args:
+            path: SQLite 파일 경로 (None이면 default_cache_path())
+            max_bytes: 저장할 벡터의 최대 총 바이트 수
+        """
+        self.path = Path(path) if path else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " digest BLOB NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " last_used INTEGER NOT NULL,"
+            " PRIMARY KEY (model, digest)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        self._entries, self._size_bytes = row
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, model: str, digests: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        캐시된 벡터 조회 (조회된 항목의 마지막 사용 시각 갱신)
+
+        Args:
+            model: 임베딩 모델 이름
+            digests: 텍스트 다이제스트 리스트
+
+        Returns:
+            다이제스트 → float32 벡터
+        """
+        found: Dict[bytes, np.ndarray] = {}
+        unique = list(dict.fromkeys(digests))
+        now = time.time_ns()
+        with self._lock:
+            # SQLite 바인딩 변수 제한을 피하기 위해 나누어 조회
+            for i in range(0, len(unique), 500):
+                part = unique[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT digest, vector FROM embeddings "
+                    f"WHERE model = ? AND digest IN ({placeholders})",
+                    [model, *part]
+                ).fetchall()
+                for digest, vector in rows:
+                    found[bytes(digest)] = np.frombuffer(vector, dtype=np.float32)
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND digest = ?",
+                    [(now, model, digest) for digest in found]
+                )
+                self._conn.commit()
+            hits = sum(1 for d in digests if d in found)
+            self.hits += hits
+            self.misses += len(digests) - hits
+        return found
+
+    def put_many(self, model: str, items: Dict[bytes, np.ndarray]):
+        """
+        벡터 저장 후 필요하면 LRU 제거
+
+        Args:
+            model: 임베딩 모델 이름
+            items: 다이제스트 → 벡터
+        """
+        if not items:
+            return
+        now = time.time_ns()
+        rows = [
+            (model, digest, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for digest, vector in items.items()
+        ]
+        with self._lock:
+            # 덮어쓰는 행은 새 항목이 아니므로 기존 크기를 빼고 집계
+            replaced = self._stored_sizes(model, list(items))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, digest, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+            self._entries += len(rows) - len(replaced)
+            self._size_bytes += sum(len(row[2]) for row in rows) - sum(replaced.values())
+            if self._size_bytes > self.max_bytes:
+                self._evict()
+
+    def _stored_sizes(self, model: str, digests: List[bytes]) -> Dict[bytes, int]:
+        """이미 저장된 다이제스트 → 벡터 바이트 수"""
+        sizes: Dict[bytes, int] = {}
+        for i in range(0, len(digests), 500):
+            part = digests[i:i + 500]
+            placeholders = ",".join("?" * len(part))
+            for digest, size in self._conn.execute(
+                f"SELECT digest, LENGTH(vector) FROM embeddings "
+                f"WHERE model = ? AND digest IN ({placeholders})",
+                [model, *part]
+            ):
+                sizes[bytes(digest)] = size
+        return sizes
+
+    def _refresh_size(self):
+        self._entries, self._size_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+
+    def _evict(self):
+        """마지막 사용 시각 순으로 목표 크기까지 제거"""
+        self._refresh_size()
+        target = int(self.max_bytes * self.EVICT_TARGET_RATIO)
+        excess = self._size_bytes - target
+        victims = []
+        for model, digest, size in self._conn.execute(
+            "SELECT model, digest, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        ):
+            if excess <= 0:
+                break
+            victims.append((model, digest))
+            excess -= size
+        self._conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND digest = ?", victims
+        )
+        self._conn.commit()
+        self.evictions += len(victims)
+        self._refresh_size()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률, 크기, 제거 횟수 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._entries,
+            "size_bytes": self._size_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 캐시를 먼저 조회하고, 미스만 배치로 하위 임베딩 백엔드에 보내는 래퍼"""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache: EmbeddingCache,
+        batch_size: int = 512
+    ):
+        """
+        Cached Embeddings 초기화
+
+        Args:
+            embeddings: 실제 임베딩 백엔드
+            cache: 임베딩 캐시
+            batch_size: 미스 텍스트를 한 번에 보내는 개수
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.batch_size = batch_size
+        self.model = str(
+            getattr(embeddings, "model", None) or type(embeddings).__name__
+        )
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        텍스트 배치를 (n, dim) float32 행렬로 임베딩 (캐시 우선)
+
+        Args:
+            texts: 텍스트 리스트
+
+        Returns:
+            임베딩 행렬
+        """
+        digests = [text_digest(text) for text in texts]
+        vectors = self.cache.get_many(self.model, digests)
+
+        # 미스 텍스트는 중복 제거 후 큰 배치로 임베딩
+        missing: Dict[bytes, str] = {}
+        for digest, text in zip(digests, texts):
+            if digest not in vectors:
+                missing.setdefault(digest, text)
+        missing_items = list(missing.items())
+        for i in range(0, len(missing_items), self.batch_size):
+            batch = missing_items[i:i + self.batch_size]
+            embedded = embed_to_array(self.embeddings, [text for _, text in batch])
+            new_vectors = {digest: embedded[j] for j, (digest, _) in enumerate(batch)}
+            self.cache.put_many(self.model, new_vectors)
+            vectors.update(new_vectors)
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([vectors[digest] for digest in digests]).astype(np.float32, copy=False)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """쿼리 배치 임베딩 (embed_query처럼 디스크 캐시를 거치지 않음)"""
+        return embed_queries(self.embeddings, queries)
@@ -0,0 +1,195 @@
+"""Embedding backends for the codebase index."""
+from typing import List, Dict, Tuple, Optional
+import os
+import threading
+import zlib
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .tokenizer import tokenize_code
+
+
+class LocalHashEmbeddings(Embeddings):
+    """
+    외부 서비스 없이 CPU에서 동작하는 해시 n-gram 임베딩
+
+    토큰(식별자 및 하위 단어)과 문자 3-gram을 부호 있는 해싱으로
+    고정 차원에 사상하고, 로그 TF 가중치 후 L2 정규화한다.
+    결과는 결정적이므로 프로세스/머신이 달라도 같은 벡터를 얻는다.
+    """
+
+    # 토큰 어휘가 이 크기를 넘으면 비운다
+    MAX_VOCAB = 500_000
+
+    def __init__(self, dim: int = 512, ngram: int = 3, ngram_weight: float = 0.5):
+        """
+        Local Hash Embeddings 초기화
+
+        Args:
+            dim: 임베딩 차원
+            ngram: 문자 n-gram 길이 (0이면 사용 안 함)
+            ngram_weight: 토큰 가중치 대비 n-gram 전체 가중치
+        """
+        self.dim = dim
+        self.ngram = ngram
+        self.ngram_weight = ngram_weight
+        # 출력에 영향을 주는 모든 설정을 포함 (임베딩 캐시와 색인 매니페스트의 모델 키)
+        self.model = f"local-hash-{dim}-{ngram}-{ngram_weight:g}"
+        # 어휘 테이블은 호출 간에 공유되므로 동시 검색 스레드가 함께 갱신하지 않도록 보호
+        self._lock = threading.Lock()
+        self._reset_vocab()
+
+    def _reset_vocab(self):
+        # 토큰 → ID, 그리고 토큰별 특징을 CSR 형태로 보관
+        self._vocab: Dict[str, int] = {}
+        self._feat_ptr = np.zeros(1, dtype=np.int64)
+        self._feat_idx = np.zeros(0, dtype=np.int64)
+        self._feat_val = np.zeros(0, dtype=np.float32)
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        h = zlib.crc32(feature.encode('utf-8'))
+        return h % self.dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+    def _features(self, token: str) -> Tuple[List[int], List[float]]:
+        """토큰 하나의 (버킷 인덱스, 가중치) 목록"""
+        index, sign = self._bucket(token)
+        indices, values = [index], [sign]
+        if self.ngram and len(token) > self.ngram:
+            padded = f"<{token}>"
+            grams = [padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)]
+            weight = self.ngram_weight / len(grams)
+            for gram in grams:
+                index, sign = self._bucket("#" + gram)
+                indices.append(index)
+                values.append(sign * weight)
+        return indices, values
+
+    def _token_ids(self, tokens: List[str]) -> np.ndarray:
+        """토큰을 어휘 ID로 변환하고, 새 토큰의 특징을 CSR 테이블에 추가"""
+        if len(self._vocab) > self.MAX_VOCAB:
+            self._reset_vocab()
+        vocab = self._vocab
+        new_idx: List[int] = []
+        new_val: List[float] = []
+        new_len: List[int] = []
+        ids = []
+        for token in tokens:
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = vocab[token] = len(vocab)
+                indices, values = self._features(token)
+                new_idx.extend(indices)
+                new_val.extend(values)
+                new_len.append(len(indices))
+            ids.append(token_id)
+        if new_len:
+            self._feat_ptr = np.concatenate([
+                self._feat_ptr, self._feat_ptr[-1] + np.cumsum(new_len)
+            ])
+            self._feat_idx = np.concatenate([self._feat_idx, np.asarray(new_idx, dtype=np.int64)])
+            self._feat_val = np.concatenate([self._feat_val, np.asarray(new_val, dtype=np.float32)])
+        return np.asarray(ids, dtype=np.int64)
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """
+        텍스트 배치를 (n, dim) float32 행렬로 임베딩
+
+        Args:
+            texts: 텍스트 리스트
+
+        Returns:
+            L2 정규화된 임베딩 행렬
+        """
+        token_lists = [tokenize_code(text) for text in texts]
+        lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(texts))
+        with self._lock:
+            token_ids = self._token_ids([token for tokens in token_lists for token in tokens])
+            vocab_size = max(len(self._vocab), 1)
+            feat_ptr, feat_idx, feat_val = self._feat_ptr, self._feat_idx, self._feat_val
+        rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+        # (문서, 토큰) 쌍별 TF → 로그 가중치
+        keys, tf = np.unique(rows * vocab_size + token_ids, return_counts=True)
+        pair_rows = keys // vocab_size
+        pair_tokens = keys % vocab_size
+        pair_weights = 1.0 + np.log(tf)
+
+        # 각 쌍을 토큰의 특징 목록으로 펼침
+        starts = feat_ptr[pair_tokens]
+        counts = feat_ptr[pair_tokens + 1] - starts
+        total = int(counts.sum())
+        first = np.cumsum(counts) - counts
+        positions = np.arange(total, dtype=np.int64) + np.repeat(starts - first, counts)
+        flat_index = np.repeat(pair_rows, counts) * self.dim + feat_idx[positions]
+        weights = feat_val[positions] * np.repeat(pair_weights, counts)
+
+        matrix = np.bincount(
+            flat_index, weights=weights, minlength=len(texts) * self.dim
+        ).reshape(len(texts), self.dim).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_array([text])[0].tolist()
+
+
+def embed_to_array(embeddings: Embeddings, texts: List[str]) -> np.ndarray:
+    """
+    임의의 Embeddings 백엔드로 텍스트를 (n, dim) float32 행렬로 임베딩
+
+    Args:
+        embeddings: 임베딩 백엔드 (embed_array가 있으면 사용)
+        texts: 텍스트 리스트
+
+    Returns:
+        임베딩 행렬
+    """
+    if hasattr(embeddings, "embed_array"):
+        return embeddings.embed_array(texts)
+    return np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+
+def embed_queries(embeddings: Embeddings, queries: List[str]) -> np.ndarray:
+    """
+    검색 쿼리 배치를 한 번의 백엔드 호출로 (n, dim) float32 행렬로 임베딩
+
+    Args:
+        embeddings: 임베딩 백엔드 (embed_queries가 있으면 사용)
+        queries: 쿼리 리스트
+
+    Returns:
+        임베딩 행렬
+    """
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(queries)
+    return embed_to_array(embeddings, queries)
+
+
+def embedding_dimension(embeddings: Embeddings) -> Optional[int]:
+    """설정에서 알 수 있는 임베딩 차원 (캐시 래퍼는 하위 백엔드 기준, 모르면 None)"""
+    backend = getattr(embeddings, "embeddings", embeddings)
+    dim = getattr(backend, "dim", None) or getattr(backend, "dimensions", None)
+    return int(dim) if dim else None
+
+
+def create_embeddings(backend: Optional[str] = None) -> Embeddings:
+    """
+    이름으로 임베딩 백엔드 생성
+
+    Args:
+        backend: "openai" 또는 "local" (None이면 CURSOR_EMBEDDING_BACKEND 환경 변수, 기본 "openai")
+
+    Returns:
+        Embeddings 인스턴스
+    """
+    backend = (backend or os.getenv("CURSOR_EMBEDDING_BACKEND", "openai")).lower()
+    if backend == "openai":
+        from langchain.embeddings import OpenAIEmbeddings
+        return OpenAIEmbeddings()
+    if backend == "local":
+        return LocalHashEmbeddings()
+    raise ValueError(f"Unsupported embedding backend: {backend}")
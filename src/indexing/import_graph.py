@@ -0,0 +1,400 @@
+"""Project-wide import graph with reverse-dependency queries."""
+from typing import List, Dict, Optional, Set, Tuple, Iterable
+from collections import deque
+from pathlib import Path
+import os
+import pickle
+import posixpath
+import threading
+
+
+# 인덱스 저장 디렉토리 안의 import 그래프 파일 이름
+IMPORT_GRAPH_FILE = "import_graph.pkl"
+
+GRAPH_VERSION = 1
+
+# 하나의 import가 가리킬 수 있는 프로젝트 파일 후보 (우선순위 순, '/' 구분 상대 경로)
+Candidates = Tuple[str, ...]
+
+# 절대 import를 찾아볼 소스 루트 (프로젝트 루트와 src 레이아웃)
+PYTHON_SOURCE_ROOTS = ("", "src/")
+
+JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+
+def _module_files(base: str) -> Tuple[str, str]:
+    return (f"{base}.py", f"{base}/__init__.py")
+
+
+def python_import_candidates(
+    rel_path: str,
+    module: Optional[str],
+    level: int = 0,
+    names: Iterable[str] = ()
+) -> List[Candidates]:
+    """
+    Python import 문 하나를 프로젝트 파일 후보로 변환
+
+    `from pkg import name`의 name은 하위 모듈일 수도 있으므로 하위 모듈 후보를 먼저,
+    패키지/모듈 자신을 그 다음 후보로 둔다.
+
+    Args:
+        rel_path: import가 있는 파일의 상대 경로
+        module: 모듈 이름 (`from . import x`이면 None)
+        level: 상대 import 단계 (점 개수)
+        names: from import의 이름들
+
+    Returns:
+        import별 후보 튜플 리스트
+    """
+    if level:
+        package = posixpath.dirname(rel_path.replace(os.sep, "/"))
+        for _ in range(level - 1):
+            package = posixpath.dirname(package)
+        parts = [package] if package else []
+        if module:
+            parts.append(module.replace(".", "/"))
+        bases = ["/".join(parts)]
+    elif module:
+        bases = [root + module.replace(".", "/") for root in PYTHON_SOURCE_ROOTS]
+    else:
+        return []
+
+    if level and not module:
+        # `from . import x`: 패키지 자신(__init__.py)만 모듈 후보
+        module_candidates = tuple(f"{base}/__init__.py" for base in bases if base)
+    else:
+        module_candidates = tuple(
+            candidate for base in bases if base for candidate in _module_files(base)
+        )
+    results = []
+    for name in names:
+        if name == "*":
+            continue
+        submodules = tuple(
+            candidate for base in bases
+            for candidate in _module_files(f"{base}/{name}" if base else name)
+        )
+        results.append(submodules + module_candidates)
+    if not results and module_candidates:
+        results.append(module_candidates)
+    return results
+
+
+def js_import_candidates(rel_path: str, source: str) -> Optional[Candidates]:
+    """
+    JS/TS 모듈 경로를 프로젝트 파일 후보로 변환 (상대 경로만, 패키지 import는 None)
+
+    Args:
+        rel_path: import가 있는 파일의 상대 경로
+        source: import/require 모듈 경로
+
+    Returns:
+        후보 튜플 또는 None
+    """
+    if not source.startswith("."):
+        return None
+    directory = posixpath.dirname(rel_path.replace(os.sep, "/"))
+    target = posixpath.normpath(posixpath.join(directory, source))
+    if target.startswith(".."):
+        return None
+    stem, ext = posixpath.splitext(target)
+    candidates = [target] if ext else []
+    if ext in (".js", ".jsx", ".mjs", ".cjs"):
+        # TS ESM은 컴파일 결과 확장자(.js)로 import한다
+        candidates.extend(stem + e for e in (".ts", ".tsx"))
+    candidates.extend(target + e for e in JS_EXTENSIONS)
+    candidates.extend(f"{target}/index{e}" for e in JS_EXTENSIONS)
+    return tuple(candidates)
+
+
+def is_test_file(rel_path: str) -> bool:
+    """테스트 파일 이름 규칙 (test_*.py, *_test.py, *.test.ts, *.spec.js 등)"""
+    name = posixpath.basename(rel_path.replace(os.sep, "/"))
+    stem = name.rsplit(".", 1)[0]
+    return (
+        name.startswith("test_") and name.endswith(".py")
+        or stem.endswith("_test")
+        or ".test." in name
+        or ".spec." in name
+    )
+
+
+class ImportGraph:
+    """
+    파일 → 파일 import 그래프
+
+    파일마다 import 후보 목록만 저장하고, 후보 중 색인된 첫 파일로 간선을 해석한다.
+    역방향 간선과 "후보 → 그 후보를 가진 파일" 역색인을 메모리에 유지하므로
+    파일이 추가/삭제되면 그 파일을 후보로 가진 파일들의 간선만 다시 해석한다.
+    """
+
+    def __init__(self, index_path: Path):
+        """
+        Import Graph 초기화
+
+        Args:
+            index_path: 그래프 저장 파일 경로
+        """
+        self.index_path = Path(index_path)
+        self._lock = threading.RLock()
+        self._loaded = False
+        # 마지막으로 로드/저장한 파일의 (mtime_ns, 크기) - refresh()가 외부 저장을 감지
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    def _reset(self):
+        self._imports: Dict[str, List[Candidates]] = {}
+        self._deps: Dict[str, Set[str]] = {}
+        self._rdeps: Dict[str, Set[str]] = {}
+        self._watchers: Dict[str, Set[str]] = {}
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.index_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _ensure_loaded(self):
+        """처음 사용할 때 디스크에서 로드하고 간선 재구성"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._reset()
+            state = None
+            self._stamp = self._file_stamp()
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path, 'rb') as f:
+                        state = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    state = None
+            if state and state.get("version") == GRAPH_VERSION:
+                self._imports = state["imports"]
+                for rel_path, imports in self._imports.items():
+                    self._watch(rel_path, imports)
+                for rel_path in self._imports:
+                    self._resolve(rel_path)
+            self._loaded = True
+
+    def save(self):
+        """그래프를 원자적으로 저장 (해석된 간선은 로드 시 재구성)"""
+        self._ensure_loaded()
+        with self._lock:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(
+                    {"version": GRAPH_VERSION, "imports": self._imports},
+                    f, protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, self.index_path)
+            self._stamp = self._file_stamp()
+
+    def refresh(self):
+        """
+        다른 프로세스의 인덱서가 로드 이후 그래프를 다시 저장했으면 다음 조회 때 새로 로드
+
+        저장한 적 없는 메모리 변경은 버려지므로 읽기 전용으로 여는 쪽에서 사용한다.
+        """
+        with self._lock:
+            if self._loaded and self._file_stamp() != self._stamp:
+                self._loaded = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._imports)
+
+    def __contains__(self, rel_path: str) -> bool:
+        self._ensure_loaded()
+        return self._key(rel_path) in self._imports
+
+    @staticmethod
+    def _key(rel_path: str) -> str:
+        return rel_path.replace(os.sep, "/")
+
+    def _watch(self, rel_path: str, imports: List[Candidates], add: bool = True):
+        for candidates in imports:
+            for candidate in candidates:
+                if add:
+                    self._watchers.setdefault(candidate, set()).add(rel_path)
+                else:
+                    watchers = self._watchers.get(candidate)
+                    if watchers is not None:
+                        watchers.discard(rel_path)
+                        if not watchers:
+                            del self._watchers[candidate]
+
+    def _resolve(self, rel_path: str):
+        """rel_path의 import 후보를 현재 파일 집합으로 해석하여 간선 갱신"""
+        resolved = set()
+        for candidates in self._imports.get(rel_path, ()):
+            for candidate in candidates:
+                if candidate in self._imports:
+                    if candidate != rel_path:
+                        resolved.add(candidate)
+                    break
+        old = self._deps.get(rel_path, set())
+        for target in old - resolved:
+            importers = self._rdeps.get(target)
+            if importers is not None:
+                importers.discard(rel_path)
+                if not importers:
+                    del self._rdeps[target]
+        for target in resolved - old:
+            self._rdeps.setdefault(target, set()).add(rel_path)
+        if resolved:
+            self._deps[rel_path] = resolved
+        else:
+            self._deps.pop(rel_path, None)
+
+    def update_file(self, rel_path: str, imports: List[Candidates]):
+        """
+        파일의 import 목록 교체
+
+        Args:
+            rel_path: 파일 상대 경로
+            imports: import별 후보 튜플 리스트
+        """
+        self._ensure_loaded()
+        rel_path = self._key(rel_path)
+        with self._lock:
+            is_new = rel_path not in self._imports
+            self._watch(rel_path, self._imports.get(rel_path, []), add=False)
+            self._imports[rel_path] = [tuple(c) for c in imports]
+            self._watch(rel_path, self._imports[rel_path])
+            self._resolve(rel_path)
+            if is_new:
+                # 이 파일을 후보로 갖던 파일들의 간선이 바뀔 수 있음
+                for importer in list(self._watchers.get(rel_path, ())):
+                    self._resolve(importer)
+
+    def remove_files(self, rel_paths: List[str]):
+        """파일들을 그래프에서 제거"""
+        self._ensure_loaded()
+        with self._lock:
+            for rel_path in map(self._key, rel_paths):
+                if rel_path not in self._imports:
+                    continue
+                self._watch(rel_path, self._imports.pop(rel_path), add=False)
+                for target in self._deps.pop(rel_path, ()):
+                    importers = self._rdeps.get(target)
+                    if importers is not None:
+                        importers.discard(rel_path)
+                affected = self._rdeps.pop(rel_path, set()) | self._watchers.get(rel_path, set())
+                for importer in affected:
+                    self._resolve(importer)
+
+    def clear(self):
+        """모든 파일 제거"""
+        with self._lock:
+            self._reset()
+            self._loaded = True
+            self._stamp = self._file_stamp()
+
+    def resolve(self, target: str) -> Optional[str]:
+        """
+        파일 경로 또는 점 구분 모듈 이름을 그래프의 파일로 변환
+
+        Args:
+            target: "src/utils/x.py" 또는 "src.utils.x"
+
+        Returns:
+            '/' 구분 상대 경로 (그래프에 없으면 None)
+        """
+        self._ensure_loaded()
+        key = self._key(target)
+        if key in self._imports:
+            return key
+        for candidates in python_import_candidates("", target):
+            for candidate in candidates:
+                if candidate in self._imports:
+                    return candidate
+        return None
+
+    def _walk(
+        self,
+        start: str,
+        reverse: bool,
+        transitive: bool,
+        max_depth: Optional[int]
+    ) -> List[str]:
+        rel_path = self.resolve(start)
+        if rel_path is None:
+            return []
+        with self._lock:
+            edges = self._rdeps if reverse else self._deps
+            if not transitive:
+                return sorted(edges.get(rel_path, ()))
+            seen = {rel_path}
+            queue = deque([(rel_path, 0)])
+            while queue:
+                node, depth = queue.popleft()
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for neighbor in edges.get(node, ()):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append((neighbor, depth + 1))
+            seen.discard(rel_path)
+            return sorted(seen)
+
+    def dependencies(
+        self,
+        target: str,
+        transitive: bool = False,
+        max_depth: Optional[int] = None
+    ) -> List[str]:
+        """
+        target이 import하는 프로젝트 파일
+
+        Args:
+            target: 파일 경로 또는 모듈 이름
+            transitive: True이면 간접 의존성까지 포함
+            max_depth: transitive일 때 최대 단계
+
+        Returns:
+            상대 경로 리스트 (정렬)
+        """
+        return self._walk(target, False, transitive, max_depth)
+
+    def dependents(
+        self,
+        target: str,
+        transitive: bool = False,
+        max_depth: Optional[int] = None
+    ) -> List[str]:
+        """
+        target을 import하는 프로젝트 파일 ("누가 이 모듈을 쓰는가")
+
+        Args:
+            target: 파일 경로 또는 모듈 이름
+            transitive: True이면 간접 사용자까지 포함
+            max_depth: transitive일 때 최대 단계
+
+        Returns:
+            상대 경로 리스트 (정렬)
+        """
+        return self._walk(target, True, transitive, max_depth)
+
+    def affected_tests(self, targets: List[str]) -> List[str]:
+        """
+        파일들의 변경에 영향을 받는 테스트 파일 (직접/간접 사용자 중 테스트)
+
+        Args:
+            targets: 변경된 파일 경로 또는 모듈 이름
+
+        Returns:
+            테스트 파일 상대 경로 리스트 (정렬)
+        """
+        tests = set()
+        for target in targets:
+            rel_path = self.resolve(target)
+            if rel_path is None:
+                continue
+            if is_test_file(rel_path):
+                tests.add(rel_path)
+            tests.update(p for p in self.dependents(rel_path, transitive=True) if is_test_file(p))
+        return sorted(tests)
@@ -0,0 +1,343 @@
+"""BM25 keyword index over code chunks."""
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from array import array
+from pathlib import Path
+import json
+import math
+import pickle
+import sqlite3
+import threading
+from collections import Counter
+import numpy as np
+
+from .tokenizer import tokenize_code
+
+
+INDEX_VERSION = 3
+
+
+class BM25Index:
+    """
+    식별자 인식 토큰화 기반 BM25 역색인
+
+    용어별 포스팅은 (슬롯 번호, 빈도) 타입 배열로 메모리에 압축 보관하고,
+    청크 본문/메타데이터는 SQLite 테이블에 두어 상위 결과만 조회한다.
+    삭제는 슬롯을 비우는 방식(tombstone)이며, 빈 슬롯이 많아지면 포스팅을 압축한다.
+    검색 시에는 용어별 포스팅을 NumPy 배열로 고정(캐시)하여 점수를 벡터화 계산한다.
+
+    디스크에는 문서 행마다 용어 빈도를 함께 기록하므로 save()는 그동안 바뀐 행의 커밋뿐이고
+    (저장 비용이 전체 색인 크기와 무관), 포스팅은 처음 로드할 때 행에서 한 번 다시 만든다.
+    """
+
+    # 삭제된 슬롯이 살아있는 슬롯보다 많아지면 저장 시 포스팅 압축
+    COMPACT_RATIO = 1.0
+
+    def __init__(self, index_path: Path, k1: float = 1.2, b: float = 0.75):
+        """
+        BM25 Index 초기화
+
+        Args:
+            index_path: 색인 경로 (데이터는 같은 위치의 .sqlite3 파일에 저장하며,
+                이 경로의 이전 형식 포스팅 pickle은 처음 로드할 때 변환 후 삭제)
+            k1: BM25 TF 포화 파라미터
+            b: BM25 문서 길이 정규화 파라미터
+        """
+        self.index_path = Path(index_path)
+        self.docs_path = self.index_path.with_suffix(".sqlite3")
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _reset(self):
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_ids: List[Optional[str]] = []
+        self._doc_lens = array('i')
+        self._slots: Dict[str, int] = {}
+        self._total_len = 0
+        self._frozen: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._live: Optional[np.ndarray] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.docs_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.docs_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._create_table()
+        return self._conn
+
+    def _create_table(self):
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            " slot INTEGER PRIMARY KEY,"
+            " doc_id TEXT NOT NULL,"
+            " length INTEGER NOT NULL,"
+            " terms TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " metadata TEXT NOT NULL"
+            ")"
+        )
+        self._conn.commit()
+
+    def _ensure_loaded(self):
+        """처음 사용할 때 디스크의 문서 행에서 포스팅을 다시 만듦"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._reset()
+            db = self._db
+            if db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+                self._upgrade()
+            for slot, doc_id, length, terms in db.execute(
+                "SELECT slot, doc_id, length, terms FROM docs ORDER BY slot"
+            ):
+                # 삭제된 슬롯은 행이 없으므로 빈 슬롯으로 채움
+                self._doc_ids.extend([None] * (slot - len(self._doc_ids)))
+                self._doc_lens.extend([0] * (slot - len(self._doc_lens)))
+                self._add_postings(slot, doc_id, length, json.loads(terms))
+            self._loaded = True
+
+    def _upgrade(self):
+        """
+        이전 형식(포스팅 pickle + 본문 테이블)을 문서별 용어 빈도 행으로 변환
+
+        문서 ID는 pickle에서, 용어 빈도는 본문을 다시 토큰화하여 얻는다.
+        pickle이 없거나 읽을 수 없으면 본문 테이블도 비운다.
+        """
+        db = self._db
+        columns = {row[1] for row in db.execute("PRAGMA table_info(docs)")}
+        if "terms" not in columns:
+            state = None
+            if self.index_path.exists():
+                try:
+                    with open(self.index_path, 'rb') as f:
+                        state = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    state = None
+            rows = db.execute("SELECT slot, content, metadata FROM docs").fetchall()
+            db.execute("DROP TABLE docs")
+            self._create_table()
+            if state and state.get("version") == 2:
+                doc_ids = state["doc_ids"]
+                for slot, content, metadata in rows:
+                    if slot < len(doc_ids) and doc_ids[slot] is not None:
+                        counts = Counter(tokenize_code(content))
+                        self._insert_row(slot, doc_ids[slot], counts, content, metadata)
+        db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        db.commit()
+        self.index_path.unlink(missing_ok=True)
+
+    def _insert_row(self, slot: int, doc_id: str, counts: Dict[str, int], content: str, metadata: str):
+        self._db.execute(
+            "INSERT OR REPLACE INTO docs (slot, doc_id, length, terms, content, metadata)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (slot, doc_id, sum(counts.values()), json.dumps(counts), content, metadata)
+        )
+
+    def _add_postings(self, slot: int, doc_id: str, length: int, counts: Dict[str, int]):
+        self._doc_ids.append(doc_id)
+        self._doc_lens.append(length)
+        self._slots[doc_id] = slot
+        self._total_len += length
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('i'), array('f'))
+            postings[0].append(slot)
+            postings[1].append(tf)
+            self._frozen.pop(term, None)
+
+    def save(self):
+        """변경 사항 커밋 (삭제가 많으면 메모리의 포스팅도 압축)"""
+        self._ensure_loaded()
+        with self._lock:
+            if len(self._doc_ids) - len(self._slots) > len(self._slots) * self.COMPACT_RATIO:
+                self._compact()
+            self._db.commit()
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._slots)
+
+    def add(self, doc_id: str, content: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        문서 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            doc_id: 청크 ID
+            content: 청크 본문
+            metadata: 결과에 함께 반환할 메타데이터
+        """
+        self._ensure_loaded()
+        with self._lock:
+            if doc_id in self._slots:
+                self._remove_slot(self._slots[doc_id])
+            counts = Counter(tokenize_code(content))
+            slot = len(self._doc_ids)
+            self._add_postings(slot, doc_id, sum(counts.values()), counts)
+            self._insert_row(slot, doc_id, counts, content, json.dumps(metadata or {}))
+            self._live = None
+
+    def remove(self, doc_ids: List[str]):
+        """ID로 문서 제거"""
+        self._ensure_loaded()
+        with self._lock:
+            for doc_id in doc_ids:
+                slot = self._slots.get(doc_id)
+                if slot is not None:
+                    self._remove_slot(slot)
+            self._live = None
+
+    def _remove_slot(self, slot: int):
+        self._slots.pop(self._doc_ids[slot], None)
+        self._total_len -= self._doc_lens[slot]
+        self._doc_ids[slot] = None
+        self._doc_lens[slot] = 0
+        self._db.execute("DELETE FROM docs WHERE slot = ?", (slot,))
+
+    def _compact(self):
+        """삭제된 슬롯의 포스팅 제거"""
+        live = self._live_mask()
+        compacted = {}
+        for term, (slots, tfs) in self._postings.items():
+            slots_np = np.frombuffer(slots, dtype=np.int32)
+            keep = live[slots_np]
+            if keep.any():
+                new_slots, new_tfs = array('i'), array('f')
+                new_slots.frombytes(slots_np[keep].tobytes())
+                new_tfs.frombytes(np.frombuffer(tfs, dtype=np.float32)[keep].tobytes())
+                compacted[term] = (new_slots, new_tfs)
+        self._postings = compacted
+        self._frozen = {}
+
+    def clear(self):
+        """모든 문서 제거"""
+        with self._lock:
+            self._reset()
+            self._db.execute("DELETE FROM docs")
+            self._db.commit()
+            self._loaded = True
+
+    def _live_mask(self) -> np.ndarray:
+        if self._live is None:
+            self._live = np.fromiter(
+                (doc_id is not None for doc_id in self._doc_ids),
+                dtype=bool, count=len(self._doc_ids)
+            )
+        return self._live
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """용어 포스팅을 (슬롯 배열, 빈도 배열) NumPy 복사본으로 고정"""
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return None
+            frozen = (
+                np.array(postings[0], dtype=np.int64),
+                np.array(postings[1], dtype=np.float32)
+            )
+            self._frozen[term] = frozen
+        return frozen
+
+    def search_slots(
+        self,
+        query: str,
+        k: int,
+        ids: Optional[Iterable[str]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        BM25 상위 k개 (슬롯 번호, 점수)
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            ids: 검색 대상 문서 ID (None이면 전체). 포스팅을 점수 계산 전에 거르며,
+                IDF와 평균 길이는 전체 색인 기준으로 유지한다
+
+        Returns:
+            점수 내림차순 (슬롯, 점수) 리스트
+        """
+        self._ensure_loaded()
+        with self._lock:
+            num_docs = len(self._slots)
+            if num_docs == 0 or k <= 0:
+                return []
+            live = self._live_mask()
+            allowed = live
+            if ids is not None:
+                allowed = np.zeros(len(live), dtype=bool)
+                allowed[[self._slots[i] for i in ids if i in self._slots]] = True
+            lens = np.array(self._doc_lens, dtype=np.float32)
+            avg_len = self._total_len / num_docs or 1.0
+
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+            for term, qtf in Counter(tokenize_code(query)).items():
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                slots, tf = arrays
+                keep = live[slots]
+                slots, tf = slots[keep], tf[keep]
+                if len(slots) == 0:
+                    continue
+                idf = math.log(1 + (num_docs - len(slots) + 0.5) / (len(slots) + 0.5))
+                if ids is not None:
+                    keep = allowed[slots]
+                    slots, tf = slots[keep], tf[keep]
+                norm = self.k1 * (1 - self.b + self.b * lens[slots] / avg_len)
+                scores[slots] += qtf * idf * tf * (self.k1 + 1) / (tf + norm)
+
+            matched = np.flatnonzero(scores)
+            if len(matched) == 0:
+                return []
+            k = min(k, len(matched))
+            top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(int(slot), float(scores[slot])) for slot in top]
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        ids: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 키워드 검색
+
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            ids: 검색 대상 문서 ID (None이면 전체)
+
+        Returns:
+            {"id", "content", "metadata", "score"} 리스트
+        """
+        with self._lock:
+            top = self.search_slots(query, k, ids=ids)
+            if not top:
+                return []
+            placeholders = ",".join("?" * len(top))
+            rows = {
+                slot: (content, json.loads(metadata))
+                for slot, content, metadata in self._db.execute(
+                    f"SELECT slot, content, metadata FROM docs WHERE slot IN ({placeholders})",
+                    [slot for slot, _ in top]
+                )
+            }
+            results = []
+            for slot, score in top:
+                if slot not in rows:
+                    continue
+                content, metadata = rows[slot]
+                results.append({
+                    "id": self._doc_ids[slot],
+                    "content": content,
+                    "metadata": metadata,
+                    "score": score
+                })
+            return results
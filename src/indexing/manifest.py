@@ -0,0 +1,222 @@
+"""Index manifest for incremental re-indexing."""
+from typing import List, Dict, Any, Optional, Tuple
+from pathlib import Path
+import hashlib
+import json
+import os
+
+
+MANIFEST_VERSION = 3
+# 읽을 수는 있지만 색인을 다시 만들어야 하는 이전 버전
+# (1: 청크 ID가 위치 기반, 2: 클래스 청크가 메서드 본문을 포함하던 청킹)
+# 기록된 임베딩 모델/차원이 현재와 달라도 같은 방식으로 전체 재인덱싱한다
+OUTDATED_VERSIONS = (1, 2)
+
+
+def hash_bytes(data: bytes) -> str:
+    """바이트 내용의 SHA-256 해시"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileRecord:
+    """매니페스트에 기록되는 파일 단위 정보"""
+    def __init__(
+        self,
+        size: int,
+        mtime_ns: int,
+        content_hash: str,
+        chunk_ids: Optional[List[str]] = None
+    ):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.content_hash = content_hash
+        self.chunk_ids = chunk_ids or []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "hash": self.content_hash,
+            "chunk_ids": self.chunk_ids
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileRecord":
+        return cls(
+            size=data["size"],
+            mtime_ns=data["mtime_ns"],
+            content_hash=data["hash"],
+            chunk_ids=list(data.get("chunk_ids", []))
+        )
+
+
+class ManifestDiff:
+    """매니페스트와 현재 파일 목록의 비교 결과"""
+    def __init__(self):
+        self.added: List[Path] = []
+        self.changed: List[Path] = []
+        self.deleted: List[str] = []
+        self.unchanged: List[Path] = []
+        # 변경/추가 파일의 현재 stat 및 해시 (재계산 방지)
+        self.fingerprints: Dict[str, Tuple[int, int, str]] = {}
+
+    @property
+    def to_index(self) -> List[Path]:
+        """다시 청킹/임베딩해야 하는 파일"""
+        return self.added + self.changed
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "deleted": len(self.deleted),
+            "unchanged": len(self.unchanged)
+        }
+
+
+class IndexManifest:
+    """
+    파일 경로 → (크기, mtime, 내용 해시, 청크 ID) 매니페스트
+
+    크기와 mtime이 그대로면 해시 계산 없이 변경되지 않은 것으로 간주하고,
+    다르면 내용 해시를 비교하여 실제 변경 여부를 판단한다.
+    """
+
+    def __init__(self, manifest_path: Path, embedding: Optional[Dict[str, Any]] = None):
+        """
+        Index Manifest 초기화
+
+        Args:
+            manifest_path: 매니페스트 JSON 파일 경로
+            embedding: 현재 임베딩 {"model": 모델 이름, "dim": 차원} - 색인을 만든
+                임베딩과 다르면 outdated (None이면 비교하지 않음)
+        """
+        self.manifest_path = Path(manifest_path)
+        self.embedding = embedding
+        self.files: Dict[str, FileRecord] = {}
+        # 이전 버전 매니페스트를 읽은 경우 True (기록된 청크 ID로 기존 문서를 지우고 재인덱싱)
+        self.outdated = False
+        self.load()
+
+    def load(self):
+        """디스크에서 매니페스트 로드 (없거나 손상된 경우 빈 상태)"""
+        self.files = {}
+        self.outdated = False
+        if not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") in OUTDATED_VERSIONS:
+            self.outdated = True
+        elif data.get("version") != MANIFEST_VERSION:
+            return
+        recorded = data.get("embedding")
+        if self.embedding is not None and recorded is not None and recorded != self.embedding:
+            # 다른 모델/차원의 벡터는 같은 색인에서 비교할 수 없으므로 전체 재인덱싱
+            self.outdated = True
+        for rel_path, record in data.get("files", {}).items():
+            self.files[rel_path] = FileRecord.from_dict(record)
+
+    def save(self):
+        """매니페스트를 원자적으로 저장"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "embedding": self.embedding,
+                "files": {
+                    rel_path: record.to_dict()
+                    for rel_path, record in self.files.items()
+                }
+            }, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def diff(
+        self,
+        files: List[Path],
+        project_path: Path,
+        scope: Optional[List[str]] = None
+    ) -> ManifestDiff:
+        """
+        현재 파일 목록과 매니페스트 비교
+
+        Args:
+            files: 발견된 파일 경로 리스트
+            project_path: 프로젝트 루트 경로
+            scope: 삭제 판정 대상 상대 경로 (None이면 매니페스트 전체,
+                일부 파일만 갱신할 때는 해당 파일들로 제한)
+
+        Returns:
+            추가/변경/삭제/유지 파일 분류 결과
+        """
+        result = ManifestDiff()
+        seen = set()
+
+        for file_path in files:
+            rel_path = str(file_path.relative_to(project_path))
+            seen.add(rel_path)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+
+            record = self.files.get(rel_path)
+            if record and record.size == stat.st_size and record.mtime_ns == stat.st_mtime_ns:
+                result.unchanged.append(file_path)
+                continue
+
+            try:
+                with open(file_path, 'rb') as f:
+                    content_hash = hash_bytes(f.read())
+            except OSError:
+                continue
+
+            if record and record.content_hash == content_hash:
+                # 내용은 같고 메타데이터만 바뀐 경우 (touch, checkout 등)
+                record.size = stat.st_size
+                record.mtime_ns = stat.st_mtime_ns
+                result.unchanged.append(file_path)
+                continue
+
+            result.fingerprints[rel_path] = (stat.st_size, stat.st_mtime_ns, content_hash)
+            if record:
+                result.changed.append(file_path)
+            else:
+                result.added.append(file_path)
+
+        candidates = self.files if scope is None else [p for p in scope if p in self.files]
+        result.deleted = [rel_path for rel_path in candidates if rel_path not in seen]
+        return result
+
+    def chunk_ids_for(self, rel_paths: List[str]) -> List[str]:
+        """주어진 파일들에 기록된 청크 ID 목록"""
+        ids = []
+        for rel_path in rel_paths:
+            record = self.files.get(rel_path)
+            if record:
+                ids.extend(record.chunk_ids)
+        return ids
+
+    def update(
+        self,
+        rel_path: str,
+        size: int,
+        mtime_ns: int,
+        content_hash: str,
+        chunk_ids: List[str]
+    ):
+        """파일 레코드 갱신"""
+        self.files[rel_path] = FileRecord(size, mtime_ns, content_hash, chunk_ids)
+
+    def remove(self, rel_path: str):
+        """파일 레코드 삭제"""
+        self.files.pop(rel_path, None)
+
+    def clear(self):
+        """모든 레코드 삭제"""
+        self.files = {}
+        self.outdated = False
@@ -0,0 +1,82 @@
+"""Bounded-queue pipeline stages for indexing."""
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+import queue
+import threading
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+class _StageError:
+    """스테이지 스레드에서 발생한 예외를 소비자 쪽으로 전달하기 위한 래퍼"""
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def threaded_stage(
+    source: Iterable[T],
+    func: Optional[Callable[[T], R]] = None,
+    maxsize: int = 2,
+    name: str = "index-stage"
+) -> Iterator[R]:
+    """
+    source의 각 항목에 func를 적용하는 백그라운드 스테이지
+
+    결과는 크기가 maxsize로 제한된 큐를 통해 전달되므로, 소비자가 느리면
+    스테이지가 대기하여 스테이지 사이에 쌓이는 데이터(메모리)가 일정하게 유지된다.
+    반환된 제너레이터를 닫으면 스테이지 스레드가 멈추고 source도 닫히므로, 소비 도중
+    예외가 나면 호출자가 close()를 호출해야 한다 (예외의 traceback이 제너레이터를 붙잡음).
+
+    Args:
+        source: 입력 이터러블 (스테이지 스레드에서 소비됨)
+        func: 각 항목에 적용할 함수 (None이면 항목을 그대로 전달)
+        maxsize: 스테이지 출력 큐 크기
+        name: 스레드 이름
+
+    Yields:
+        func 적용 결과 (입력 순서 유지)
+    """
+    output: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # 소비자가 중단하면 대기 중인 put도 빠져나올 수 있도록 타임아웃 반복
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run():
+        try:
+            for item in source:
+                if not put(func(item) if func else item):
+                    return
+        except BaseException as e:
+            put(_StageError(e))
+            return
+        finally:
+            # 중단되어도 상위 스테이지(와 그 스레드/프로세스 풀)를 이 스레드에서 정리
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+        put(_DONE)
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = output.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
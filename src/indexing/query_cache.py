@@ -0,0 +1,364 @@
+"""In-memory caches for search results and query embeddings."""
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+import re
+import threading
+import time
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """공백만 정규화 (대소문자는 식별자 의미가 있으므로 유지)"""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def filters_key(filters: Optional[Dict[str, Any]]) -> Tuple:
+    """필터 딕셔너리를 해시 가능한 정렬된 튜플로 변환"""
+    if not filters:
+        return ()
+    return tuple(sorted(
+        (name, tuple(value) if isinstance(value, (list, set, tuple)) else value)
+        for name, value in filters.items()
+    ))
+
+
+class LRUCache:
+    """
+    항목 수 제한 LRU 캐시
+
+    값과 함께 값을 계산하는 데 걸린 시간을 저장하여, 적중 시 절약된 시간을 집계한다.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        LRU Cache 초기화
+
+        Args:
+            max_entries: 최대 항목 수 (0이면 캐시하지 않음)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        캐시된 값 반환, 없으면 계산하여 저장
+
+        동시에 같은 키가 미스되면 양쪽 모두 계산한다 (락을 잡은 채 계산하지 않음).
+
+        Args:
+            key: 캐시 키
+            compute: 값을 계산하는 함수
+
+        Returns:
+            캐시된 값 또는 새로 계산한 값
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry[1]
+                return entry[0]
+            self.misses += 1
+
+        start = time.perf_counter()
+        value = compute()
+        self._store({key: value}, time.perf_counter() - start)
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시된 값 (없으면 None, 미스로 집계하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[1]
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, elapsed: float = 0.0):
+        """값 저장 (elapsed는 값을 계산하는 데 걸린 초)"""
+        self._store({key: value}, elapsed)
+
+    def get_or_compute_many(
+        self,
+        keys: List[Hashable],
+        compute_many: Callable[[List[Hashable]], List[Any]]
+    ) -> List[Any]:
+        """
+        여러 키를 조회하고, 미스된 키(중복 제거)만 모아 compute_many를 한 번 호출
+
+        Args:
+            keys: 캐시 키 리스트
+            compute_many: 미스 키 리스트 → 같은 순서의 값 리스트
+
+        Returns:
+            keys 순서의 값 리스트
+        """
+        found: Dict[Hashable, Any] = {}
+        missing: Dict[Hashable, None] = {}
+        with self._lock:
+            for key in keys:
+                if key in found or key in missing:
+                    continue
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.saved_seconds += entry[1]
+                    found[key] = entry[0]
+                else:
+                    self.misses += 1
+                    missing[key] = None
+
+        if missing:
+            start = time.perf_counter()
+            computed = dict(zip(missing, compute_many(list(missing))))
+            # 배치 계산 시간은 미스 키에 균등 분배
+            self._store(computed, (time.perf_counter() - start) / len(missing))
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def _store(self, values: Dict[Hashable, Any], elapsed: float):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (value, elapsed)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률, 항목 수, 절약 시간 통계"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "saved_ms": round(self.saved_seconds * 1000, 3)
+        }
+
+
+class QueryCache:
+    """
+    검색 결과 캐시와 쿼리 임베딩 캐시
+
+    결과는 (색인 generation, 검색 종류, 정규화된 쿼리, k, 필터, 옵션)으로 캐시하므로 색인이
+    바뀌어 generation이 증가하면 이전 결과는 더 이상 적중하지 않는다. 새 generation을
+    처음 보는 순간 이전 결과를 모두 비워 메모리를 돌려준다.
+    쿼리 임베딩은 색인과 무관하므로 (모델, 정규화된 쿼리)로 generation을 넘어 유지한다.
+    필터가 허용하는 문서 집합도 검색 결과와 같은 방식으로 generation 단위로 캐시하여,
+    같은 범위의 다른 쿼리는 필터를 다시 계산하지 않는다.
+    """
+
+    def __init__(self, max_results: int = 256, max_embeddings: int = 1024, max_filters: int = 64):
+        """
+        Query Cache 초기화
+
+        Args:
+            max_results: 캐시할 검색 결과 수
+            max_embeddings: 캐시할 쿼리 임베딩 수
+            max_filters: 캐시할 필터 후보 집합 수
+        """
+        self.results = LRUCache(max_results)
+        self.embeddings = LRUCache(max_embeddings)
+        self.filters = LRUCache(max_filters)
+        self._generation: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _observe(self, generation: int):
+        """새 generation을 처음 보면 이전 generation의 결과/필터 항목 비움"""
+        with self._lock:
+            if self._generation != generation:
+                if self._generation is None or generation > self._generation:
+                    self.results.clear()
+                    self.filters.clear()
+                self._generation = max(generation, self._generation or 0)
+
+    @staticmethod
+    def _result_key(
+        generation: int,
+        kind: str,
+        query: str,
+        k: int,
+        filters: Optional[Dict[str, Any]],
+        options: Hashable
+    ) -> Tuple:
+        return (generation, kind, normalize_query(query), k, filters_key(filters), options)
+
+    def search(
+        self,
+        generation: int,
+        kind: str,
+        query: str,
+        k: int,
+        compute: Callable[[], Any],
+        filters: Optional[Dict[str, Any]] = None,
+        options: Hashable = ()
+    ) -> Any:
+        """
+        검색 결과 조회 (미스면 compute() 결과를 저장)
+
+        Args:
+            generation: 검색 시작 시점의 색인 generation
+            kind: 검색 종류 ("semantic" 등)
+            query: 검색 쿼리
+            k: 결과 수
+            compute: 실제 검색 함수
+            filters: 메타데이터 필터
+            options: 결과에 영향을 주는 그 밖의 검색 옵션 (최소 점수, MMR 등)
+
+        Returns:
+            검색 결과
+        """
+        self._observe(generation)
+        key = self._result_key(generation, kind, query, k, filters, options)
+        return self.results.get_or_compute(key, compute)
+
+    def cached_search(
+        self,
+        generation: int,
+        kind: str,
+        query: str,
+        k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        options: Hashable = ()
+    ) -> Optional[Any]:
+        """search()가 캐시한 결과 (없으면 None) - 스트리밍 검색이 캐시를 먼저 확인할 때 사용"""
+        self._observe(generation)
+        return self.results.get(self._result_key(generation, kind, query, k, filters, options))
+
+    def store_search(
+        self,
+        generation: int,
+        kind: str,
+        query: str,
+        k: int,
+        value: Any,
+        elapsed: float,
+        filters: Optional[Dict[str, Any]] = None,
+        options: Hashable = ()
+    ):
+        """스트리밍으로 끝까지 계산한 결과를 search()와 같은 키로 저장"""
+        self._observe(generation)
+        key = self._result_key(generation, kind, query, k, filters, options)
+        self.results.put(key, value, elapsed)
+
+    def search_many(
+        self,
+        generation: int,
+        kind: str,
+        queries: List[str],
+        k: int,
+        compute_many: Callable[[List[str]], List[Any]],
+        filters: Optional[Dict[str, Any]] = None,
+        options: Hashable = ()
+    ) -> List[Any]:
+        """
+        여러 쿼리의 검색 결과 조회 (미스된 쿼리만 모아 compute_many를 한 번 호출)
+
+        Args:
+            generation: 검색 시작 시점의 색인 generation
+            kind: 검색 종류
+            queries: 검색 쿼리 리스트
+            k: 결과 수
+            compute_many: 정규화된 미스 쿼리 리스트 → 같은 순서의 결과 리스트
+            filters: 메타데이터 필터
+            options: 결과에 영향을 주는 그 밖의 검색 옵션
+
+        Returns:
+            queries 순서의 검색 결과 리스트
+        """
+        self._observe(generation)
+        keys = [self._result_key(generation, kind, query, k, filters, options) for query in queries]
+        return self.results.get_or_compute_many(
+            keys, lambda missing: compute_many([key[2] for key in missing])
+        )
+
+    def filter(self, generation: int, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        필터 후보 집합 조회 (미스면 compute() 결과를 저장)
+
+        Args:
+            generation: 색인 generation
+            key: 필터 키 (SearchFilters.key() 등)
+            compute: 후보 집합 계산 함수
+
+        Returns:
+            후보 집합
+        """
+        self._observe(generation)
+        return self.filters.get_or_compute((generation, key), compute)
+
+    def embed_query(self, model: str, query: str, compute: Callable[[str], Any]) -> Any:
+        """
+        쿼리 임베딩 조회 (미스면 정규화된 쿼리로 compute 호출)
+
+        Args:
+            model: 임베딩 모델 이름
+            query: 검색 쿼리
+            compute: 쿼리 임베딩 함수
+
+        Returns:
+            쿼리 임베딩
+        """
+        normalized = normalize_query(query)
+        return self.embeddings.get_or_compute(
+            (model, normalized), lambda: compute(normalized)
+        )
+
+    def embed_queries(
+        self,
+        model: str,
+        queries: List[str],
+        compute_many: Callable[[List[str]], List[Any]]
+    ) -> List[Any]:
+        """
+        여러 쿼리 임베딩 조회 (미스된 쿼리만 모아 compute_many를 한 번 호출)
+
+        Args:
+            model: 임베딩 모델 이름
+            queries: 검색 쿼리 리스트
+            compute_many: 정규화된 쿼리 리스트 → 임베딩 리스트
+
+        Returns:
+            queries 순서의 쿼리 임베딩 리스트
+        """
+        keys = [(model, normalize_query(query)) for query in queries]
+        return self.embeddings.get_or_compute_many(
+            keys, lambda missing: compute_many([key[1] for key in missing])
+        )
+
+    def clear(self):
+        self.results.clear()
+        self.embeddings.clear()
+        self.filters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """결과/임베딩 캐시 통계"""
+        return {
+            "generation": self._generation,
+            "results": self.results.stats(),
+            "embeddings": self.embeddings.stats(),
+            "filters": self.filters.stats()
+        }
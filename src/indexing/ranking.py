@@ -0,0 +1,75 @@
+"""Result ranking and fusion helpers."""
+from typing import List, Dict, Hashable, Optional
+import numpy as np
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Hashable]],
+    k: int = 60
+) -> List[tuple]:
+    """
+    여러 순위 목록을 RRF(Reciprocal Rank Fusion)로 결합
+
+    Args:
+        rankings: 결과 키의 순위 목록들 (앞쪽이 상위)
+        k: 하위 순위의 영향을 줄이는 상수 (일반적으로 60)
+
+    Returns:
+        (키, 결합 점수) 리스트 - 점수 내림차순
+    """
+    scores: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def maximal_marginal_relevance(
+    query_vector: np.ndarray,
+    candidate_vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+    relevance: Optional[np.ndarray] = None
+) -> List[int]:
+    """
+    MMR(Maximal Marginal Relevance)로 관련성과 다양성을 함께 고려해 후보 선택
+
+    매 단계에서 lambda * 관련성 - (1 - lambda) * (이미 고른 후보와의 최대 유사도)가 가장 큰
+    후보를 고른다. 후보 간 유사도 행렬을 한 번 계산하고, 최대 유사도 벡터만 갱신하므로
+    단계마다 O(후보 수)의 벡터 연산이다.
+
+    Args:
+        query_vector: 쿼리 임베딩
+        candidate_vectors: (후보 수, dim) 후보 임베딩
+        k: 선택할 수
+        lambda_mult: 1이면 관련성만, 0이면 다양성만
+        relevance: 후보별 관련성 점수 (None이면 쿼리와의 코사인 유사도)
+
+    Returns:
+        선택된 후보 인덱스 (선택 순서)
+    """
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    k = min(k, len(candidates))
+    if k <= 0:
+        return []
+    norms = np.linalg.norm(candidates, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    candidates = candidates / norms
+    if relevance is None:
+        query = np.asarray(query_vector, dtype=np.float32)
+        relevance = candidates @ (query / (np.linalg.norm(query) or 1.0))
+    relevance = np.asarray(relevance, dtype=np.float32)
+    similarity = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    max_similarity = similarity[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < k:
+        marginal = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        marginal[~available] = -np.inf
+        best = int(np.argmax(marginal))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
@@ -0,0 +1,103 @@
+"""Metadata filters for scoped search (path, language, chunk type, modification time)."""
+from typing import Any, Dict, Optional, Tuple, Union
+from datetime import datetime
+import fnmatch
+
+
+GLOB_CHARS = "*?["
+
+
+def _as_tuple(value: Union[None, str, Any]) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,) if value else ()
+    return tuple(sorted(str(v) for v in value))
+
+
+def parse_timestamp(value: Union[None, int, float, str, datetime]) -> Optional[float]:
+    """수정 시각 필터 값을 epoch 초로 변환 (숫자, ISO 8601 문자열, datetime)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+class SearchFilters:
+    """
+    검색 범위를 좁히는 메타데이터 필터
+
+    모든 조건은 AND로 결합하고, 여러 값을 받는 조건(language, chunk_type)은 값끼리 OR이다.
+    path는 글롭 문자(*?[)가 있으면 파일 상대 경로 전체에 대한 글롭, 없으면 디렉토리 또는
+    파일 경로 접두사 ("services/billing"은 services/billing/... 만, billing_old는 제외).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        language: Union[None, str, Any] = None,
+        chunk_type: Union[None, str, Any] = None,
+        modified_since: Union[None, int, float, str, datetime] = None
+    ):
+        """
+        Search Filters 초기화
+
+        Args:
+            path: 경로 접두사 또는 글롭 (프로젝트 루트 기준 상대 경로)
+            language: 언어 또는 언어 목록 ("python", "typescript", "javascript")
+            chunk_type: 청크 종류 또는 목록 (FunctionDef, ClassDef, Module, class_declaration 등)
+            modified_since: 이 시각 이후 수정된 파일만 (epoch 초 또는 ISO 8601 문자열)
+        """
+        path = (path or "").strip()
+        if path.startswith("./"):
+            path = path[2:]
+        self.path = "" if path in (".", "/") else path.rstrip("/")
+        self.languages = _as_tuple(language)
+        self.chunk_types = _as_tuple(chunk_type)
+        self.modified_since = parse_timestamp(modified_since)
+
+    @classmethod
+    def from_dict(cls, filters: Optional[Dict[str, Any]]) -> "SearchFilters":
+        """{"path", "language", "chunk_type", "modified_since"} 딕셔너리에서 생성"""
+        filters = filters or {}
+        unknown = set(filters) - {"path", "language", "chunk_type", "modified_since"}
+        if unknown:
+            raise ValueError(f"Unknown search filters: {', '.join(sorted(unknown))}")
+        return cls(**filters)
+
+    @property
+    def is_glob(self) -> bool:
+        return any(c in self.path for c in GLOB_CHARS)
+
+    def __bool__(self) -> bool:
+        return bool(self.path or self.languages or self.chunk_types) or self.modified_since is not None
+
+    def key(self) -> Tuple:
+        """캐시 키 (같은 조건이면 같은 값)"""
+        return (self.path, self.languages, self.chunk_types, self.modified_since)
+
+    def matches_path(self, file_path: str) -> bool:
+        if not self.path:
+            return True
+        if self.is_glob:
+            return fnmatch.fnmatchcase(file_path, self.path)
+        return file_path == self.path or file_path.startswith(self.path + "/")
+
+    def matches(self, location: Dict[str, Any]) -> bool:
+        """
+        위치 메타데이터가 경로/언어/청크 종류 조건을 만족하는지 여부 (수정 시각 제외)
+
+        Args:
+            location: file_path, language, chunk_type 키를 가진 메타데이터
+        """
+        return (
+            self.matches_path(location.get("file_path", ""))
+            and (not self.languages or location.get("language") in self.languages)
+            and (not self.chunk_types or location.get("chunk_type") in self.chunk_types)
+        )
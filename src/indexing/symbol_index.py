@@ -0,0 +1,200 @@
+"""Persistent symbol table for definition lookup."""
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from pathlib import Path
+import sqlite3
+import threading
+
+
+# 인덱스 저장 디렉토리 안의 심볼 색인 파일 이름
+SYMBOL_INDEX_FILE = "symbols.sqlite3"
+
+# 청크 종류 → 심볼 종류
+SYMBOL_KINDS = {
+    "FunctionDef": "function",
+    "AsyncFunctionDef": "function",
+    "ClassDef": "class",
+    "function_declaration": "function",
+    "generator_function_declaration": "function",
+    "arrow_function": "function",
+    "function_expression": "function",
+    "method_definition": "method",
+    "class_declaration": "class",
+    "abstract_class_declaration": "class",
+    "interface_declaration": "interface",
+    "enum_declaration": "enum",
+}
+
+# (이름, 정규화된 이름, 종류, 파일, 시작 줄, 끝 줄, 소속 클래스)
+SymbolRow = Tuple[str, str, str, str, int, int, str]
+
+COLUMNS = ("name", "qualname", "kind", "file_path", "start_line", "end_line", "parent")
+
+
+def symbol_from_metadata(metadata: Dict[str, Any]) -> Optional[SymbolRow]:
+    """
+    청크 문서 메타데이터를 심볼 행으로 변환
+
+    Args:
+        metadata: chunk_type, symbol, parent, file_path, lines 키를 가진 메타데이터
+
+    Returns:
+        심볼 행 (심볼이 아닌 청크는 None)
+    """
+    name = metadata.get("symbol")
+    kind = SYMBOL_KINDS.get(metadata.get("chunk_type"))
+    # 나뉜 정의는 첫 부분만 정의 위치로 기록
+    if not name or kind is None or metadata.get("part", 0) > 1:
+        return None
+    parent = metadata.get("parent") or ""
+    if kind == "function" and parent:
+        kind = "method"
+    start, _, end = str(metadata.get("lines", "0-0")).partition("-")
+    return (
+        name,
+        f"{parent}.{name}" if parent else name,
+        kind,
+        metadata["file_path"],
+        int(start),
+        int(end or start),
+        parent.rsplit(".", 1)[-1]
+    )
+
+
+def _qualified_match(qualname: str, name: str) -> bool:
+    """qualname이 name과 같거나 name으로 끝나는 정규화된 이름인지 여부"""
+    return qualname == name or qualname.endswith("." + name)
+
+
+class SymbolIndex:
+    """
+    심볼 이름 → (종류, 파일, 줄 범위, 소속 클래스) 색인
+
+    SQLite 테이블 하나에 저장하고 이름/소속 클래스/파일 컬럼에 인덱스를 두어,
+    전체를 메모리에 올리지 않고도 정의 조회가 인덱스 탐색 한 번으로 끝난다.
+    파일 단위로 행을 지우고 다시 넣어 증분 갱신한다.
+    """
+
+    def __init__(self, index_path: Path):
+        """
+        Symbol Index 초기화
+
+        Args:
+            index_path: SQLite 파일 경로
+        """
+        self.index_path = Path(index_path)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS symbols ("
+                " name TEXT NOT NULL,"
+                " qualname TEXT NOT NULL,"
+                " kind TEXT NOT NULL,"
+                " file_path TEXT NOT NULL,"
+                " start_line INTEGER NOT NULL,"
+                " end_line INTEGER NOT NULL,"
+                " parent TEXT NOT NULL"
+                ")"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS symbols_parent ON symbols (parent)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS symbols_file ON symbols (file_path)")
+            self._conn.commit()
+        return self._conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+
+    def add(self, rows: Iterable[SymbolRow]):
+        """심볼 행 추가 (save() 전까지 커밋되지 않음)"""
+        with self._lock:
+            self._db.executemany(
+                f"INSERT INTO symbols ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def remove_files(self, rel_paths: List[str]):
+        """파일들의 심볼 제거"""
+        with self._lock:
+            self._db.executemany(
+                "DELETE FROM symbols WHERE file_path = ?", [(p,) for p in rel_paths]
+            )
+
+    def clear(self):
+        """모든 심볼 제거"""
+        with self._lock:
+            self._db.execute("DELETE FROM symbols")
+            self._db.commit()
+
+    def save(self):
+        """변경 사항 커밋"""
+        with self._lock:
+            self._db.commit()
+
+    def _query(self, where: str, params: Tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM symbols WHERE {where}"
+                " ORDER BY file_path, start_line",
+                params
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def find_definition(self, name: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        심볼 정의 위치 조회
+
+        Args:
+            name: 심볼 이름 ("func", "Class", "Class.method", "Outer.Inner.method")
+            kind: 종류 필터 ("function", "method", "class", "interface", "enum")
+
+        Returns:
+            {"name", "qualname", "kind", "file_path", "start_line", "end_line", "parent"} 리스트
+        """
+        parent, _, short = name.rpartition(".")
+        where, params = "name = ?", (short,)
+        if parent:
+            where += " AND parent = ?"
+            params += (parent.rsplit(".", 1)[-1],)
+        if kind:
+            where += " AND kind = ?"
+            params += (kind,)
+        return [
+            row for row in self._query(where, params)
+            if not parent or _qualified_match(row["qualname"], name)
+        ]
+
+    def list_methods(self, class_name: str) -> List[Dict[str, Any]]:
+        """
+        클래스의 메서드 목록
+
+        Args:
+            class_name: 클래스 이름 ("Class" 또는 "Outer.Inner")
+
+        Returns:
+            메서드 심볼 리스트 (파일, 줄 순서)
+        """
+        rows = self._query(
+            "parent = ? AND kind = 'method'", (class_name.rsplit(".", 1)[-1],)
+        )
+        return [
+            row for row in rows
+            if _qualified_match(row["qualname"].rpartition(".")[0], class_name)
+        ]
+
+    def symbols_in_file(self, rel_path: str) -> List[Dict[str, Any]]:
+        """파일에 정의된 심볼 목록"""
+        return self._query("file_path = ?", (rel_path,))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
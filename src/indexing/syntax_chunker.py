@@ -0,0 +1,431 @@
+"""Tree-sitter based chunking for JavaScript/TypeScript sources."""
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+try:
+    from tree_sitter import Language, Parser, Query
+    try:
+        from tree_sitter import QueryCursor
+    except ImportError:  # tree-sitter < 0.25
+        QueryCursor = None
+except ImportError:  # 선택 의존성: 없으면 JS/TS 파일은 청크를 만들지 않음
+    Language = Parser = Query = QueryCursor = None
+
+
+# 확장자 → (tree-sitter 문법 이름, 메타데이터 language 값)
+LANGUAGES = {
+    ".js": ("javascript", "javascript"),
+    ".jsx": ("javascript", "javascript"),
+    ".mjs": ("javascript", "javascript"),
+    ".cjs": ("javascript", "javascript"),
+    ".ts": ("typescript", "typescript"),
+    ".tsx": ("tsx", "typescript"),
+}
+
+# 청크로 만들 노드 패턴 (문법 버전에 없는 노드 타입의 패턴은 건너뜀)
+CHUNK_PATTERNS = (
+    "(function_declaration) @chunk",
+    "(generator_function_declaration) @chunk",
+    "(class_declaration) @chunk",
+    "(abstract_class_declaration) @chunk",
+    "(method_definition) @chunk",
+    "(interface_declaration) @chunk",
+    "(enum_declaration) @chunk",
+    "(lexical_declaration (variable_declarator value: (arrow_function))) @chunk",
+    "(lexical_declaration (variable_declarator value: (function_expression))) @chunk",
+    "(variable_declaration (variable_declarator value: (arrow_function))) @chunk",
+    "(variable_declaration (variable_declarator value: (function_expression))) @chunk",
+)
+
+# import/export ... from, require(), 동적 import()의 모듈 경로
+IMPORT_PATTERNS = (
+    "(import_statement source: (string (string_fragment) @source))",
+    "(export_statement source: (string (string_fragment) @source))",
+    '((call_expression function: (identifier) @fn arguments: (arguments . (string (string_fragment) @source))) (#eq? @fn "require"))',
+    "(call_expression function: (import) arguments: (arguments . (string (string_fragment) @source)))",
+)
+
+FUNCTION_VALUES = ("arrow_function", "function_expression")
+
+CLASS_NODES = ("class_declaration", "abstract_class_declaration", "class")
+
+# 포함하는 청크에서 "{ ... }"로 접는 본문 노드 (표현식 본문의 화살표 함수는 그대로 둠)
+BLOCK_NODES = ("statement_block", "class_body", "interface_body", "object_type", "enum_body")
+
+# 청크 노드가 아닌 최상위 코드가 있으면 만드는 모듈 청크의 종류
+MODULE_CHUNK = "program"
+
+# (청크 종류, 시작 줄, 끝 줄, 내용, 심볼 이름, 소속 클래스) - 줄 번호는 1부터
+RawChunk = Tuple[str, int, int, str, str, str]
+
+_languages: Dict[str, object] = {}
+_queries: Dict[str, object] = {}
+_import_queries: Dict[str, object] = {}
+_local = threading.local()
+
+
+def _load_language(name: str):
+    """문법 패키지에서 Language 로드 (없으면 None)"""
+    if Language is None:
+        return None
+    if name not in _languages:
+        try:
+            if name == "javascript":
+                import tree_sitter_javascript as grammar
+                language = Language(grammar.language())
+            else:
+                import tree_sitter_typescript as grammar
+                language = Language(
+                    grammar.language_tsx() if name == "tsx" else grammar.language_typescript()
+                )
+        except (ImportError, ValueError, TypeError):
+            language = None
+        _languages[name] = language
+    return _languages[name]
+
+
+def _compile(name: str, patterns, cache: Dict[str, object]):
+    """문법에서 컴파일되는 패턴만 모아 하나의 쿼리로 컴파일 (캐시)"""
+    if name not in cache:
+        language = _load_language(name)
+        valid = []
+        for pattern in patterns:
+            try:
+                Query(language, pattern)
+            except Exception:
+                continue
+            valid.append(pattern)
+        cache[name] = Query(language, "\n".join(valid)) if valid else None
+    return cache[name]
+
+
+def _chunk_query(name: str):
+    return _compile(name, CHUNK_PATTERNS, _queries)
+
+
+def _import_query(name: str):
+    return _compile(name, IMPORT_PATTERNS, _import_queries)
+
+
+def get_parser(name: str):
+    """
+    스레드별 Parser (Parser는 스레드 간에 공유하면 안 됨)
+
+    Args:
+        name: 문법 이름 ("javascript", "typescript", "tsx")
+
+    Returns:
+        Parser 또는 None (tree-sitter/문법 미설치)
+    """
+    parsers = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    if name not in parsers:
+        language = _load_language(name)
+        parsers[name] = Parser(language) if language is not None else None
+    return parsers[name]
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """공통 접두사 길이 (memcmp 기반 이분 탐색)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    """limit 이하의 공통 접미사 길이"""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _point(source: bytes, byte: int) -> Tuple[int, int]:
+    """바이트 위치의 (행, 바이트 열)"""
+    row = source.count(b"\n", 0, byte)
+    return row, byte - (source.rfind(b"\n", 0, byte) + 1)
+
+
+class ParseCache:
+    """
+    파일별 (소스, 파스 트리) LRU 캐시
+
+    같은 파일을 다시 청킹할 때 이전 트리에 편집 범위를 알려주면(tree.edit)
+    tree-sitter가 바뀐 부분만 다시 파싱한다. 캐시 크기는 소스 바이트 합으로 제한한다.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Parse Cache 초기화
+
+        Args:
+            max_bytes: 캐시에 보관할 소스 바이트 합의 상한
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes, object]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.full_parses = 0
+        self.incremental_parses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse(self, key: str, grammar: str, source: bytes):
+        """
+        소스를 파싱하여 트리 반환 (이전 트리가 있으면 증분 파싱)
+
+        Args:
+            key: 파일 식별자 (상대 경로)
+            grammar: 문법 이름
+            source: 파일 내용
+
+        Returns:
+            tree-sitter Tree 또는 None
+        """
+        parser = get_parser(grammar)
+        if parser is None:
+            return None
+
+        with self._lock:
+            cached = self._entries.pop(key, None)
+            if cached is not None:
+                self._bytes -= len(cached[1])
+
+        if cached is not None and cached[0] == grammar:
+            _, old_source, old_tree = cached
+            if old_source == source:
+                tree = old_tree
+            else:
+                prefix = _common_prefix(old_source, source)
+                suffix = _common_suffix(
+                    old_source, source, min(len(old_source), len(source)) - prefix
+                )
+                old_end = len(old_source) - suffix
+                new_end = len(source) - suffix
+                old_tree.edit(
+                    start_byte=prefix,
+                    old_end_byte=old_end,
+                    new_end_byte=new_end,
+                    start_point=_point(source, prefix),
+                    old_end_point=_point(old_source, old_end),
+                    new_end_point=_point(source, new_end)
+                )
+                tree = parser.parse(source, old_tree)
+                self.incremental_parses += 1
+        else:
+            tree = parser.parse(source)
+            self.full_parses += 1
+
+        with self._lock:
+            self._entries[key] = (grammar, source, tree)
+            self._bytes += len(source)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return tree
+
+    def discard(self, key: str):
+        """파일의 캐시 항목 제거 (삭제된 파일)"""
+        with self._lock:
+            cached = self._entries.pop(key, None)
+            if cached is not None:
+                self._bytes -= len(cached[1])
+
+
+def _captured_nodes(query, node, capture: str = "chunk") -> List[object]:
+    if QueryCursor is not None:
+        captures = QueryCursor(query).captures(node)
+    else:
+        captures = query.captures(node)
+    if isinstance(captures, dict):
+        return captures.get(capture, [])
+    return [captured for captured, name in captures if name == capture]
+
+
+def extract_syntax_chunks(
+    source: bytes,
+    suffix: str,
+    key: str = "",
+    parse_cache: Optional[ParseCache] = None
+) -> List[RawChunk]:
+    """
+    JS/TS 소스에서 함수/클래스/메서드 청크 추출
+
+    Args:
+        source: 파일 내용 (바이트)
+        suffix: 파일 확장자 (문법 선택)
+        key: 파스 캐시 키 (보통 상대 경로)
+        parse_cache: 증분 파싱용 캐시 (None이면 매번 전체 파싱)
+
+    Returns:
+        (청크 종류, 시작 줄, 끝 줄, 내용, 심볼 이름, 소속 클래스) 리스트 (소스 순서)
+    """
+    return extract_syntax_file(source, suffix, key, parse_cache)[0]
+
+
+def extract_syntax_file(
+    source: bytes,
+    suffix: str,
+    key: str = "",
+    parse_cache: Optional[ParseCache] = None
+) -> Tuple[List[RawChunk], List[str]]:
+    """
+    JS/TS 소스를 한 번 파싱하여 청크와 import 모듈 경로를 함께 추출
+
+    패턴 매칭은 tree-sitter 쿼리(C 구현)로 수행하므로 노드를 파이썬에서 순회하지 않는다.
+    청크는 계층적으로 겹치지 않게 만든다: 클래스/함수 청크 안에 포함된 청크의 본문은
+    "{ ... }"로 접고, 최상위에 청크가 아닌 코드(import, 상수 등)가 있으면 모든 최상위
+    청크를 접은 파일 전체를 모듈 청크로 추가한다.
+
+    Args:
+        source: 파일 내용 (바이트)
+        suffix: 파일 확장자 (문법 선택)
+        key: 파스 캐시 키 (보통 상대 경로)
+        parse_cache: 증분 파싱용 캐시 (None이면 매번 전체 파싱)
+
+    Returns:
+        (청크 리스트, import/require 모듈 경로 리스트)
+    """
+    language = LANGUAGES.get(suffix)
+    if language is None:
+        return [], []
+    grammar = language[0]
+    if parse_cache is not None:
+        tree = parse_cache.parse(key, grammar, source)
+    else:
+        parser = get_parser(grammar)
+        tree = parser.parse(source) if parser is not None else None
+    query = _chunk_query(grammar) if tree is not None else None
+    if query is None:
+        return [], []
+
+    import_query = _import_query(grammar)
+    imports = [
+        _node_text(source, node)
+        for node in sorted(
+            _captured_nodes(import_query, tree.root_node, "source"), key=lambda n: n.start_byte
+        )
+    ] if import_query is not None else []
+
+    nodes = sorted(_captured_nodes(query, tree.root_node), key=lambda n: n.start_byte)
+    keys = {_node_key(node) for node in nodes}
+    # 포함하는 청크 노드의 키 (최상위는 None) → 직접 포함된 청크 노드
+    children: Dict[Optional[Tuple[int, int, str]], List[object]] = {}
+    for node in nodes:
+        children.setdefault(_enclosing_chunk(node, keys), []).append(node)
+
+    chunks = []
+    for node in nodes:
+        chunk_type = node.type
+        name_node = node.child_by_field_name("name")
+        if chunk_type in ("lexical_declaration", "variable_declaration"):
+            # const handler = () => ... 형태는 함수 종류로 기록
+            for declarator in node.named_children:
+                value = declarator.child_by_field_name("value")
+                if value is not None and value.type in FUNCTION_VALUES:
+                    chunk_type = value.type
+                    name_node = declarator.child_by_field_name("name")
+                    break
+        chunks.append((
+            chunk_type,
+            node.start_point[0] + 1,
+            node.end_point[0] + 1,
+            _collapse(source, node.start_byte, node.end_byte, children.get(_node_key(node), [])),
+            _node_text(source, name_node),
+            _enclosing_class(source, node)
+        ))
+
+    top = children.get(None, [])
+    if any(
+        child.type != "comment"
+        and not any(child.start_byte <= n.start_byte and n.end_byte <= child.end_byte for n in top)
+        for child in tree.root_node.named_children
+    ):
+        end = len(source.rstrip(b"\r\n"))
+        chunks.append((
+            MODULE_CHUNK,
+            1,
+            source.count(b"\n", 0, end) + 1,
+            _collapse(source, 0, end, top),
+            "",
+            ""
+        ))
+    return chunks, imports
+
+
+def _node_key(node) -> Tuple[int, int, str]:
+    return node.start_byte, node.end_byte, node.type
+
+
+def _enclosing_chunk(node, keys) -> Optional[Tuple[int, int, str]]:
+    """노드를 포함하는 가장 가까운 청크 노드의 키 (없으면 None)"""
+    current = node.parent
+    while current is not None:
+        key = _node_key(current)
+        if key in keys:
+            return key
+        current = current.parent
+    return None
+
+
+def _chunk_body(node):
+    """청크 노드의 블록 본문 (const f = () => {...}는 값 함수의 본문)"""
+    if node.type in ("lexical_declaration", "variable_declaration"):
+        for declarator in node.named_children:
+            value = declarator.child_by_field_name("value")
+            if value is not None and value.type in FUNCTION_VALUES:
+                node = value
+                break
+    body = node.child_by_field_name("body")
+    return body if body is not None and body.type in BLOCK_NODES else None
+
+
+def _collapse(source: bytes, start: int, end: int, nested: List[object]) -> str:
+    """[start, end) 구간에서 포함된 청크의 본문을 "{ ... }"로 접은 텍스트"""
+    parts = []
+    cursor = start
+    for node in nested:
+        body = _chunk_body(node)
+        if body is None or body.start_byte < cursor:
+            continue
+        parts.append(source[cursor:body.start_byte])
+        parts.append(b"{ ... }")
+        cursor = body.end_byte
+    parts.append(source[cursor:end])
+    return b"".join(parts).decode("utf-8", errors="replace")
+
+
+def _node_text(source: bytes, node) -> str:
+    if node is None:
+        return ""
+    return source[node.start_byte:node.end_byte].decode("utf-8", errors="replace")
+
+
+def _enclosing_class(source: bytes, node) -> str:
+    """
+    노드가 클래스 본문에 직접 속하면 그 클래스의 정규화된 이름 (Outer.Inner)
+
+    함수 본문 안에 있으면 지역 정의로 보고 그 위의 클래스는 따지지 않는다.
+    """
+    names = []
+    current = node.parent
+    while current is not None and current.type != "statement_block":
+        if current.type in CLASS_NODES:
+            name = _node_text(source, current.child_by_field_name("name"))
+            if not name:
+                break
+            names.append(name)
+        current = current.parent
+    return ".".join(reversed(names))
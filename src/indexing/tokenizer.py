@@ -0,0 +1,55 @@
+"""Identifier-aware tokenizer for source code."""
+from typing import List, Tuple
+from functools import lru_cache
+import re
+
+
+_WORD = re.compile(r'[A-Za-z_][A-Za-z0-9_]*|[0-9]+')
+# camelCase / PascalCase / 약어(HTTPServer → HTTP, Server) 경계
+_CAMEL = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+
+def split_identifier(identifier: str) -> List[str]:
+    """
+    식별자를 하위 단어로 분할
+
+    Args:
+        identifier: snake_case / camelCase 식별자
+
+    Returns:
+        소문자 하위 단어 리스트 (예: "getHTTPResponse_code" → ["get", "http", "response", "code"])
+    """
+    parts = []
+    for piece in identifier.split('_'):
+        if piece:
+            parts.extend(p.lower() for p in _CAMEL.findall(piece))
+    return parts
+
+
+def tokenize_code(text: str) -> List[str]:
+    """
+    코드 텍스트를 검색용 토큰으로 분할
+
+    전체 식별자(소문자)와 그 하위 단어를 모두 토큰으로 내보내므로
+    "parse_ast"는 "parse_ast", "parse", "ast"로 매칭된다.
+
+    Args:
+        text: 코드 또는 쿼리 문자열
+
+    Returns:
+        토큰 리스트
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        tokens.extend(_word_tokens(word))
+    return tokens
+
+
+@lru_cache(maxsize=65536)
+def _word_tokens(word: str) -> Tuple[str, ...]:
+    """단어 하나의 토큰 (코드 어휘는 반복이 많으므로 캐시)"""
+    lowered = word.lower()
+    parts = split_identifier(word)
+    if len(parts) > 1 or (parts and parts[0] != lowered):
+        return (lowered, *parts)
+    return (lowered,)
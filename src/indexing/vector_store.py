@@ -0,0 +1,1087 @@
+"""Memory-mapped flat vector store."""
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Callable
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from .ann_index import AnnIndex
+from .embeddings import embed_to_array
+
+
+# 저장 정밀도 (int8은 행별 스케일을 둔 스칼라 양자화)
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    행별 대칭 int8 스칼라 양자화
+
+    행마다 최대 절댓값을 127에 맞추므로 학습이 필요 없고 추가 전용 행렬에 그대로 붙일 수 있다.
+
+    Args:
+        vectors: (n, dim) float32 벡터
+
+    Returns:
+        (int8 코드 행렬, 행별 float32 스케일)
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class _SharedLock:
+    """
+    검색(공유)과 압축(배타)을 구분하는 읽기/쓰기 락
+
+    배타 락을 기다리는 스레드가 있으면 새 공유 락은 그 뒤에 줄을 서므로 검색이 계속 들어와도
+    압축이 밀리지 않는다. 이미 공유 락을 가진 스레드의 재진입은 바로 허용되어, 검색 안에서
+    다른 검색 메서드를 호출해도 교착되지 않는다. 배타 락을 가진 스레드는 공유 락도 얻을 수 있다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        # 스레드 → 가진 공유 락 수 (재진입 판별)
+        self._holders: Dict[int, int] = {}
+        self._waiting_writers = 0
+        self._writer: Optional[int] = None
+        self._depth = 0
+
+    @contextmanager
+    def shared(self):
+        me = threading.get_ident()
+        with self._cond:
+            if me not in self._holders and self._writer != me:
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+            self._holders[me] = self._holders.get(me, 0) + 1
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                self._holders[me] -= 1
+                if not self._holders[me]:
+                    del self._holders[me]
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._depth += 1
+            else:
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer, self._depth = me, 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+class _FloatRows:
+    """저장 정밀도와 무관하게 행을 float32로 읽는 행렬 뷰 (ANN 색인 생성용)"""
+
+    def __init__(self, store: "MmapVectorStore"):
+        self._store = store
+        self.shape = store._matrix.shape
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, rows) -> np.ndarray:
+        return self._store._float_rows(rows)
+
+
+class MmapVectorStore(VectorStore):
+    """
+    메모리 맵 행렬 기반 정확 검색 벡터 스토어
+
+    정규화된 임베딩을 float32(또는 float16) 행렬 파일에 행 단위로 추가하고,
+    ID/본문/메타데이터는 SQLite 테이블에 행 번호로 보관한다.
+    열 때는 헤더만 읽고, 행렬과 생존 행 마스크는 첫 검색 시점에 매핑한다.
+    검색은 블록 단위 행렬-벡터 곱과 argpartition으로 정확한 top-k를 구한다.
+    ANN 색인(ann)을 주면 생존 행이 min_rows 이상일 때 근사 검색으로 전환한다.
+
+    압축(compact)은 행 번호를 바꾸므로, 검색은 스캔부터 문서 조회까지 공유 락(reading())을
+    잡고 압축은 배타 락을 잡는다. 스트리밍 검색(iter_top_k)은 샤드마다 락을 다시 잡고 그 사이
+    generation이 바뀌었는지 확인한다. 압축된 파일은 임시 파일로 기록한 뒤 행 번호 변경과 새
+    generation을 한 트랜잭션으로 커밋하고 나서 교체한다. 교체 도중 중단되면 다음에 열 때
+    DB의 generation이 헤더보다 크므로 남은 임시 파일 교체를 마저 한다.
+
+    int8로 저장하면 코드 행렬(행당 dim 바이트)과 행별 스케일만 검색 시 메모리에 올라온다.
+    점수는 float32 쿼리와 int8 코드의 내적에 스케일을 곱해 구하고(비대칭 거리 계산),
+    rescore > 0이면 상위 k·rescore 후보를 디스크의 float32 사본으로 다시 점수 매긴다.
+    """
+
+    # 한 번에 점수를 계산하는 행 수 (float16 → float32 변환 메모리 제한)
+    SCORE_BLOCK_ROWS = 16384
+    # float32가 아닌 행렬은 캐시에 들어가는 크기로 나눠 재사용 버퍼에 변환
+    CONVERT_BLOCK_ROWS = 2048
+    # 삭제된 행 비율이 이보다 크면 persist() 시 압축
+    COMPACT_RATIO = 0.5
+    # 필터 후보가 전체 행의 이 비율 이하이면 후보 행만 모아 점수 계산 (ANN보다 우선)
+    SUBSET_SCAN_RATIO = 0.25
+    # iter_top_k가 중간 결과를 내보내는 스캔 단위 (행 수)
+    STREAM_SHARD_ROWS = 65536
+
+    def __init__(
+        self,
+        persist_directory: str,
+        embedding_function: Embeddings,
+        dtype: str = "float32",
+        ann: Optional[AnnIndex] = None,
+        rescore: int = 0
+    ):
+        """
+        Mmap Vector Store 초기화
+
+        Args:
+            persist_directory: 저장 디렉토리
+            embedding_function: 임베딩 백엔드
+            dtype: 저장 정밀도 ("float32", "float16", "int8")
+            ann: 근사 최근접 이웃 색인 (None이면 항상 정확 검색)
+            rescore: 0보다 크면 상위 k·rescore 후보를 float32로 재채점.
+                새 스토어를 int8로 만들 때 0보다 크면 float32 사본을 함께 기록한다
+        """
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+        self.persist_directory = Path(persist_directory)
+        self.persist_directory.mkdir(parents=True, exist_ok=True)
+        self._embedding_function = embedding_function
+        self._lock = threading.RLock()
+        self._shared = _SharedLock()
+        self._header_path = self.persist_directory / "header.json"
+        self._vectors_path = self.persist_directory / "vectors.bin"
+        self._scales_path = self.persist_directory / "scales.bin"
+        self._full_path = self.persist_directory / "vectors.f32"
+        self._db_path = self.persist_directory / "docs.sqlite3"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._live: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._full: Optional[np.ndarray] = None
+        self.rescore = rescore
+        self._ann = ann
+        self._ann_path = self.persist_directory / "ann.index"
+        self._ann_loaded = False
+        self._ann_dirty = False
+
+        self.dim: Optional[int] = None
+        self.dtype = np.dtype(dtype)
+        # float32가 아닌 저장 정밀도에서 재채점용 float32 사본을 기록하는지 여부
+        self.full_precision = rescore > 0 and dtype != "float32"
+        # 압축 횟수 (행 번호 체계의 버전)
+        self.generation = 0
+        if self._header_path.exists():
+            with open(self._header_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+            self.dim = header["dim"]
+            self.dtype = np.dtype(header["dtype"])
+            self.full_precision = header.get("full_precision", False)
+            self.generation = header.get("generation", 0)
+            self._recover()
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self._embedding_function
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                " row INTEGER PRIMARY KEY,"
+                " id TEXT NOT NULL UNIQUE,"
+                " content TEXT NOT NULL,"
+                " metadata TEXT NOT NULL"
+                ")"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @property
+    def num_rows(self) -> int:
+        """행렬 파일에 기록된 행 수 (삭제된 행 포함)"""
+        if self.dim is None or not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (self.dim * self.dtype.itemsize)
+
+    def _write_header(self):
+        tmp_path = self._header_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": 1,
+                "dim": self.dim,
+                "dtype": self.dtype.name,
+                "full_precision": self.full_precision,
+                "generation": self.generation
+            }, f)
+        os.replace(tmp_path, self._header_path)
+
+    def _compacted_paths(self) -> List[Path]:
+        """압축 시 교체되는 파일 (행 수를 결정하는 vectors.bin이 마지막)"""
+        return [self._scales_path, self._full_path, self._vectors_path]
+
+    def _recover(self):
+        """중단된 압축 정리 (DB가 커밋되었으면 남은 파일 교체를 마저 하고, 아니면 임시 파일 삭제)"""
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        committed = row[0] if row else 0
+        for path in self._compacted_paths():
+            tmp_path = path.with_name(path.name + ".tmp")
+            if not tmp_path.exists():
+                continue
+            if committed > self.generation:
+                os.replace(tmp_path, path)
+            else:
+                tmp_path.unlink()
+        if committed > self.generation:
+            self.generation = committed
+            self._write_header()
+
+    def reading(self):
+        """
+        압축을 막는 공유 락 (컨텍스트 매니저)
+
+        rows_for_ids로 구한 행 번호를 검색에 넘기는 호출자는 두 호출을 함께 감싸야
+        그 사이에 행 번호가 바뀌지 않는다. 검색 메서드는 각자 이 락을 잡는다.
+        """
+        return self._shared.shared()
+
+    def _load(self) -> Tuple[np.ndarray, np.ndarray]:
+        """행렬 매핑과 생존 행 마스크를 (필요할 때만) 로드"""
+        with self._lock:
+            if self._matrix is None:
+                rows = self.num_rows
+                if rows == 0:
+                    self._matrix = np.zeros((0, self.dim or 0), dtype=self.dtype)
+                    self._scales = np.zeros(0, dtype=np.float32)
+                else:
+                    self._matrix = np.memmap(
+                        self._vectors_path, dtype=self.dtype, mode='r',
+                        shape=(rows, self.dim)
+                    )
+                    if self.dtype == np.int8:
+                        self._scales = np.fromfile(self._scales_path, dtype=np.float32, count=rows)
+                self._full = None
+            if self._live is None:
+                # 메타데이터가 없는 행(삭제되었거나 기록 도중 중단된 행)은 제외
+                live = np.zeros(len(self._matrix), dtype=bool)
+                live_rows = np.fromiter(
+                    (row for (row,) in self._db.execute("SELECT row FROM docs")),
+                    dtype=np.int64
+                )
+                live[live_rows[live_rows < len(live)]] = True
+                self._live = live
+            return self._matrix, self._live
+
+    def _invalidate(self):
+        self._matrix = None
+        self._live = None
+
+    def _float_rows(self, rows) -> np.ndarray:
+        """행(슬라이스 또는 행 번호 배열)을 float32로 복원"""
+        block = self._matrix[rows].astype(np.float32)
+        if self.dtype == np.int8:
+            block *= self._scales[rows][:, None]
+        return block
+
+    def _full_matrix(self) -> np.ndarray:
+        """float32 사본 매핑 (재채점 후보 행만 페이지 인되므로 상주 메모리는 작다)"""
+        if self._full is None:
+            self._full = np.memmap(
+                self._full_path, dtype=np.float32, mode='r', shape=self._matrix.shape
+            )
+        return self._full
+
+    def _full_rows(self, rows: np.ndarray) -> np.ndarray:
+        """재채점용 float32 행 (사본이 없으면 저장 정밀도에서 복원)"""
+        if not self.full_precision:
+            return self._float_rows(rows)
+        return np.asarray(self._full_matrix()[rows])
+
+    def _append(self, path: Path, start_bytes: int, data: bytes):
+        """파일을 start_bytes로 자른 뒤 덧붙임 (기록 도중 중단된 꼬리 제거)"""
+        with open(path, 'ab') as f:
+            f.truncate(start_bytes)
+            f.write(data)
+
+    def memory_bytes(self) -> int:
+        """검색 시 스캔하는 데이터 크기 (코드 행렬 + 스케일, 재채점 사본 제외)"""
+        rows = self.num_rows
+        scale_bytes = 4 if self.dtype == np.int8 else 0
+        return rows * ((self.dim or 0) * self.dtype.itemsize + scale_bytes)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """
+        텍스트 임베딩 후 행렬 끝에 추가 (같은 ID가 있으면 교체)
+
+        Args:
+            texts: 텍스트
+            metadatas: 메타데이터 리스트
+            ids: 문서 ID 리스트 (None이면 행 번호 기반으로 생성)
+
+        Returns:
+            추가된 문서 ID 리스트
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = embed_to_array(self._embedding_function, texts)
+        return self.add_vectors(vectors, texts, metadatas, ids)
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        이미 계산된 임베딩을 추가
+
+        Args:
+            vectors: (n, dim) 임베딩 행렬
+            texts: 본문 리스트
+            metadatas: 메타데이터 리스트
+            ids: 문서 ID 리스트
+
+        Returns:
+            추가된 문서 ID 리스트
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        metadatas = metadatas or [{} for _ in texts]
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._write_header()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension mismatch: expected {self.dim}, got {vectors.shape[1]}"
+                )
+            start = self.num_rows
+            if ids is None:
+                ids = [str(start + i) for i in range(len(texts))]
+
+            # 행렬을 먼저 기록하고 메타데이터를 커밋해야 중단 시에도 일관성이 유지된다
+            # (행 수는 vectors.bin 크기로 정해지므로 보조 파일을 먼저 기록)
+            if self.dtype == np.int8:
+                codes, scales = quantize_int8(vectors)
+                self._append(self._scales_path, start * 4, scales.tobytes())
+            else:
+                codes = vectors.astype(self.dtype)
+            if self.full_precision:
+                self._append(self._full_path, start * self.dim * 4, vectors.tobytes())
+            self._append(
+                self._vectors_path, start * self.dim * self.dtype.itemsize, codes.tobytes()
+            )
+            db = self._db
+            db.executemany("DELETE FROM docs WHERE id = ?", [(doc_id,) for doc_id in ids])
+            db.executemany(
+                "INSERT OR REPLACE INTO docs (row, id, content, metadata) VALUES (?, ?, ?, ?)",
+                [
+                    (start + i, doc_id, text, json.dumps(metadata))
+                    for i, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas))
+                ]
+            )
+            db.commit()
+            self._invalidate()
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """ID로 문서 삭제 (행은 압축 전까지 남고 검색에서 제외)"""
+        if not ids:
+            return False
+        with self._lock:
+            db = self._db
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                db.execute(
+                    f"DELETE FROM docs WHERE id IN ({','.join('?' * len(part))})", part
+                )
+            db.commit()
+            self._live = None
+        return True
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def rows_for_ids(self, ids: Iterable[str]) -> np.ndarray:
+        """
+        문서 ID의 행 번호 (정렬됨, 없는 ID는 제외) - 필터 후보를 행 집합으로 변환
+
+        Args:
+            ids: 문서 ID
+
+        Returns:
+            행 번호 배열
+        """
+        ids = list(ids)
+        rows = []
+        with self._lock:
+            db = self._db
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                rows.extend(
+                    row for (row,) in db.execute(
+                        f"SELECT row FROM docs WHERE id IN ({','.join('?' * len(part))})", part
+                    )
+                )
+        return np.sort(np.asarray(rows, dtype=np.int64))
+
+    def _fetch(self, rows: List[int]) -> Dict[int, Tuple[str, str, dict]]:
+        """행 번호 → (ID, 본문, 메타데이터)"""
+        if not rows:
+            return {}
+        result = {}
+        # 검색 스레드끼리 같은 연결의 커서를 동시에 돌리지 않도록 락 안에서 조회
+        with self._lock:
+            for i in range(0, len(rows), 500):
+                part = rows[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                for row, doc_id, content, metadata in self._db.execute(
+                    f"SELECT row, id, content, metadata FROM docs WHERE row IN ({placeholders})",
+                    part
+                ):
+                    result[row] = (doc_id, content, json.loads(metadata))
+        return result
+
+    @property
+    def ann(self) -> Optional[AnnIndex]:
+        return self._ann
+
+    def _sync_ann(self) -> Optional[AnnIndex]:
+        """
+        ANN 색인을 행렬과 맞춤 (필요하면 로드/생성/재학습, 새 행은 증분 삽입)
+
+        Returns:
+            검색에 쓸 ANN 색인 (ANN 미사용이거나 행이 적으면 None)
+        """
+        if self._ann is None:
+            return None
+        with self._lock:
+            matrix, live = self._load()
+            ann = self._ann
+            if not self._ann_loaded:
+                ann.load(self._ann_path)
+                self._ann_loaded = True
+            live_count = int(live.sum())
+            if live_count < ann.params["min_rows"]:
+                return None
+            if not ann.built or ann.rows > len(matrix) or ann.should_rebuild(live_count):
+                ann.build(_FloatRows(self), live, block_rows=self.SCORE_BLOCK_ROWS)
+                self._ann_dirty = True
+            elif ann.rows < len(matrix):
+                for start in range(ann.rows, len(matrix), self.SCORE_BLOCK_ROWS):
+                    rows = np.arange(
+                        start, min(start + self.SCORE_BLOCK_ROWS, len(matrix)), dtype=np.int64
+                    )
+                    keep = live[rows]
+                    ann.add(self._float_rows(rows[keep]), rows[keep])
+                ann.rows = len(matrix)
+                self._ann_dirty = True
+            return ann
+
+    def top_k(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        top-k 행 검색 (ANN 색인이 활성화되어 있으면 근사 검색)
+
+        Args:
+            query_vector: 쿼리 임베딩
+            k: 반환할 결과 수
+            rows: 검색 대상 행 (rows_for_ids 결과, None이면 전체). 점수 계산 전에 적용되어,
+                후보가 적으면 후보 행만 읽어 점수를 계산하고 많으면 전체 스캔의 마스크로 쓴다
+
+        Returns:
+            (행 번호 배열, 코사인 유사도 배열) - 유사도 내림차순
+        """
+        with self.reading():
+            return self._top_k(query_vector, k, rows)
+
+    def _top_k(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        matrix, live = self._load()
+        if len(matrix) == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        if rows is not None:
+            rows = rows[rows < len(matrix)]
+            rows = rows[live[rows]]
+            if len(rows) <= len(matrix) * self.SUBSET_SCAN_RATIO:
+                return self._subset_top_k(rows, query, k)
+            allowed = np.zeros(len(matrix), dtype=bool)
+            allowed[rows] = True
+            live = live & allowed
+
+        # faiss 색인은 추가와 검색이 동시에 일어나면 안 되므로 락 안에서 검색
+        with self._lock:
+            ann = self._sync_ann()
+            if ann is not None:
+                return self._ann_top_k(ann, live, query, k)
+
+        scores = self._scan_scores(matrix, query[None, :])[:, 0]
+        return self._select(scores, live, query, k)
+
+    def top_k_many(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        여러 쿼리의 top-k 행 검색
+
+        전체 스캔이면 행렬을 한 번만 읽어 (블록 × 쿼리 수) 행렬 곱으로 모든 쿼리의 점수를
+        계산한다. ANN 색인이나 적은 후보 행으로 제한된 검색은 쿼리별로 top_k를 수행한다.
+
+        Args:
+            query_vectors: (쿼리 수, dim) 쿼리 임베딩
+            k: 쿼리당 반환할 결과 수
+            rows: 검색 대상 행 (top_k와 같음)
+
+        Returns:
+            쿼리 순서의 (행 번호 배열, 코사인 유사도 배열) 리스트
+        """
+        with self.reading():
+            return self._top_k_many(query_vectors, k, rows)
+
+    def _top_k_many(
+        self,
+        query_vectors: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray]
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        matrix, live = self._load()
+        if len(matrix) == 0 or k <= 0 or len(queries) == 0:
+            empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+            return [empty] * len(queries)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        if rows is not None:
+            rows = rows[rows < len(matrix)]
+            rows = rows[live[rows]]
+            subset = len(rows) <= len(matrix) * self.SUBSET_SCAN_RATIO
+        with self._lock:
+            ann = self._sync_ann()
+        if ann is not None or (rows is not None and subset):
+            return [self._top_k(query, k, rows) for query in queries]
+        if rows is not None:
+            allowed = np.zeros(len(matrix), dtype=bool)
+            allowed[rows] = True
+            live = live & allowed
+
+        scores = self._scan_scores(matrix, queries)
+        return [
+            self._select(scores[:, i], live, query, k) for i, query in enumerate(queries)
+        ]
+
+    def iter_top_k(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        STREAM_SHARD_ROWS 행씩 스캔하며 지금까지 본 행의 top-k를 차례로 반환
+
+        앞쪽 샤드만 보고도 좋은 후보를 먼저 받을 수 있고, 소비를 멈추면 남은 스캔도 하지 않는다.
+        마지막 값은 top_k()와 같다. ANN 색인이나 후보 행 스캔은 한 번에 끝나므로 한 번만 반환한다.
+
+        Args:
+            query_vector: 쿼리 임베딩
+            k: 반환할 결과 수
+            rows: 검색 대상 행 (top_k와 같음)
+
+        Yields:
+            (행 번호 배열, 코사인 유사도 배열) - 유사도 내림차순
+        """
+        return self._iter_top_k(query_vector, k, rows, lambda found, scores: (found, scores))
+
+    def _iter_top_k(
+        self,
+        query_vector: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray],
+        resolve: Callable[[np.ndarray, np.ndarray], Any]
+    ) -> Iterator[Any]:
+        """
+        iter_top_k 구현 - 중간 top-k마다 공유 락 안에서 resolve(행, 점수)를 호출해 그 값을 반환
+
+        공유 락은 샤드 하나를 스캔하고 resolve하는 동안만 잡고 yield 중에는 놓으므로, 소비자가
+        멈춰 있어도 압축이 막히지 않는다. 샤드 사이에 압축으로 generation이 바뀌면 전체 검색은
+        처음부터 다시 스캔하고, rows로 제한된 검색은 행 번호가 옛 generation 기준이므로 멈춘다
+        (호출자는 generation을 비교해 다시 검색한다).
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        keep = k * self.rescore if self._rescoring else k
+        restart = True
+        while restart:
+            restart = False
+            with self.reading():
+                generation = self.generation
+                matrix, live = self._load()
+                scan_rows = rows
+                if scan_rows is not None:
+                    scan_rows = scan_rows[scan_rows < len(matrix)]
+                    scan_rows = scan_rows[live[scan_rows]]
+                with self._lock:
+                    ann = self._sync_ann()
+                subset = (
+                    scan_rows is not None
+                    and len(scan_rows) <= len(matrix) * self.SUBSET_SCAN_RATIO
+                )
+                single = len(matrix) == 0 or k <= 0 or ann is not None or subset
+                if single:
+                    result = resolve(*self._top_k(query, k, scan_rows))
+                elif scan_rows is not None:
+                    allowed = np.zeros(len(matrix), dtype=bool)
+                    allowed[scan_rows] = True
+                    live = live & allowed
+            if single:
+                yield result
+                return
+
+            best_rows = np.zeros(0, dtype=np.int64)
+            best_scores = np.zeros(0, dtype=np.float32)
+            for start in range(0, len(matrix), self.STREAM_SHARD_ROWS):
+                with self.reading():
+                    if self.generation != generation:
+                        restart = rows is None
+                        break
+                    stop = min(start + self.STREAM_SHARD_ROWS, len(matrix))
+                    shard_live = live[start:stop]
+                    scores = self._scan_scores(matrix, query[None, :], start, stop)[:, 0]
+                    shard_rows = np.arange(start, stop, dtype=np.int64)[shard_live]
+                    best_rows = np.concatenate([best_rows, shard_rows])
+                    best_scores = np.concatenate([best_scores, scores[shard_live]])
+                    if len(best_rows) > keep:
+                        top = np.argpartition(-best_scores, keep - 1)[:keep]
+                        best_rows, best_scores = best_rows[top], best_scores[top]
+                    if len(best_rows) == 0:
+                        continue
+                    if self._rescoring:
+                        result = resolve(*self._rescore(best_rows, query, k))
+                    else:
+                        order = np.argsort(-best_scores)[:k]
+                        result = resolve(best_rows[order], best_scores[order])
+                yield result
+            else:
+                if len(best_rows) == 0:
+                    with self.reading():
+                        result = resolve(
+                            np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+                        )
+                    yield result
+
+    def _scan_scores(
+        self,
+        matrix: np.ndarray,
+        queries: np.ndarray,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> np.ndarray:
+        """행렬의 [start, stop) 행을 블록 단위로 한 번 읽어 (행 수, 쿼리 수) 점수 계산"""
+        stop = len(matrix) if stop is None else stop
+        scores = np.empty((stop - start, len(queries)), dtype=np.float32)
+        queries_t = np.ascontiguousarray(queries.T)
+        if self.dtype == np.float32:
+            for begin in range(start, stop, self.SCORE_BLOCK_ROWS):
+                block = matrix[begin:min(begin + self.SCORE_BLOCK_ROWS, stop)]
+                scores[begin - start:begin - start + len(block)] = block @ queries_t
+        else:
+            buffer = np.empty((self.CONVERT_BLOCK_ROWS, matrix.shape[1]), dtype=np.float32)
+            for begin in range(start, stop, self.CONVERT_BLOCK_ROWS):
+                block = matrix[begin:min(begin + self.CONVERT_BLOCK_ROWS, stop)]
+                converted = buffer[:len(block)]
+                np.copyto(converted, block)
+                scores[begin - start:begin - start + len(block)] = converted @ queries_t
+        if self.dtype == np.int8:
+            scores *= self._scales[start:stop, None]
+        return scores
+
+    def _select(
+        self,
+        scores: np.ndarray,
+        live: np.ndarray,
+        query: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """전체 스캔 점수(제자리에서 수정됨)에서 생존 행의 top-k 선택 (필요하면 재채점)"""
+        scores[~live] = -np.inf
+        k = min(k, int(live.sum()))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        fetch = min(k * self.rescore, int(live.sum())) if self._rescoring else k
+        candidates = np.argpartition(-scores, fetch - 1)[:fetch]
+        if self._rescoring:
+            return self._rescore(candidates, query, k)
+        order = candidates[np.argsort(-scores[candidates])]
+        return order, scores[order]
+
+    def _subset_top_k(
+        self,
+        rows: np.ndarray,
+        query: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """후보 행(정렬됨)만 읽어 정확한 top-k 계산"""
+        k = min(k, len(rows))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), self.CONVERT_BLOCK_ROWS):
+            block = rows[start:start + self.CONVERT_BLOCK_ROWS]
+            scores[start:start + len(block)] = self._float_rows(block) @ query
+        fetch = min(k * self.rescore, len(rows)) if self.rescore > 0 and self.dtype != np.float32 else k
+        candidates = np.argpartition(-scores, fetch - 1)[:fetch]
+        if fetch > k:
+            return self._rescore(rows[candidates], query, k)
+        order = candidates[np.argsort(-scores[candidates])]
+        return rows[order], scores[order]
+
+    @property
+    def _rescoring(self) -> bool:
+        """저장된 점수가 근사값이어서 재채점이 의미 있는지 여부"""
+        approximate = self.dtype != np.float32 or (
+            self._ann is not None and self._ann.kind == "ivfpq"
+        )
+        return self.rescore > 0 and approximate
+
+    def _rescore(
+        self,
+        rows: np.ndarray,
+        query: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """후보 행을 float32 벡터로 다시 점수 매겨 상위 k 반환"""
+        rows = np.sort(rows)  # 디스크 순서로 읽기
+        scores = self._full_rows(rows) @ query
+        order = np.argsort(-scores)[:k]
+        return rows[order], scores[order]
+
+    def _ann_top_k(
+        self,
+        ann: AnnIndex,
+        live: np.ndarray,
+        query: np.ndarray,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ANN 후보에서 삭제된 행을 거르고, 부족하면 후보 수를 늘려 다시 검색
+
+        live는 검색 시작 시점의 마스크이므로, 그 뒤에 추가되어 색인에 들어간 행은 제외한다.
+        """
+        k = min(k, int(live.sum()))
+        want = k * self.rescore if self._rescoring else k
+        fetch = want * 2
+        while True:
+            rows, scores = ann.search(query, fetch)
+            keep = np.zeros(len(rows), dtype=bool)
+            inside = rows < len(live)
+            keep[inside] = live[rows[inside]]
+            # 탐색 범위(nprobe/ef_search)의 후보를 모두 받았으면 더 늘려도 소용없음
+            if keep.sum() >= want or len(rows) < fetch or fetch >= ann.ntotal:
+                break
+            fetch *= 4
+        if self._rescoring:
+            return self._rescore(rows[keep][:want], query, k)
+        return rows[keep][:k], scores[keep][:k]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[Document, float]]:
+        with self.reading():
+            rows, scores = self.top_k(np.asarray(embedding, dtype=np.float32), k, rows=rows)
+            fetched = self._fetch([int(r) for r in rows])
+        results = []
+        for row, score in zip(rows, scores):
+            if int(row) not in fetched:
+                continue
+            doc_id, content, metadata = fetched[int(row)]
+            results.append((
+                Document(page_content=content, metadata=metadata),
+                float(score)
+            ))
+        return results
+
+    def iter_similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        rows: Optional[np.ndarray] = None
+    ) -> Iterator[List[Tuple[Document, float]]]:
+        """
+        iter_top_k의 중간 top-k를 (문서, 코사인 유사도) 리스트로 차례로 반환
+
+        문서는 각 샤드의 공유 락 안에서 조회하므로 행 번호와 문서가 항상 같은 generation이다.
+        rows로 제한된 검색은 도중에 압축되면 멈추므로, 호출자는 generation을 비교해 다시 검색한다.
+        """
+        documents: Dict[int, Document] = {}
+        seen = [self.generation]
+
+        def resolve(found_rows: np.ndarray, scores: np.ndarray) -> List[Tuple[Document, float]]:
+            if self.generation != seen[0]:
+                # 압축으로 행 번호가 바뀌었으므로 이전에 조회한 문서는 다시 조회
+                documents.clear()
+                seen[0] = self.generation
+            new_rows = [int(r) for r in found_rows if int(r) not in documents]
+            for row, (doc_id, content, metadata) in self._fetch(new_rows).items():
+                documents[row] = Document(page_content=content, metadata=metadata)
+            return [
+                (documents[int(row)], float(score))
+                for row, score in zip(found_rows, scores) if int(row) in documents
+            ]
+
+        yield from self._iter_top_k(np.asarray(embedding, dtype=np.float32), k, rows, resolve)
+
+    def similarity_search_by_vectors_with_score(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4,
+        rows: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """여러 쿼리 벡터를 한 번의 스캔으로 검색 (쿼리 순서의 (문서, 코사인 유사도) 리스트)"""
+        with self.reading():
+            found = self.top_k_many(np.asarray(embeddings, dtype=np.float32), k, rows=rows)
+            fetched = self._fetch(sorted({int(r) for result_rows, _ in found for r in result_rows}))
+        return [
+            [
+                (
+                    Document(page_content=fetched[int(row)][1], metadata=fetched[int(row)][2]),
+                    float(score)
+                )
+                for row, score in zip(result_rows, scores) if int(row) in fetched
+            ]
+            for result_rows, scores in found
+        ]
+
+    def similarity_search_by_vectors(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4,
+        rows: Optional[np.ndarray] = None
+    ) -> List[List[Document]]:
+        return [
+            [doc for doc, _ in results]
+            for results in self.similarity_search_by_vectors_with_score(embeddings, k=k, rows=rows)
+        ]
+
+    def vectors_for_ids(self, ids: List[str]) -> np.ndarray:
+        """
+        문서 ID 순서의 정규화된 float32 벡터 (MMR 등 후보 재순위용, 없는 ID는 0 벡터)
+
+        Args:
+            ids: 문서 ID 리스트
+
+        Returns:
+            (len(ids), dim) 벡터 행렬
+        """
+        with self.reading():
+            matrix, _ = self._load()
+            found: Dict[str, int] = {}
+            with self._lock:
+                for i in range(0, len(ids), 500):
+                    part = ids[i:i + 500]
+                    found.update(self._db.execute(
+                        f"SELECT id, row FROM docs WHERE id IN ({','.join('?' * len(part))})", part
+                    ))
+            vectors = np.zeros(
+                (len(ids), matrix.shape[1] if matrix.ndim == 2 else 0), dtype=np.float32
+            )
+            positions = [
+                i for i, doc_id in enumerate(ids) if found.get(doc_id, len(matrix)) < len(matrix)
+            ]
+            if positions:
+                rows = np.asarray([found[ids[i]] for i in positions], dtype=np.int64)
+                vectors[positions] = self._full_rows(rows)
+        return vectors
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """코사인 유사도(높을수록 유사)와 함께 검색"""
+        embedding = self._embedding_function.embed_query(query)
+        return self.similarity_search_by_vector_with_score(embedding, k=k)
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        rows: Optional[np.ndarray] = None,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [
+            doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k=k, rows=rows)
+        ]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # 점수가 이미 코사인 유사도이므로 그대로 사용
+        return lambda score: score
+
+    def persist(self):
+        """기록은 즉시 디스크에 반영되므로, 삭제된 행이 많을 때만 압축하고 ANN 색인 저장"""
+        # 배타 락은 행 번호를 바꾸는 압축에만 잡는다 (진행 중인 검색을 기다리지 않도록)
+        with self._lock:
+            rows = self.num_rows
+            needs_compact = rows and len(self) < rows * (1 - self.COMPACT_RATIO)
+        if needs_compact:
+            self.compact()
+        # ANN 색인 저장은 행 번호를 바꾸지 않고, 색인을 쓰는 검색은 모두 _lock 안에서 이뤄진다
+        with self._lock:
+            if self._sync_ann() is not None and self._ann_dirty:
+                self._ann.save(self._ann_path)
+                self._ann_dirty = False
+
+    def compact(self):
+        """
+        삭제된 행을 제거하고 행렬을 다시 기록
+
+        임시 파일을 fsync한 뒤 행 번호 재배치와 generation 증가를 한 트랜잭션으로 커밋하고,
+        그 다음에 파일을 교체한다. 커밋 전에 중단되면 옛 상태가, 커밋 후에 중단되면 다음에
+        열 때 _recover()가 교체를 마무리한 새 상태가 남는다.
+        """
+        with self._shared.exclusive(), self._lock:
+            matrix, live = self._load()
+            live_rows = np.flatnonzero(live)
+            sources = {self._vectors_path: matrix}
+            if self.dtype == np.int8:
+                sources[self._scales_path] = self._scales
+            if self.full_precision:
+                sources[self._full_path] = self._full_matrix()
+            for path, data in sources.items():
+                with open(path.with_name(path.name + ".tmp"), 'wb') as f:
+                    for start in range(0, len(live_rows), self.SCORE_BLOCK_ROWS):
+                        f.write(np.ascontiguousarray(
+                            data[live_rows[start:start + self.SCORE_BLOCK_ROWS]]
+                        ).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            # 행 번호가 바뀌므로 ANN 색인은 다시 만든다 (중단되어도 옛 색인이 남지 않게 먼저 삭제)
+            if self._ann is not None:
+                self._ann.reset()
+                self._ann_path.unlink(missing_ok=True)
+            db = self._db
+            # 행 번호를 0..n-1로 재배치 (음수 임시값으로 UNIQUE 충돌 회피)
+            db.executemany(
+                "UPDATE docs SET row = ? WHERE row = ?",
+                [(-(new + 1), int(old)) for new, old in enumerate(live_rows)]
+            )
+            db.execute("UPDATE docs SET row = -row - 1")
+            db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                (self.generation + 1,)
+            )
+            db.commit()
+            self._matrix = None
+            self._full = None
+            for path in self._compacted_paths():
+                if path in sources:
+                    os.replace(path.with_name(path.name + ".tmp"), path)
+            self.generation += 1
+            self._write_header()
+            self._invalidate()
+
+    def clear(self):
+        """
+        모든 문서와 행렬 파일 삭제 (임베딩 모델이 바뀐 전체 재구축용)
+
+        차원도 비워 두므로 다음 add_vectors가 새 임베딩 차원으로 다시 시작한다.
+        """
+        with self._shared.exclusive(), self._lock:
+            db = self._db
+            db.execute("DELETE FROM docs")
+            db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)",
+                (self.generation + 1,)
+            )
+            db.commit()
+            self._matrix = None
+            self._full = None
+            # 행 수를 결정하는 vectors.bin을 먼저 지움
+            for path in reversed(self._compacted_paths()):
+                path.unlink(missing_ok=True)
+            if self._ann is not None:
+                self._ann.reset()
+                self._ann_path.unlink(missing_ok=True)
+                self._ann_dirty = False
+            self.dim = None
+            self.generation += 1
+            self._write_header()
+            self._invalidate()
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_directory: str = ".cursor_index/vectors",
+        **kwargs: Any
+    ) -> "MmapVectorStore":
+        store = cls(persist_directory=persist_directory, embedding_function=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
@@ -0,0 +1,462 @@
+"""Filesystem watcher that keeps the codebase index up to date."""
+from typing import Dict, List, Optional, Union
+from pathlib import Path
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+
+from ..utils.file_walker import FileWalker
+
+
+# 대기열 넘침 등으로 개별 변경을 알 수 없을 때 전체 재검사를 요청하는 표시
+RESCAN = object()
+
+PollResult = Union[List[Path], object]
+
+
+class PollingBackend:
+    """
+    주기적으로 (mtime, 크기) 스냅샷을 비교하는 이식성 있는 감시 백엔드
+
+    inotify를 쓸 수 없는 환경(macOS, Windows, 감시 개수 한도 초과)에서 사용한다.
+    """
+
+    def __init__(self, walker: FileWalker, interval: float = 1.0):
+        """
+        Polling Backend 초기화
+
+        Args:
+            walker: 감시 대상 파일 탐색기
+            interval: 스냅샷 간격 (초)
+        """
+        self.walker = walker
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._last_scan = time.monotonic()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        extensions = self.walker.extensions
+        for entry, _, _ in self.walker.iter_entries():
+            if extensions and not entry.name.endswith(extensions):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> PollResult:
+        """
+        변경된 경로 반환 (간격이 지나지 않았으면 timeout만큼 대기 후 빈 리스트)
+
+        Args:
+            timeout: 최대 대기 시간 (초)
+        """
+        remaining = self.interval - (time.monotonic() - self._last_scan)
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+            return []
+        snapshot = self._scan()
+        self._last_scan = time.monotonic()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changed = [path for path, stat in snapshot.items() if old.get(path) != stat]
+        changed.extend(path for path in old if path not in snapshot)
+        return [Path(path) for path in changed]
+
+    def close(self):
+        self._snapshot = {}
+
+
+class InotifyBackend:
+    """
+    Linux inotify 기반 감시 백엔드 (ctypes로 libc 직접 호출)
+
+    무시되지 않는 디렉토리마다 감시를 등록하고, 새 디렉토리가 생기면 감시를 추가한다.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+    )
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, walker: FileWalker):
+        """
+        Inotify Backend 초기화
+
+        Args:
+            walker: 감시 대상 파일 탐색기 (디렉토리 선택에 사용)
+
+        Raises:
+            OSError: inotify를 사용할 수 없거나 감시 개수 한도를 넘은 경우
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.walker = walker
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}
+        try:
+            self._watch_tree(str(walker.root))
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, dir_path: str):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # 감시 도중 삭제된 디렉토리는 무시, 한도 초과(ENOSPC) 등은 호출자에게 전달
+            if errno in (2, 20):
+                return
+            raise OSError(errno, f"inotify_add_watch failed: {dir_path}")
+        self._watches[wd] = dir_path
+
+    def _watch_tree(self, dir_path: str) -> List[Path]:
+        """dir_path와 무시되지 않는 하위 디렉토리에 감시 등록 후 그 안의 파일 반환"""
+        self._add_watch(dir_path)
+        if Path(dir_path) == self.walker.root:
+            for entry, _, _ in self.walker.iter_entries():
+                if entry.is_dir(follow_symlinks=False):
+                    self._add_watch(entry.path)
+            return []
+
+        # 새로 생긴 하위 트리: 보통 작으므로 항목마다 상위 규칙을 다시 적용
+        files = []
+        stack = [dir_path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                path = Path(entry.path)
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not self.walker.matches(path, is_dir=is_dir):
+                    continue
+                if is_dir:
+                    self._add_watch(entry.path)
+                    stack.append(entry.path)
+                else:
+                    files.append(path)
+        return files
+
+    def poll(self, timeout: float) -> PollResult:
+        """
+        대기 중인 이벤트를 읽어 변경된 경로 반환
+
+        Args:
+            timeout: 이벤트가 없을 때 최대 대기 시간 (초)
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        changed: List[Path] = []
+        extensions = self.walker.extensions
+        offset = 0
+        header = self.EVENT_HEADER
+        while offset + header.size <= len(data):
+            wd, mask, _, length = header.unpack_from(data, offset)
+            name = data[offset + header.size:offset + header.size + length].rstrip(b"\0")
+            offset += header.size + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                return RESCAN
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            dir_path = self._watches.get(wd)
+            if dir_path is None or not name:
+                continue
+            path = Path(dir_path) / os.fsdecode(name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    # 새 디렉토리: 감시를 추가하고, 감시 전에 생긴 파일도 변경으로 보고
+                    if self.walker.matches(path, is_dir=True):
+                        try:
+                            changed.extend(self._watch_tree(str(path)))
+                        except OSError:
+                            return RESCAN
+                else:
+                    # 삭제/이동된 디렉토리는 호출자가 하위 색인 항목으로 확장
+                    self._remove_watches(str(path))
+                    changed.append(path)
+                continue
+            if extensions and not path.name.endswith(extensions):
+                continue
+            changed.append(path)
+        return changed
+
+    def _remove_watches(self, dir_path: str):
+        """이동된 디렉토리의 감시 해제 (감시는 inode를 따라가므로 옛 경로로 보고되는 것 방지)"""
+        prefix = dir_path + os.sep
+        for wd, watched in list(self._watches.items()):
+            if watched == dir_path or watched.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._watches.pop(wd, None)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches = {}
+
+
+def create_backend(walker: FileWalker, backend: str = "auto", poll_interval: float = 1.0):
+    """
+    감시 백엔드 생성
+
+    Args:
+        walker: 감시 대상 파일 탐색기
+        backend: "auto" (inotify 가능하면 inotify), "inotify", "polling"
+        poll_interval: polling 백엔드의 스냅샷 간격 (초)
+    """
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyBackend(walker)
+        except (OSError, AttributeError):
+            if backend == "inotify":
+                raise
+    elif backend != "polling":
+        raise ValueError(f"Unsupported watcher backend: {backend}")
+    return PollingBackend(walker, interval=poll_interval)
+
+
+class IndexWatcher:
+    """
+    파일 변경을 감지해 CodebaseIndexer를 백그라운드에서 증분 갱신
+
+    이벤트는 debounce 시간 동안 모아서 한 번에 처리하며(연속 저장 시 중복 작업 방지),
+    계속 변경이 들어와도 max_delay가 지나면 처리한다. 처리할 때마다 indexer.generation이
+    증가하므로 검색 쪽에서 색인이 최신인지 확인할 수 있다.
+    FileSystemTools.write_file로 쓴 파일은 OS 이벤트를 기다리지 않고 바로 대기열에 들어간다.
+    """
+
+    def __init__(
+        self,
+        indexer,
+        debounce: float = 0.3,
+        max_delay: float = 2.0,
+        backend: str = "auto",
+        poll_interval: float = 1.0,
+        persist_interval: float = 30.0,
+        hook_writes: bool = True
+    ):
+        """
+        Index Watcher 초기화
+
+        Args:
+            indexer: 갱신할 CodebaseIndexer
+            debounce: 마지막 이벤트 후 이 시간(초)만큼 조용하면 처리
+            max_delay: 첫 이벤트 후 최대 대기 시간 (초)
+            backend: 감시 백엔드 ("auto", "inotify", "polling")
+            poll_interval: polling 백엔드의 스냅샷 간격 (초)
+            persist_interval: 증분 갱신 결과를 디스크에 저장하는 최소 간격 (초)
+            hook_writes: FileSystemTools 쓰기 알림을 구독할지 여부
+        """
+        self.indexer = indexer
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.backend_name = backend
+        self.poll_interval = poll_interval
+        self.persist_interval = persist_interval
+        self.hook_writes = hook_writes
+        self.backend = None
+        self.last_error: Optional[BaseException] = None
+        self._root = Path(indexer.project_path).resolve()
+        self._notified: "queue.Queue[Path]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._generation_changed = threading.Condition()
+
+    @property
+    def generation(self) -> int:
+        """현재 색인 generation"""
+        return self.indexer.generation
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "IndexWatcher":
+        """감시 스레드 시작"""
+        if self.running:
+            return self
+        walker = self.indexer.file_walker()
+        # 이벤트 경로(심볼릭 링크가 풀린 절대 경로)와 같은 기준으로 비교
+        walker.root = self._root
+        self.backend = create_backend(walker, self.backend_name, self.poll_interval)
+        self._stop.clear()
+        if self.hook_writes:
+            from ..mcp.tools.file_system import FileSystemTools
+            FileSystemTools.add_write_listener(self.notify)
+        self._thread = threading.Thread(target=self._run, name="index-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """감시 스레드를 멈추고 남은 변경을 저장"""
+        if self.hook_writes:
+            from ..mcp.tools.file_system import FileSystemTools
+            FileSystemTools.remove_write_listener(self.notify)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+    def __enter__(self) -> "IndexWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def notify(self, path: str):
+        """
+        변경된 파일을 직접 알림 (OS 이벤트보다 먼저 반영됨)
+
+        Args:
+            path: 변경된 파일 경로
+        """
+        self._notified.put(Path(path))
+
+    def wait_for_generation(self, generation: int, timeout: Optional[float] = None) -> bool:
+        """
+        색인 generation이 주어진 값 이상이 될 때까지 대기
+
+        Args:
+            generation: 기다릴 generation
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            시간 안에 도달했는지 여부
+        """
+        with self._generation_changed:
+            return self._generation_changed.wait_for(
+                lambda: self.indexer.generation >= generation, timeout=timeout
+            )
+
+    def _run(self):
+        pending: Dict[Path, None] = {}
+        rescan = False
+        first_at = last_at = 0.0
+        dirty = False
+        last_persist = time.monotonic()
+        while not self._stop.is_set():
+            had_work = bool(pending) or rescan
+            result = self.backend.poll(0.05 if had_work else 0.2)
+            events = [] if result is RESCAN else list(result)
+            rescan = rescan or result is RESCAN
+            while True:
+                try:
+                    events.append(self._notified.get_nowait())
+                except queue.Empty:
+                    break
+
+            now = time.monotonic()
+            if events or result is RESCAN:
+                if not had_work:
+                    first_at = now
+                last_at = now
+                for path in events:
+                    pending[path] = None
+
+            if (pending or rescan) and (
+                now - last_at >= self.debounce or now - first_at >= self.max_delay
+            ):
+                self._flush(list(pending), rescan)
+                pending, rescan, dirty = {}, False, True
+
+            if dirty and now - last_persist >= self.persist_interval:
+                self._safe_call(self.indexer.persist)
+                dirty, last_persist = False, now
+
+        if pending or rescan:
+            self._flush(list(pending), rescan)
+            dirty = True
+        if dirty:
+            self._safe_call(self.indexer.persist)
+
+    def _flush(self, paths: List[Path], rescan: bool):
+        """대기 중인 변경을 색인에 반영"""
+        if rescan:
+            self._safe_call(self.indexer.index_project)
+        else:
+            self._safe_call(self.indexer.update_files, self._expand(paths), persist=False)
+        with self._generation_changed:
+            self._generation_changed.notify_all()
+
+    def _expand(self, paths: List[Path]) -> List[Path]:
+        """
+        이벤트 경로를 프로젝트 경로 기준 파일로 변환
+
+        파일이 아닌 경로(삭제/이동된 디렉토리)는 매니페스트에서 그 아래 파일들로 확장한다.
+        """
+        project_path = Path(self.indexer.project_path)
+        extensions = self.indexer.file_walker().extensions
+        files: List[Path] = []
+        prefixes = []
+        for path in paths:
+            if not path.is_absolute():
+                path = self._root / path
+            try:
+                rel_path = str(path.relative_to(self._root))
+            except ValueError:
+                continue
+            local = project_path / rel_path
+            files.append(local)
+            if (extensions and rel_path.endswith(extensions)) or local.is_file():
+                continue
+            prefixes.append(rel_path + os.sep)
+        if prefixes:
+            prefixes = tuple(prefixes)
+            files.extend(
+                project_path / rel for rel in list(self.indexer.manifest.files)
+                if rel.startswith(prefixes)
+            )
+        return files
+
+    def _safe_call(self, func, *args, **kwargs):
+        # 감시 스레드는 오류가 나도 계속 동작해야 하므로 마지막 오류만 기록
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            self.last_error = e
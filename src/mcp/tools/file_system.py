@@ -1,13 +1,127 @@
 """MCP Tools for File System Operations."""
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
 import os
 import glob
+import threading
 from pathlib import Path
 
+from ...utils.async_iter import iterate_in_executor
+from ...utils.grep_engine import iter_grep
+
+
+# 파일 쓰기 후 호출되는 콜백 (예: 색인 파일 감시기의 즉시 갱신)
+_write_listeners: List[Callable[[str], None]] = []
+
+# 블로킹 파일 I/O를 실행하는 스레드 수 (동시에 진행되는 디스크 작업 상한)
+IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+
+def io_pool() -> ThreadPoolExecutor:
+    """파일 I/O 전용 스레드 풀 (처음 사용할 때 생성)"""
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="fs-io")
+        return _io_pool
+
+
+async def run_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    블로킹 파일 I/O를 I/O 스레드 풀에서 실행
+    
+    asyncio에는 네이티브 비동기 파일 API가 없으므로 (aiofiles도 같은 방식) 스레드 풀로
+    옮겨, 큰 파일을 읽는 동안에도 이벤트 루프의 다른 코루틴이 계속 진행되게 한다.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_pool(), functools.partial(func, *args, **kwargs))
+
+
+def _read_text(file_path: str) -> str:
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {file_path}")
+    if not path.is_file():
+        raise ValueError(f"Path is not a file: {file_path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _write_text(file_path: str, content: str) -> Path:
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return path.resolve()
+
+
+def _stat(file_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return {
+        "size": st.st_size,
+        "mtime": st.st_mtime,
+        "is_file": os.path.isfile(file_path),
+        "is_dir": os.path.isdir(file_path)
+    }
+
+
+def _list_files(directory: str, pattern: str, recursive: bool) -> List[str]:
+    path = Path(directory)
+    if not path.exists():
+        raise FileNotFoundError(f"Directory not found: {directory}")
+    if not path.is_dir():
+        raise ValueError(f"Path is not a directory: {directory}")
+    
+    if recursive:
+        pattern = f"**/{pattern}"
+    
+    files = glob.glob(str(path / pattern), recursive=recursive)
+    return [str(Path(f).relative_to(path)) for f in files]
+
+
+def _search_files(directory: str, query: str, file_extensions: Optional[List[str]]) -> List[str]:
+    if not Path(directory).exists():
+        return []
+    
+    # 대소문자 무시 리터럴 검색, 파일마다 첫 매치에서 중단 (바이너리 파일은 건너뜀)
+    matches = iter_grep(directory, query, extensions=file_extensions, files_only=True)
+    return sorted(match["file_path"] for match in matches)
+
+
+def _grep(directory: str, query: str, **options: Any) -> List[Dict[str, Any]]:
+    if not Path(directory).is_dir():
+        raise FileNotFoundError(f"Directory not found: {directory}")
+    return list(iter_grep(directory, query, **options))
+
 
 class FileSystemTools:
     """파일 시스템 조작을 위한 MCP 도구"""
     
+    @staticmethod
+    def add_write_listener(listener: Callable[[str], None]):
+        """
+        write_file/edit_file 성공 후 호출될 콜백 등록
+        
+        Args:
+            listener: 쓰여진 파일 경로를 받는 콜백
+        """
+        if listener not in _write_listeners:
+            _write_listeners.append(listener)
+    
+    @staticmethod
+    def remove_write_listener(listener: Callable[[str], None]):
+        """등록된 쓰기 콜백 제거"""
+        if listener in _write_listeners:
+            _write_listeners.remove(listener)
+    
     @staticmethod
     async def read_file(file_path: str) -> str:
         """
@@ -19,14 +133,37 @@ class FileSystemTools:
         Returns:
             파일 내용 문자열
         """
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        if not path.is_file():
-            raise ValueError(f"Path is not a file: {file_path}")
+        return await run_io(_read_text, file_path)
+    
+    @staticmethod
+    async def read_many(file_paths: List[str], return_exceptions: bool = False) -> List[Any]:
+        """
+        여러 파일을 I/O 스레드 풀에서 동시에 읽기
         
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+        Args:
+            file_paths: 읽을 파일 경로 리스트
+            return_exceptions: True이면 실패한 파일 자리에 예외 객체를 넣고 계속 진행
+            
+        Returns:
+            file_paths 순서의 파일 내용 리스트
+        """
+        return await asyncio.gather(
+            *(run_io(_read_text, file_path) for file_path in file_paths),
+            return_exceptions=return_exceptions
+        )
+    
+    @staticmethod
+    async def stat_many(file_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        여러 경로의 상태를 I/O 스레드 풀에서 동시에 조회
+        
+        Args:
+            file_paths: 경로 리스트
+            
+        Returns:
+            file_paths 순서의 {"size", "mtime", "is_file", "is_dir"} (없는 경로는 None)
+        """
+        return await asyncio.gather(*(run_io(_stat, file_path) for file_path in file_paths))
     
     @staticmethod
     async def write_file(file_path: str, content: str) -> bool:
@@ -40,11 +177,10 @@ class FileSystemTools:
         Returns:
             성공 여부
         """
-        path = Path(file_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
+        written = await run_io(_write_text, file_path, content)
         
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        for listener in list(_write_listeners):
+            listener(str(written))
         return True
     
     @staticmethod
@@ -85,22 +221,12 @@ class FileSystemTools:
         Args:
             directory: 디렉토리 경로
             pattern: 파일 패턴 (glob 형식)
-            recursive: 재귀적 검색 여부
+            recursive: 재귀적 검색 여부 (하위 디렉토리 전체)
             
         Returns:
             파일 경로 리스트
         """
-        path = Path(directory)
-        if not path.exists():
-            raise FileNotFoundError(f"Directory not found: {directory}")
-        if not path.is_dir():
-            raise ValueError(f"Path is not a directory: {directory}")
-        
-        if recursive:
-            pattern = f"**/{pattern}"
-        
-        files = glob.glob(str(path / pattern))
-        return [str(Path(f).relative_to(path)) for f in files]
+        return await run_io(_list_files, directory, pattern, recursive)
     
     @staticmethod
     async def search_files(
@@ -109,7 +235,7 @@ class FileSystemTools:
         file_extensions: Optional[List[str]] = None
     ) -> List[str]:
         """
-        파일 내용 검색
+        파일 내용 검색 (대소문자 무시, 바이너리 파일 제외)
         
         Args:
             directory: 검색할 디렉토리
@@ -117,29 +243,62 @@ class FileSystemTools:
             file_extensions: 검색할 파일 확장자 리스트
             
         Returns:
-            매칭된 파일 경로 리스트
+            매칭된 파일 경로 리스트 (정렬됨)
         """
-        results = []
-        path = Path(directory)
-        
-        if not path.exists():
-            return results
-        
-        extensions = file_extensions or ["*"]
+        return await run_io(_search_files, directory, query, file_extensions)
+    
+    @staticmethod
+    async def grep(
+        directory: str,
+        query: str,
+        regex: bool = False,
+        ignore_case: bool = True,
+        context: int = 0,
+        file_extensions: Optional[List[str]] = None,
+        max_results: Optional[int] = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        파일 내용에서 매치되는 줄 검색 (줄 번호와 앞뒤 문맥 포함)
         
-        for ext in extensions:
-            pattern = f"**/*.{ext}" if ext != "*" else "**/*"
-            files = path.glob(pattern)
+        Args:
+            directory: 검색할 디렉토리
+            query: 검색어 (regex=True이면 정규식)
+            regex: 정규식 검색 여부
+            ignore_case: 대소문자 무시 여부
+            context: 매치 앞뒤로 함께 반환할 줄 수
+            file_extensions: 검색할 파일 확장자 리스트
+            max_results: 최대 매치 수 (도달하면 검색 중단, None이면 전체)
             
-            for file_path in files:
-                if file_path.is_file():
-                    try:
-                        content = await FileSystemTools.read_file(str(file_path))
-                        if query.lower() in content.lower():
-                            results.append(str(file_path))
-                    except (UnicodeDecodeError, PermissionError):
-                        # 바이너리 파일이나 권한 없는 파일은 건너뛰기
-                        continue
+        Returns:
+            {"file_path", "line", "column", "text", "before", "after"} 리스트
+        """
+        return await run_io(
+            _grep, directory, query, regex=regex, ignore_case=ignore_case, context=context,
+            extensions=file_extensions, max_results=max_results
+        )
+    
+    @staticmethod
+    async def grep_stream(
+        directory: str,
+        query: str,
+        regex: bool = False,
+        ignore_case: bool = True,
+        context: int = 0,
+        file_extensions: Optional[List[str]] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        grep과 같은 검색을 매치를 찾는 대로 내보내는 스트리밍 버전
         
-        return results
-
+        필요한 만큼 받았으면 소비를 멈추면 되고, 남은 파일은 스캔하지 않는다.
+        
+        Yields:
+            {"file_path", "line", "column", "text", "before", "after"}
+        """
+        if not Path(directory).is_dir():
+            raise FileNotFoundError(f"Directory not found: {directory}")
+        async for match in iterate_in_executor(lambda: iter_grep(
+            directory, query, regex=regex, ignore_case=ignore_case, context=context,
+            extensions=file_extensions, max_results=max_results
+        ), io_pool()):
+            yield match
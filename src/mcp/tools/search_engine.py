@@ -1,24 +1,82 @@
 """Search Engine Tools."""
-from typing import List, Dict, Any
-from ..indexing.codebase_indexer import CodebaseIndexer
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, Optional, Union
+from concurrent.futures import Executor
+import asyncio
+import functools
+
+from ...indexing.codebase_indexer import CodebaseIndexer
+from ...utils.async_iter import iterate_in_executor
 
 
 class SearchEngineMCP:
     """검색 엔진 MCP 도구"""
     
-    def __init__(self, indexer: Optional[CodebaseIndexer] = None):
+    def __init__(
+        self,
+        indexer: Optional[CodebaseIndexer] = None,
+        executor: Optional[Executor] = None
+    ):
         """
         Search Engine 초기화
         
         Args:
             indexer: CodebaseIndexer 인스턴스
+            executor: 검색/인덱싱을 실행할 executor (None이면 이벤트 루프 기본 스레드 풀)
         """
         self.indexer = indexer
+        self.executor = executor
+    
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        동기 인덱서 호출을 executor에서 실행
+        
+        임베딩 API 왕복과 벡터 스캔(numpy는 GIL을 놓음) 동안 이벤트 루프를 막지 않으므로,
+        여러 세션의 검색이 서로를 기다리지 않고 겹쳐 실행된다.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+    
+    @staticmethod
+    def _filters(
+        path: Optional[str],
+        language: Union[None, str, List[str]],
+        chunk_type: Union[None, str, List[str]],
+        modified_since: Union[None, float, str]
+    ) -> Optional[Dict[str, Any]]:
+        """도구 인자를 인덱서 검색 필터 딕셔너리로 변환 (지정된 것만)"""
+        filters = {
+            "path": path,
+            "language": language,
+            "chunk_type": chunk_type,
+            "modified_since": modified_since
+        }
+        return {name: value for name, value in filters.items() if value not in (None, "", [])} or None
+    
+    def _iterate(self, make_iterator: Callable[[], Iterator[Any]]) -> AsyncIterator[Any]:
+        """동기 이터레이터를 executor 스레드에서 돌리며 항목을 비동기로 전달"""
+        return iterate_in_executor(make_iterator, self.executor)
+    
+    @staticmethod
+    def _scored(doc: Any) -> Dict[str, Any]:
+        """의미 검색 결과 문서를 {"content", "metadata", "score"}로 변환"""
+        metadata = dict(doc.metadata)
+        return {
+            "content": doc.page_content,
+            "metadata": metadata,
+            "score": metadata.pop("score", None)
+        }
     
     async def semantic_search(
         self,
         query: str,
-        k: int = 5
+        k: int = 5,
+        path: Optional[str] = None,
+        language: Union[None, str, List[str]] = None,
+        chunk_type: Union[None, str, List[str]] = None,
+        modified_since: Union[None, float, str] = None,
+        min_score: Optional[float] = None,
+        mmr: bool = False,
+        lambda_mult: float = 0.5
     ) -> List[Dict[str, Any]]:
         """
         의미 검색
@@ -26,6 +84,129 @@ class SearchEngineMCP:
         Args:
             query: 검색 쿼리
             k: 반환할 결과 수
+            path: 경로 접두사 ("services/billing") 또는 글롭 ("src/**/test_*.py")
+            language: 언어 또는 언어 목록 ("python", "typescript", "javascript")
+            chunk_type: 청크 종류 또는 목록 ("FunctionDef", "ClassDef", "method_definition" 등)
+            modified_since: 이 시각 이후 수정된 파일만 (epoch 초 또는 ISO 8601 문자열)
+            min_score: 이 코사인 유사도 미만의 결과는 제외
+            mmr: True이면 MMR로 서로 다른(중복이 적은) 결과를 선택
+            lambda_mult: MMR 관련성 가중치 (1이면 관련성만, 0이면 다양성만)
+            
+        Returns:
+            검색 결과 리스트 (score는 코사인 유사도)
+        """
+        if not self.indexer:
+            return []
+        
+        results = await self._run(
+            self.indexer.semantic_search,
+            query, k=k, filters=self._filters(path, language, chunk_type, modified_since),
+            min_score=min_score, mmr=mmr, lambda_mult=lambda_mult
+        )
+        
+        return [self._scored(r) for r in results]
+    
+    async def semantic_search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        path: Optional[str] = None,
+        language: Union[None, str, List[str]] = None,
+        chunk_type: Union[None, str, List[str]] = None,
+        modified_since: Union[None, float, str] = None,
+        min_score: Optional[float] = None,
+        mmr: bool = False,
+        lambda_mult: float = 0.5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 쿼리 의미 검색 (쿼리 임베딩 한 번, 벡터 스캔 한 번)
+        
+        Args:
+            queries: 검색 쿼리 리스트
+            k: 쿼리당 반환할 결과 수
+            path: 경로 접두사 또는 글롭 (semantic_search와 같음)
+            language: 언어 또는 언어 목록
+            chunk_type: 청크 종류 또는 목록
+            modified_since: 이 시각 이후 수정된 파일만
+            min_score: 최소 코사인 유사도
+            mmr: MMR 재순위 여부
+            lambda_mult: MMR 관련성 가중치
+            
+        Returns:
+            쿼리 순서의 검색 결과 리스트
+        """
+        if not self.indexer:
+            return [[] for _ in queries]
+        
+        result_lists = await self._run(
+            self.indexer.semantic_search_many,
+            queries, k=k, filters=self._filters(path, language, chunk_type, modified_since),
+            min_score=min_score, mmr=mmr, lambda_mult=lambda_mult
+        )
+        
+        return [[self._scored(r) for r in results] for results in result_lists]
+    
+    async def search_stream(
+        self,
+        query: str,
+        k: int = 5,
+        path: Optional[str] = None,
+        language: Union[None, str, List[str]] = None,
+        chunk_type: Union[None, str, List[str]] = None,
+        modified_since: Union[None, float, str] = None,
+        min_score: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        검색 결과를 준비되는 대로 내보내는 스트리밍 검색 (키워드 결과 먼저, 이어서 의미 검색)
+        
+        필요한 만큼 받았으면 소비를 멈추면 되고, 남은 벡터 스캔도 실행되지 않는다.
+        
+        Args:
+            query: 검색 쿼리
+            k: 각 검색에서 가져올 결과 수
+            path: 경로 접두사 또는 글롭 (semantic_search와 같음)
+            language: 언어 또는 언어 목록
+            chunk_type: 청크 종류 또는 목록
+            modified_since: 이 시각 이후 수정된 파일만
+            min_score: 의미 검색 결과의 최소 코사인 유사도
+            
+        Yields:
+            {"type": "result", "source": "keyword" | "semantic", "content", "metadata", "score"},
+            마지막으로 {"type": "complete", "ids", "results", "elapsed_ms"}
+        """
+        if not self.indexer:
+            yield {"type": "complete", "ids": [], "results": 0, "elapsed_ms": 0.0}
+            return
+        
+        filters = self._filters(path, language, chunk_type, modified_since)
+        async for item in self._iterate(lambda: self.indexer.stream_search(
+            query, k=k, filters=filters, min_score=min_score
+        )):
+            if item["type"] == "result" and item["source"] == "semantic":
+                metadata = dict(item["metadata"])
+                metadata.pop("score", None)
+                item = {**item, "metadata": metadata}
+            yield item
+    
+    async def keyword_search(
+        self,
+        query: str,
+        k: int = 5,
+        path: Optional[str] = None,
+        language: Union[None, str, List[str]] = None,
+        chunk_type: Union[None, str, List[str]] = None,
+        modified_since: Union[None, float, str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 키워드 검색 (정확한 식별자 검색)
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            path: 경로 접두사 ("services/billing") 또는 글롭 ("src/**/test_*.py")
+            language: 언어 또는 언어 목록 ("python", "typescript", "javascript")
+            chunk_type: 청크 종류 또는 목록 ("FunctionDef", "ClassDef", "method_definition" 등)
+            modified_since: 이 시각 이후 수정된 파일만 (epoch 초 또는 ISO 8601 문자열)
             
         Returns:
             검색 결과 리스트
@@ -33,14 +214,152 @@ class SearchEngineMCP:
         if not self.indexer:
             return []
         
-        results = self.indexer.semantic_search(query, k=k)
+        return [{
+            "content": r["content"],
+            "metadata": r["metadata"],
+            "score": r["score"]
+        } for r in await self._run(
+            self.indexer.keyword_search,
+            query, k=k, filters=self._filters(path, language, chunk_type, modified_since)
+        )]
+    
+    async def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        path: Optional[str] = None,
+        language: Union[None, str, List[str]] = None,
+        chunk_type: Union[None, str, List[str]] = None,
+        modified_since: Union[None, float, str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        키워드 + 의미 하이브리드 검색 (RRF 결합)
+        
+        Args:
+            query: 검색 쿼리
+            k: 반환할 결과 수
+            path: 경로 접두사 ("services/billing") 또는 글롭 ("src/**/test_*.py")
+            language: 언어 또는 언어 목록 ("python", "typescript", "javascript")
+            chunk_type: 청크 종류 또는 목록 ("FunctionDef", "ClassDef", "method_definition" 등)
+            modified_since: 이 시각 이후 수정된 파일만 (epoch 초 또는 ISO 8601 문자열)
+            
+        Returns:
+            검색 결과 리스트
+        """
+        if not self.indexer:
+            return []
         
         return [{
-            "content": r.page_content,
-            "metadata": r.metadata,
-            "score": getattr(r, 'score', 0.0)
-        } for r in results]
+            "content": r["content"],
+            "metadata": r["metadata"],
+            "score": r["score"]
+        } for r in await self._run(
+            self.indexer.hybrid_search,
+            query, k=k, filters=self._filters(path, language, chunk_type, modified_since)
+        )]
     
+    async def cache_stats(self) -> Dict[str, Any]:
+        """
+        검색 결과/쿼리 임베딩/필터 후보 캐시 통계 (적중률, 절약 시간)
+
+        Returns:
+            {"generation", "results", "embeddings", "filters"} 통계
+        """
+        if not self.indexer:
+            return {}
+
+        return self.indexer.query_cache.stats()
+
+    async def find_definition(
+        self,
+        name: str,
+        kind: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        심볼 정의 위치 조회 (go-to-definition)
+        
+        Args:
+            name: 심볼 이름 ("func", "Class", "Class.method")
+            kind: 종류 필터 ("function", "method", "class", "interface", "enum")
+            
+        Returns:
+            정의 위치 리스트
+        """
+        if not self.indexer:
+            return []
+        
+        return self.indexer.symbol_index.find_definition(name, kind=kind)
+    
+    async def list_class_methods(self, class_name: str) -> List[Dict[str, Any]]:
+        """
+        클래스의 메서드 목록
+        
+        Args:
+            class_name: 클래스 이름
+            
+        Returns:
+            메서드 정의 위치 리스트
+        """
+        if not self.indexer:
+            return []
+        
+        return self.indexer.symbol_index.list_methods(class_name)
+
+    async def find_dependents(
+        self,
+        target: str,
+        transitive: bool = False
+    ) -> List[str]:
+        """
+        모듈을 import하는 파일 목록 (reverse dependency)
+
+        Args:
+            target: 파일 경로 또는 모듈 이름 ("src/utils/x.py", "src.utils.x")
+            transitive: True이면 간접적으로 import하는 파일까지 포함
+
+        Returns:
+            파일 상대 경로 리스트
+        """
+        if not self.indexer:
+            return []
+
+        return self.indexer.import_graph.dependents(target, transitive=transitive)
+
+    async def find_dependencies(
+        self,
+        target: str,
+        transitive: bool = False
+    ) -> List[str]:
+        """
+        파일이 import하는 프로젝트 파일 목록
+
+        Args:
+            target: 파일 경로 또는 모듈 이름
+            transitive: True이면 간접 의존성까지 포함
+
+        Returns:
+            파일 상대 경로 리스트
+        """
+        if not self.indexer:
+            return []
+
+        return self.indexer.import_graph.dependencies(target, transitive=transitive)
+
+    async def affected_tests(self, paths: List[str]) -> List[str]:
+        """
+        변경된 파일들의 영향을 받는 테스트 파일 목록
+
+        Args:
+            paths: 변경된 파일 경로 리스트
+
+        Returns:
+            테스트 파일 상대 경로 리스트
+        """
+        if not self.indexer:
+            return []
+
+        return self.indexer.import_graph.affected_tests(paths)
+
     async def index_codebase(self, project_path: str) -> bool:
         """
         코드베이스 인덱싱
@@ -55,7 +374,7 @@ class SearchEngineMCP:
             self.indexer = CodebaseIndexer(project_path)
         
         try:
-            self.indexer.index_project()
+            await self._run(self.indexer.index_project)
             return True
         except Exception:
             return False
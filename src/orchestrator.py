@@ -5,6 +5,7 @@ from langgraph.graph import StateGraph, END
 from .mcp.client import CursorMCPClient
 from .context.context_manager import ContextManager
 from .agents.react_agent import ReActAgent
+from .indexing.codebase_indexer import CodebaseIndexer
 from .state.graph_state import AgentState
 
 
@@ -16,20 +17,27 @@ class CursorAgentOrchestrator:
     - 최선의 결과물 유지
     """
     
-    def __init__(self, project_root: Optional[str] = None, max_iterations: int = 5):
+    def __init__(
+        self,
+        project_root: Optional[str] = None,
+        max_iterations: int = 5,
+        indexer: Optional[CodebaseIndexer] = None
+    ):
         """
         Orchestrator 초기화
         
         Args:
             project_root: 프로젝트 루트 디렉토리
             max_iterations: 최대 반복 횟수
+            indexer: 코드베이스 인덱서 (에이전트 도구가 심볼 색인/import 그래프를 공유)
         """
         self.context_manager = ContextManager(project_root=project_root)
         self.mcp_client = CursorMCPClient()
         self.react_agent = ReActAgent(
             mcp_client=self.mcp_client,
             context_manager=self.context_manager,
-            max_iterations=max_iterations
+            max_iterations=max_iterations,
+            indexer=indexer
         )
         self.graph = self._build_graph()
     
@@ -0,0 +1,80 @@
+"""Bridge synchronous iterators into asyncio."""
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+from concurrent.futures import Executor
+import asyncio
+import threading
+
+
+async def iterate_in_executor(
+    make_iterator: Callable[[], Iterator[Any]],
+    executor: Optional[Executor] = None,
+    maxsize: int = 1
+) -> AsyncIterator[Any]:
+    """
+    동기 이터레이터를 executor 스레드에서 돌리며 항목을 비동기로 전달
+    
+    생산 스레드는 항목을 만들기 전에 크레딧(threading.Semaphore)을 받아야 하고, 소비자는
+    다음 항목을 요청할 때 크레딧을 돌려준다. 그래서 소비자가 아직 요청하지 않은 항목은
+    최대 maxsize개만 만들어지고, 소비자가 느리면 생산도 기다린다. 소비자가 도중에 멈추면
+    (break, aclose) 생산 스레드는 다음 항목을 만들지 않고 이터레이터를 닫는다.
+    생산 중 발생한 예외는 소비자 쪽에서 다시 발생한다.
+    
+    Args:
+        make_iterator: executor 스레드에서 호출되어 이터레이터를 만드는 함수
+        executor: 실행할 executor (None이면 이벤트 루프 기본 스레드 풀)
+        maxsize: 소비자보다 앞서 만들어 둘 수 있는 항목 수
+        
+    Yields:
+        이터레이터의 항목
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    credits = threading.Semaphore(maxsize)
+    stop = threading.Event()
+    done = object()
+    
+    def put(item: Any):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘
+            stop.set()
+    
+    def take_credit() -> bool:
+        # 소비자가 멈추면 빠져나올 수 있도록 타임아웃 반복
+        while not stop.is_set():
+            if credits.acquire(timeout=0.1):
+                return not stop.is_set()
+        return False
+    
+    def produce():
+        iterator = None
+        try:
+            iterator = iter(make_iterator())
+            while take_credit():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                put(item)
+        except Exception as e:
+            put(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            put(done)
+    
+    loop.run_in_executor(executor, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+            credits.release()
+    finally:
+        stop.set()
+        credits.release()
@@ -0,0 +1,292 @@
+"""Single-pass, ignore-aware file tree walker."""
+from typing import List, Optional, Iterable, Iterator, Tuple
+from pathlib import Path
+import os
+import re
+
+
+DEFAULT_EXCLUDES = (
+    ".git", ".hg", ".svn",
+    "node_modules", "bower_components",
+    ".venv", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+    ".next", ".nuxt",
+    ".cursor_index", ".idea", ".vscode",
+    # 소스 패키지 이름과 겹치기 쉬운 이름은 루트에서만 제외 (그 밖은 .gitignore에 맡김)
+    "/venv/", "/env/", "/build/", "/dist/", "/target/",
+)
+
+# 이 파일이 있는 디렉토리는 이름과 무관하게 가상 환경으로 보고 제외
+VIRTUALENV_MARKER = "pyvenv.cfg"
+
+DEFAULT_IGNORE_FILES = (".gitignore", ".cursorignore")
+
+
+def _translate(pattern: str) -> str:
+    """gitignore 글롭 패턴을 정규식으로 변환"""
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**':
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = pattern.find(']', i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+class IgnoreRule:
+    """gitignore 한 줄에 해당하는 규칙"""
+    __slots__ = ("regex", "negate", "dir_only", "basename_only")
+
+    def __init__(self, pattern: str):
+        self.negate = pattern.startswith('!')
+        if self.negate:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        # 슬래시가 없으면 모든 깊이의 이름과 매칭, 있으면 ignore 파일 위치 기준
+        self.basename_only = '/' not in pattern
+        pattern = pattern.lstrip('/')
+        self.regex = re.compile(_translate(pattern) + '$')
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        target = name if self.basename_only else rel_path
+        return self.regex.match(target) is not None
+
+
+def parse_ignore_lines(lines: Iterable[str]) -> List[IgnoreRule]:
+    """
+    gitignore 형식의 줄들을 규칙으로 변환
+
+    Args:
+        lines: ignore 파일의 줄
+
+    Returns:
+        규칙 리스트 (파일 내 순서 유지)
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip('\n').rstrip('\r')
+        if not line.strip() or line.startswith('#'):
+            continue
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        try:
+            rules.append(IgnoreRule(line))
+        except re.error:
+            continue
+    return rules
+
+
+# (규칙이 정의된 디렉토리의 루트 기준 상대 경로, 규칙 리스트)
+RuleSet = Tuple[str, List[IgnoreRule]]
+
+
+def is_ignored(rule_sets: Iterable[RuleSet], rel_path: str, name: str, is_dir: bool) -> bool:
+    """마지막으로 매칭된 규칙으로 무시 여부 결정 (! 규칙은 다시 포함)"""
+    ignored = False
+    for base, rules in rule_sets:
+        if base:
+            if not rel_path.startswith(base + '/'):
+                continue
+            local = rel_path[len(base) + 1:]
+        else:
+            local = rel_path
+        for rule in rules:
+            if rule.matches(local, name, is_dir):
+                ignored = not rule.negate
+    return ignored
+
+
+class FileWalker:
+    """
+    os.scandir 기반 단일 순회 파일 탐색기
+
+    .gitignore/.cursorignore 규칙과 제외 목록을 적용하며,
+    무시되는 디렉토리와 가상 환경(pyvenv.cfg가 있는 디렉토리)은 내려가기 전에 잘라낸다(pruning).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        extensions: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+        ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES,
+        include_hidden: bool = True,
+        max_depth: Optional[int] = None,
+        follow_symlinks: bool = False
+    ):
+        """
+        File Walker 초기화
+
+        Args:
+            root: 탐색 루트 디렉토리
+            extensions: 포함할 확장자 (".py" 또는 "py" 형식, None이면 전체)
+            exclude: 항상 제외할 디렉토리/파일 이름 또는 gitignore 패턴 (None이면 DEFAULT_EXCLUDES)
+            ignore_files: 읽어들일 ignore 파일 이름
+            include_hidden: False이면 '.'으로 시작하는 항목 제외
+            max_depth: 최대 탐색 깊이 (루트의 자식이 1)
+            follow_symlinks: 심볼릭 링크 디렉토리를 따라갈지 여부
+        """
+        self.root = Path(root)
+        self.extensions = None
+        if extensions is not None:
+            self.extensions = tuple(
+                ext if ext.startswith('.') else f'.{ext}'
+                for ext in extensions if ext and ext != '*'
+            ) or None
+        excludes = DEFAULT_EXCLUDES if exclude is None else tuple(exclude)
+        self._exclude_names = frozenset(e for e in excludes if not any(c in e for c in '*?[/'))
+        self._exclude_rules = parse_ignore_lines(
+            e for e in excludes if e not in self._exclude_names
+        )
+        self.ignore_files = tuple(ignore_files)
+        self.include_hidden = include_hidden
+        self.max_depth = max_depth
+        self.follow_symlinks = follow_symlinks
+
+    def _load_rules(self, dir_path: str, rel_dir: str) -> Optional[RuleSet]:
+        rules: List[IgnoreRule] = []
+        for ignore_name in self.ignore_files:
+            try:
+                with open(os.path.join(dir_path, ignore_name), 'r', encoding='utf-8') as f:
+                    rules.extend(parse_ignore_lines(f))
+            except (OSError, UnicodeDecodeError):
+                continue
+        return (rel_dir, rules) if rules else None
+
+    @staticmethod
+    def _is_virtualenv(dir_path: str) -> bool:
+        return os.path.isfile(os.path.join(dir_path, VIRTUALENV_MARKER))
+
+    def iter_entries(self) -> Iterator[Tuple[os.DirEntry, str, int]]:
+        """
+        무시되지 않는 모든 항목 순회 (디렉토리 포함, 확장자 필터 미적용)
+
+        Yields:
+            (DirEntry, 루트 기준 상대 경로('/' 구분), 깊이)
+        """
+        base_rules: List[RuleSet] = [("", self._exclude_rules)] if self._exclude_rules else []
+        stack = [(str(self.root), "", 0, base_rules)]
+        while stack:
+            dir_path, rel_dir, depth, rule_sets = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            names = {entry.name for entry in entries}
+            if any(name in names for name in self.ignore_files):
+                local = self._load_rules(dir_path, rel_dir)
+                if local:
+                    rule_sets = rule_sets + [local]
+
+            subdirs = []
+            for entry in entries:
+                name = entry.name
+                if name in self._exclude_names:
+                    continue
+                if not self.include_hidden and name.startswith('.'):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=self.follow_symlinks)
+                except OSError:
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if rule_sets and is_ignored(rule_sets, rel_path, name, is_dir):
+                    continue
+                if is_dir and self._is_virtualenv(entry.path):
+                    continue
+                yield entry, rel_path, depth + 1
+                if is_dir and (self.max_depth is None or depth + 1 < self.max_depth):
+                    subdirs.append((entry.path, rel_path, depth + 1, rule_sets))
+            # 이름 순으로 방문하도록 역순으로 스택에 추가
+            stack.extend(reversed(subdirs))
+
+    def iter_files(self) -> Iterator[Path]:
+        """
+        확장자 조건에 맞는 파일 순회
+
+        Yields:
+            파일 경로
+        """
+        extensions = self.extensions
+        for entry, _, _ in self.iter_entries():
+            if extensions and not entry.name.endswith(extensions):
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=self.follow_symlinks):
+                    continue
+            except OSError:
+                continue
+            yield Path(entry.path)
+
+    def matches(self, path: Path, is_dir: bool = False) -> bool:
+        """
+        단일 경로가 순회 결과에 포함될 파일인지 판정 (파일 감시 이벤트 필터용)
+
+        루트부터 상위 디렉토리의 제외 목록과 ignore 규칙을 차례로 적용한다.
+
+        Args:
+            path: 검사할 경로 (존재하지 않는 삭제된 파일도 가능)
+            is_dir: 디렉토리 여부 (True이면 확장자 조건 없이 디렉토리 규칙 적용)
+
+        Returns:
+            포함 여부
+        """
+        try:
+            parts = Path(path).relative_to(self.root).parts
+        except ValueError:
+            return False
+        if not parts:
+            return False
+        if not is_dir and self.extensions and not parts[-1].endswith(self.extensions):
+            return False
+        if self.max_depth is not None and len(parts) > self.max_depth:
+            return False
+
+        rule_sets: List[RuleSet] = [("", self._exclude_rules)] if self._exclude_rules else []
+        dir_path = str(self.root)
+        for i, name in enumerate(parts):
+            if name in self._exclude_names:
+                return False
+            if not self.include_hidden and name.startswith('.'):
+                return False
+            local = self._load_rules(dir_path, "/".join(parts[:i]))
+            if local:
+                rule_sets = rule_sets + [local]
+            part_is_dir = is_dir or i < len(parts) - 1
+            if rule_sets and is_ignored(rule_sets, "/".join(parts[:i + 1]), name, part_is_dir):
+                return False
+            dir_path = os.path.join(dir_path, name)
+            if part_is_dir and self._is_virtualenv(dir_path):
+                return False
+        return True
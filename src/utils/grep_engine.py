@@ -0,0 +1,333 @@
+"""Parallel, streaming content search (grep) over an ignore-aware file walk."""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Union
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from pathlib import Path
+import mmap
+import multiprocessing
+import os
+import re
+
+from .file_walker import FileWalker
+
+
+# 바이너리 판정에 읽는 앞부분 크기 (NUL 바이트가 있으면 바이너리로 보고 건너뜀)
+SNIFF_BYTES = 8192
+# 이보다 큰 파일은 한 번에 읽지 않고 mmap으로 매핑하여 스캔
+MMAP_MIN_BYTES = 64 * 1024
+# 파일이 이보다 적으면 프로세스 풀을 띄우지 않고 현재 프로세스에서 스캔
+PARALLEL_MIN_FILES = 256
+# 프로세스 풀 작업 하나에 묶는 파일 수
+FILES_PER_TASK = 128
+# 검색은 I/O 스레드 풀에서 실행되므로, 다른 스레드가 잡은 락까지 복사되는 fork 대신 사용
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# 대소문자 무시 리터럴 검색에서 한 번에 소문자로 접는 구간 크기
+FOLD_WINDOW_BYTES = 1 << 20
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class FoldedLiteral:
+    """
+    ASCII 리터럴의 대소문자 무시 검색
+
+    바이트 정규식의 IGNORECASE는 리터럴 접두사 최적화를 쓰지 못해 bytes.find보다 몇 배
+    느리다. 대신 버퍼를 FOLD_WINDOW_BYTES 구간씩 bytes.lower()로 접어 find로 찾는다.
+    bytes.lower()는 ASCII만 바꾸므로 위치가 원본과 같고, 복사는 구간 크기로 제한된다.
+    """
+    __slots__ = ("needle",)
+
+    def __init__(self, needle: bytes):
+        self.needle = needle.lower()
+
+    def __getstate__(self):
+        return self.needle
+
+    def __setstate__(self, state):
+        self.needle = state
+
+    def iter_starts(self, data: Buffer) -> Iterator[int]:
+        """매치 시작 위치를 차례로 반환 (구간 경계에 걸친 매치는 겹침 구간으로 찾음)"""
+        needle, size = self.needle, len(data)
+        overlap = len(needle) - 1
+        start = 0
+        while start < size:
+            stop = min(size, start + FOLD_WINDOW_BYTES)
+            window = data[start:stop + overlap].lower()
+            found = window.find(needle)
+            while found != -1 and start + found < stop:
+                yield start + found
+                found = window.find(needle, found + 1)
+            start = stop
+
+
+Matcher = Union[Pattern[bytes], FoldedLiteral]
+
+
+def compile_pattern(query: str, regex: bool = False, ignore_case: bool = True) -> Matcher:
+    """
+    검색어를 바이트 매처로 컴파일
+
+    파일 내용을 디코딩하지 않고 원본 바이트(mmap)에 바로 적용한다. ASCII 리터럴의 대소문자
+    무시 검색은 FoldedLiteral을 쓴다. 바이트 패턴의 re.IGNORECASE는 ASCII만 접으므로,
+    리터럴 검색어의 비 ASCII 문자는 대소문자 변형의 UTF-8 바이트 대안으로 펼친다.
+
+    Args:
+        query: 검색어
+        regex: True이면 정규식, False이면 리터럴
+        ignore_case: 대소문자 무시 여부
+
+    Returns:
+        바이트 정규식 또는 FoldedLiteral
+    """
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    if regex:
+        return re.compile(query.encode("utf-8"), flags)
+    if not ignore_case:
+        return re.compile(re.escape(query.encode("utf-8")), flags)
+    if query.isascii():
+        return FoldedLiteral(query.encode("utf-8"))
+    parts = []
+    for char in query:
+        variants = sorted({char, char.lower(), char.upper()})
+        if char.isascii() or len(variants) == 1:
+            parts.append(re.escape(char.encode("utf-8")))
+        else:
+            parts.append(b"(?:" + b"|".join(re.escape(v.encode("utf-8")) for v in variants) + b")")
+    return re.compile(b"".join(parts), flags)
+
+
+def iter_match_starts(data: Buffer, matcher: Matcher) -> Iterator[int]:
+    """버퍼에서 매치 시작 위치를 차례로 반환"""
+    if isinstance(matcher, FoldedLiteral):
+        return matcher.iter_starts(data)
+    return (match.start() for match in matcher.finditer(data))
+
+
+def is_binary(data: Buffer) -> bool:
+    """앞부분 SNIFF_BYTES 안에 NUL 바이트가 있으면 바이너리 (복사 없이 검사)"""
+    return data.find(b"\0", 0, SNIFF_BYTES) != -1
+
+
+def _decode_line(data: Buffer, start: int, end: int) -> str:
+    return data[start:end].decode("utf-8", "replace").rstrip("\r")
+
+
+def _count_newlines(data: Buffer, start: int, end: int) -> int:
+    if isinstance(data, bytes):
+        return data.count(b"\n", start, end)
+    # mmap에는 count가 없으므로 아직 세지 않은 구간만 잘라서 센다 (각 바이트는 한 번만 복사)
+    return data[start:end].count(b"\n")
+
+
+def _context_before(data: Buffer, line_start: int, lines: int) -> List[str]:
+    before = []
+    end = line_start - 1
+    while len(before) < lines and end >= 0:
+        start = data.rfind(b"\n", 0, end) + 1
+        before.append(_decode_line(data, start, end))
+        end = start - 1
+    return before[::-1]
+
+
+def _context_after(data: Buffer, line_end: int, lines: int) -> List[str]:
+    after = []
+    start = line_end + 1
+    while len(after) < lines and start < len(data):
+        end = data.find(b"\n", start)
+        end = len(data) if end == -1 else end
+        after.append(_decode_line(data, start, end))
+        start = end + 1
+    return after
+
+
+def scan_buffer(
+    data: Buffer,
+    matcher: Matcher,
+    context: int = 0,
+    max_matches: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    버퍼에서 패턴이 나타나는 줄 찾기 (줄마다 첫 매치 하나)
+
+    Args:
+        data: 파일 내용 (bytes 또는 mmap)
+        matcher: compile_pattern 결과
+        context: 앞뒤로 함께 반환할 줄 수
+        max_matches: 이 수만큼 찾으면 중단
+
+    Returns:
+        {"line", "column", "text", "before", "after"} 리스트 (줄/열은 1부터)
+    """
+    matches: List[Dict[str, Any]] = []
+    if max_matches is not None and max_matches <= 0:
+        return matches
+    line_no, counted, next_line = 1, 0, 0
+    for start in iter_match_starts(data, matcher):
+        if start < next_line:
+            # 이미 보고한 줄의 두 번째 이후 매치
+            continue
+        line_start = data.rfind(b"\n", 0, start) + 1
+        line_end = data.find(b"\n", start)
+        line_end = len(data) if line_end == -1 else line_end
+        line_no += _count_newlines(data, counted, line_start)
+        counted = line_start
+        matches.append({
+            "line": line_no,
+            "column": len(data[line_start:start].decode("utf-8", "replace")) + 1,
+            "text": _decode_line(data, line_start, line_end),
+            "before": _context_before(data, line_start, context) if context else [],
+            "after": _context_after(data, line_end, context) if context else []
+        })
+        if max_matches is not None and len(matches) >= max_matches:
+            break
+        next_line = line_end + 1
+    return matches
+
+
+def grep_file(
+    file_path: Union[str, Path],
+    matcher: Matcher,
+    context: int = 0,
+    max_matches: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    파일 하나 검색 (바이너리/읽을 수 없는 파일은 빈 결과)
+
+    작은 파일은 한 번에 읽고, MMAP_MIN_BYTES 이상은 mmap으로 매핑하여 복사 없이 스캔한다.
+
+    Args:
+        file_path: 파일 경로
+        matcher: compile_pattern 결과
+        context: 앞뒤로 함께 반환할 줄 수
+        max_matches: 파일당 최대 매치 수
+
+    Returns:
+        "file_path"가 추가된 scan_buffer 결과
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return []
+            if size < MMAP_MIN_BYTES:
+                data = f.read()
+                matches = [] if is_binary(data) else scan_buffer(data, matcher, context, max_matches)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    matches = [] if is_binary(mm) else scan_buffer(mm, matcher, context, max_matches)
+    except (OSError, ValueError):
+        return []
+    path = str(file_path)
+    for match in matches:
+        match["file_path"] = path
+    return matches
+
+
+def _grep_files_worker(
+    file_paths: List[str],
+    matcher: Matcher,
+    context: int,
+    max_matches: Optional[int]
+) -> List[Dict[str, Any]]:
+    """프로세스 풀 작업 단위: 파일 묶음 검색"""
+    matches = []
+    for file_path in file_paths:
+        matches.extend(grep_file(file_path, matcher, context, max_matches))
+    return matches
+
+
+def iter_grep(
+    root: Union[str, Path],
+    query: str,
+    regex: bool = False,
+    ignore_case: bool = True,
+    context: int = 0,
+    extensions: Optional[Iterable[str]] = None,
+    max_results: Optional[int] = None,
+    files_only: bool = False,
+    workers: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    트리를 한 번 순회하며 파일 내용을 검색하고, 찾는 대로 매치를 반환
+
+    FileWalker의 무시 규칙(.gitignore, node_modules 등)을 따르며, 파일이 충분히 많으면
+    프로세스 풀에 파일 묶음을 나눠 병렬로 스캔한다. 동시에 제출되는 작업 수는 워커 수의
+    두 배로 제한된다. max_results에 도달하거나 소비자가 멈추면 순회와 남은 작업을 중단한다.
+    병렬 스캔에서는 파일 순서가 완료 순서이다.
+
+    Args:
+        root: 검색할 디렉토리
+        query: 검색어
+        regex: True이면 정규식, False이면 리터럴
+        ignore_case: 대소문자 무시 여부
+        context: 매치 앞뒤로 함께 반환할 줄 수
+        extensions: 검색할 확장자 (None이면 전체)
+        max_results: 최대 매치 수 (files_only이면 파일 수)
+        files_only: True이면 파일마다 첫 매치만 찾음
+        workers: 스캔 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스)
+
+    Yields:
+        {"file_path", "line", "column", "text", "before", "after"}
+    """
+    matcher = compile_pattern(query, regex=regex, ignore_case=ignore_case)
+    per_file = 1 if files_only else max_results
+    workers = workers or os.cpu_count() or 1
+    files = (str(path) for path in FileWalker(str(root), extensions=extensions).iter_files())
+    remaining = max_results
+
+    def emit(matches: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal remaining
+        for match in matches:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            yield match
+
+    # 파일이 적으면 프로세스 풀 시작 비용이 스캔보다 크므로 현재 프로세스에서 처리
+    first = list(islice(files, PARALLEL_MIN_FILES))
+    if workers <= 1 or len(first) < PARALLEL_MIN_FILES:
+        for file_path in _chain(first, files):
+            yield from emit(grep_file(file_path, matcher, context, per_file))
+            if remaining is not None and remaining <= 0:
+                return
+        return
+
+    tasks = _batches(_chain(first, files), FILES_PER_TASK)
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT)
+    try:
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(_grep_files_worker, task, matcher, context, per_file))
+            if len(pending) < workers * 2:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from emit(future.result())
+            if remaining is not None and remaining <= 0:
+                return
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from emit(future.result())
+            if remaining is not None and remaining <= 0:
+                return
+    finally:
+        # 조기 종료 시 대기 중인 작업은 취소하고 실행 중인 작업만 기다림
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _chain(first: List[str], rest: Iterator[str]) -> Iterator[str]:
+    yield from first
+    yield from rest
+
+
+def _batches(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,28 @@
+"""Shared fixtures for the test suite."""
+from pathlib import Path
+from typing import Dict
+import pytest
+from src.indexing.codebase_indexer import CodebaseIndexer
+from src.indexing.embeddings import LocalHashEmbeddings
+
+
+@pytest.fixture
+def indexed_project():
+    """파일을 기록하고 로컬 임베딩 + mmap 스토어로 인덱싱한 CodebaseIndexer를 만드는 팩토리"""
+    def factory(root: Path, files: Dict[str, str], **kwargs) -> CodebaseIndexer:
+        for rel_path, content in files.items():
+            path = root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        options = {
+            "embeddings": LocalHashEmbeddings(),
+            "use_embedding_cache": False,
+            "vector_backend": "mmap",
+            "workers": 1,
+        }
+        options.update(kwargs)
+        indexer = CodebaseIndexer(str(root), **options)
+        indexer.index_project()
+        return indexer
+
+    return factory
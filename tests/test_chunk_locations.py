@@ -0,0 +1,82 @@
+"""Tests for Chunk Locations."""
+from src.indexing.chunk_locations import ChunkLocations, content_id
+from src.indexing.search_filters import SearchFilters
+
+
+def _metadata(content_id_, file_path, lines, symbol="f"):
+    return {
+        "chunk_id": content_id_,
+        "file_path": file_path,
+        "chunk_type": "FunctionDef",
+        "lines": lines,
+        "symbol": symbol,
+        "parent": "",
+        "language": "python"
+    }
+
+
+def test_content_id_normalization():
+    """줄바꿈, 줄 끝 공백, 들여쓰기 깊이가 달라도 같은 ID"""
+    top = "def f(x):\n    if x:\n        return 1\n"
+    nested = "def f(x):\r\n        if x:   \r\n            return 1"
+    assert content_id(top, "python") == content_id(nested, "python")
+    assert content_id(top, "python") != content_id(top, "javascript")
+    assert content_id(top, "python") != content_id(top.replace("1", "2"), "python")
+
+
+def test_orphans_survive_reopen(tmp_path):
+    """위치를 잃은 내용 ID가 커밋 후 다시 열어도 정리 대상으로 남는지 테스트"""
+    path = tmp_path / "locations.sqlite3"
+    locations = ChunkLocations(path)
+    locations.add([
+        _metadata("shared", "a.py", "1-3"),
+        _metadata("shared", "b.py", "5-7"),
+        _metadata("only_a", "a.py", "9-10", symbol="g"),
+    ])
+    locations.save()
+    assert locations.num_contents() == 2
+
+    locations.remove_files(["a.py"])
+    locations.save()
+    locations.close()
+
+    reopened = ChunkLocations(path)
+    assert reopened.is_stored("only_a")
+    assert reopened.locations_for(["shared"])["shared"] == [{
+        "file_path": "b.py", "chunk_type": "FunctionDef", "lines": "5-7",
+        "symbol": "f", "parent": "", "language": "python"
+    }]
+    assert reopened.take_orphans() == ["only_a"]
+    assert not reopened.is_stored("only_a")
+    assert reopened.take_orphans() == []
+
+
+def test_content_ids_matching_filters(tmp_path):
+    """경로 접두사/글롭, 언어, 청크 종류 필터 후보 테스트"""
+    locations = ChunkLocations(tmp_path / "locations.sqlite3")
+    locations.add([
+        _metadata("billing", "services/billing/invoice.py", "1-3"),
+        {**_metadata("billing_ts", "services/billing/client.ts", "1-3"), "language": "typescript"},
+        _metadata("old", "services/billing_old/invoice.py", "1-3"),
+        {**_metadata("klass", "services/auth/session.py", "1-9"), "chunk_type": "ClassDef"},
+        _metadata("billing", "services/auth/copy.py", "4-6"),
+    ])
+
+    assert locations.content_ids_matching(SearchFilters(path="services/billing")) == {
+        "billing", "billing_ts"
+    }
+    assert locations.content_ids_matching(SearchFilters(path="services/billing/invoice.py")) == {
+        "billing"
+    }
+    assert locations.content_ids_matching(SearchFilters(path="services/*/invoice.py")) == {
+        "billing", "old"
+    }
+    assert locations.content_ids_matching(
+        SearchFilters(path="services", language=["typescript"])
+    ) == {"billing_ts"}
+    assert locations.content_ids_matching(SearchFilters(chunk_type="ClassDef")) == {"klass"}
+    # 복사본 위치(services/auth/copy.py)가 필터를 만족해도 후보
+    assert locations.content_ids_matching(
+        SearchFilters(path="services/auth"), files=["services/auth/copy.py"]
+    ) == {"billing"}
+    assert locations.content_ids_matching(SearchFilters(), files=[]) == set()
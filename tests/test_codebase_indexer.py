@@ -0,0 +1,449 @@
+"""Tests for Codebase Indexer."""
+import ast
+import os
+import pytest
+import tempfile
+import time
+from pathlib import Path
+from src.indexing.codebase_indexer import (
+    CodebaseIndexer, CodeChunk, extract_chunks, line_offsets, slice_segment, split_oversized
+)
+from src.indexing.embedding_cache import EmbeddingCache
+from src.indexing.embeddings import LocalHashEmbeddings
+from src.indexing.manifest import FileRecord
+from src.indexing.search_filters import SearchFilters
+
+
+class InMemoryVectorStore:
+    """테스트용 벡터 스토어"""
+    def __init__(self, fail_on_call=None):
+        self.documents = {}
+        self.add_calls = 0
+        self.fail_on_call = fail_on_call
+
+    def add_documents(self, documents, ids=None):
+        self.add_calls += 1
+        if self.add_calls == self.fail_on_call:
+            raise RuntimeError("simulated failure")
+        self.documents.update(zip(ids, documents))
+
+    def delete(self, ids=None):
+        for doc_id in ids or []:
+            self.documents.pop(doc_id, None)
+
+    def persist(self):
+        pass
+
+
+def _make_project(root: Path, num_files: int):
+    for i in range(num_files):
+        (root / f"module_{i}.py").write_text(
+            f"class Service{i}:\n"
+            f"    def run(self):\n"
+            f"        return {i}\n"
+            f"\n"
+            f"def helper_{i}():\n"
+            f"    pass\n"
+        )
+
+
+@pytest.fixture
+def project_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+def make_indexer():
+    def factory(project_path: Path, **kwargs) -> CodebaseIndexer:
+        indexer = CodebaseIndexer(
+            str(project_path),
+            embeddings=LocalHashEmbeddings(),
+            use_embedding_cache=False,
+            **kwargs
+        )
+        indexer.vector_store = InMemoryVectorStore()
+        return indexer
+
+    return factory
+
+
+def test_incremental_index_project(project_dir, make_indexer):
+    """변경된 파일만 다시 인덱싱하는지 테스트"""
+    _make_project(project_dir, 3)
+    indexer = make_indexer(project_dir, workers=1)
+
+    assert indexer.index_project()["added"] == 3
+    assert len(indexer.vector_store.documents) == 9
+
+    summary = indexer.index_project()
+    assert summary["unchanged"] == 3
+    assert len(indexer.vector_store.documents) == 9
+
+    (project_dir / "module_0.py").write_text("def only(): pass\n")
+    (project_dir / "module_1.py").unlink()
+    summary = indexer.index_project()
+    assert summary["changed"] == 1 and summary["deleted"] == 1
+    assert len(indexer.vector_store.documents) == 4
+
+
+def test_parallel_chunking_matches_serial(project_dir, make_indexer):
+    """프로세스 풀 청킹 결과가 직렬 결과와 같은지 테스트"""
+    _make_project(project_dir, 80)
+    parallel = make_indexer(project_dir, workers=2, batch_size=50)
+    serial = make_indexer(project_dir, workers=1)
+    files = parallel.discover_files()
+
+    def collect(indexer):
+        return sorted(
+            (str(path), [c.chunk_id for c in chunks])
+            for path, chunks in indexer.iter_file_chunks(files)
+        )
+
+    assert collect(parallel) == collect(serial)
+
+    parallel.index_project()
+    assert len(parallel.vector_store.documents) == 240
+    assert parallel.vector_store.add_calls > 1
+
+
+def test_streaming_index_persists_progress(project_dir, make_indexer):
+    """중단된 인덱싱이 완료된 배치까지 저장되어 이어서 진행되는지 테스트"""
+    _make_project(project_dir, 10)
+    indexer = make_indexer(project_dir, workers=1, batch_size=3, persist_every=1)
+    indexer.vector_store = InMemoryVectorStore(fail_on_call=3)
+    with pytest.raises(RuntimeError):
+        indexer.index_project()
+
+    resumed = make_indexer(project_dir, workers=1, batch_size=3)
+    summary = resumed.index_project()
+    # 배치당 1파일(청크 3개) → 실패 전 2개 파일은 이미 매니페스트에 기록됨
+    assert summary["unchanged"] == 2
+    assert summary["added"] == 8
+    assert len(resumed.keyword_index) == 30
+
+
+def test_failed_upsert_stops_pipeline_threads(project_dir, make_indexer):
+    """업서트 실패 시 파이프라인 스레드와 청킹 프로세스 풀이 정리되는지 테스트"""
+    import multiprocessing
+    import threading
+
+    _make_project(project_dir, 60)
+    indexer = make_indexer(project_dir, workers=2, batch_size=3, queue_size=1)
+    indexer.PARALLEL_MIN_FILES = 10
+    indexer.FILES_PER_TASK = 4
+    indexer.vector_store = InMemoryVectorStore(fail_on_call=2)
+    with pytest.raises(RuntimeError) as excinfo:
+        indexer.index_project()
+
+    # excinfo의 traceback이 _apply_diff 프레임(과 스테이지 제너레이터)을 붙잡고 있는 상태
+    assert excinfo.traceback
+    stages = [t for t in threading.enumerate() if t.name.startswith("index-")]
+    assert stages == []
+    assert multiprocessing.active_children() == []
+
+
+@pytest.mark.parametrize("vector_backend", ["chroma", "mmap"])
+def test_embedding_change_rebuilds_index(project_dir, vector_backend):
+    """다른 임베딩 모델/차원으로 다시 열면 전체 재인덱싱하는지 테스트"""
+    (project_dir / "config.py").write_text(
+        "def parse_config_file(path):\n    return open(path).read()\n"
+    )
+
+    def open_indexer(embeddings):
+        return CodebaseIndexer(
+            str(project_dir),
+            embeddings=embeddings,
+            use_embedding_cache=False,
+            workers=1,
+            vector_backend=vector_backend
+        )
+
+    assert open_indexer(LocalHashEmbeddings(dim=64)).index_project()["added"] == 1
+    assert open_indexer(LocalHashEmbeddings(dim=64)).index_project()["unchanged"] == 1
+
+    indexer = open_indexer(LocalHashEmbeddings(dim=32))
+    assert indexer.manifest.outdated
+    assert indexer.index_project()["added"] == 1
+    [result] = indexer.semantic_search("parse config", k=1)
+    assert result.metadata["file_path"] == "config.py"
+    assert open_indexer(LocalHashEmbeddings(dim=32)).index_project()["unchanged"] == 1
+
+
+@pytest.mark.parametrize("vector_backend", ["chroma", "mmap"])
+def test_local_embeddings_end_to_end(project_dir, vector_backend):
+    """로컬 임베딩으로 외부 서비스 없이 인덱싱/검색 테스트"""
+    (project_dir / "config.py").write_text(
+        "def parse_config_file(path):\n    return open(path).read()\n"
+    )
+    (project_dir / "render.py").write_text(
+        "def render_html_template(template):\n    return template.format()\n"
+    )
+    indexer = CodebaseIndexer(
+        str(project_dir),
+        embeddings=LocalHashEmbeddings(),
+        embedding_cache=EmbeddingCache(project_dir / "cache.sqlite3"),
+        workers=1,
+        vector_backend=vector_backend
+    )
+    summary = indexer.index_project()
+    assert summary["embedding_cache"]["misses"] == 2
+
+    results = indexer.semantic_search("parse config", k=1)
+    assert results[0].metadata["file_path"] == "config.py"
+    assert indexer.keyword_search("render_html_template", k=1)[0]["metadata"]["file_path"] == "render.py"
+    hybrid = indexer.hybrid_search("parse config", k=2)
+    assert hybrid[0]["metadata"]["file_path"] == "config.py"
+    assert len(hybrid) == 2
+
+
+class CountingEmbeddings(LocalHashEmbeddings):
+    """임베딩한 텍스트 수를 세는 테스트용 임베딩"""
+    def __init__(self):
+        super().__init__()
+        self.embedded = 0
+
+    def embed_array(self, texts):
+        self.embedded += len(texts)
+        return super().embed_array(texts)
+
+
+SHARED = "def retry_request(session, url):\n    for attempt in range(3):\n        return session.get(url)\n"
+
+
+def _function_result(results):
+    return next(r for r in results if r["metadata"]["chunk_type"] == "FunctionDef")
+
+
+def test_duplicate_chunks_stored_once(project_dir):
+    """같은 내용의 청크는 한 번만 임베딩/저장되고 검색 결과가 모든 위치로 확장되는지 테스트"""
+    (project_dir / "a.py").write_text(SHARED)
+    (project_dir / "b.py").write_text("# copy\n\n" + SHARED)
+    # 다른 깊이(메서드)로 복사된 같은 코드
+    (project_dir / "c.py").write_text(
+        "class Client:\n" + "".join(f"    {line}\n" for line in SHARED.splitlines())
+    )
+    embeddings = CountingEmbeddings()
+    indexer = CodebaseIndexer(
+        str(project_dir),
+        embeddings=embeddings,
+        use_embedding_cache=False,
+        vector_backend="mmap",
+        workers=1
+    )
+    indexer.index_project()
+    # retry_request 1개 + Client 클래스 1개
+    assert embeddings.embedded == 2
+    assert len(indexer.vector_store) == 2
+    assert len(indexer.locations) == 4
+
+    result = _function_result(indexer.keyword_search("retry_request", k=2))
+    assert result["metadata"]["duplicates"] == 2
+    assert [(l["file_path"], l["lines"]) for l in result["metadata"]["locations"]] == [
+        ("a.py", "1-3"), ("b.py", "3-5"), ("c.py", "2-4")
+    ]
+    docs = indexer.semantic_search("retry request session", k=2)
+    assert _function_result([{"metadata": d.metadata} for d in docs])["metadata"]["duplicates"] == 2
+    assert {r["qualname"] for r in indexer.symbol_index.find_definition("retry_request")} == {
+        "retry_request", "Client.retry_request"
+    }
+
+    # 복사본 일부를 지우면 문서는 남고, 모두 지우면 삭제
+    embedded = embeddings.embedded
+    (project_dir / "a.py").unlink()
+    (project_dir / "c.py").unlink()
+    indexer.index_project()
+    assert embeddings.embedded == embedded
+    result = _function_result(indexer.keyword_search("retry_request", k=2))
+    assert result["metadata"]["file_path"] == "b.py"
+    assert result["metadata"]["lines"] == "3-5"
+    assert result["metadata"]["duplicates"] == 0
+
+    (project_dir / "b.py").write_text("# removed\n")
+    indexer.index_project()
+    assert len(indexer.vector_store) == 0
+    assert indexer.keyword_search("retry_request", k=1) == []
+
+
+def test_modified_since_filter_during_manifest_update(project_dir, make_indexer):
+    """검색 도중 파일 감시기가 매니페스트에 파일을 추가해도 modified_since 필터가 실패하지 않는지 테스트"""
+    _make_project(project_dir, 2)
+    indexer = make_indexer(project_dir, workers=1)
+    indexer.index_project()
+    files = indexer.manifest.files
+
+    class AddedDuringSearch(FileRecord):
+        """mtime을 읽는 순간 다른 스레드가 새 파일을 기록한 것처럼 매니페스트 변경"""
+        @property
+        def mtime_ns(self):
+            files.setdefault("module_new.py", FileRecord(0, 0, ""))
+            return 0
+
+        @mtime_ns.setter
+        def mtime_ns(self, value):
+            pass
+
+    record = files["module_0.py"]
+    files["module_0.py"] = AddedDuringSearch(0, 0, "", record.chunk_ids)
+    ids = indexer.filter_ids(SearchFilters.from_dict({"modified_since": 0}))
+    assert ids and "module_new.py" in files
+
+
+@pytest.mark.parametrize("vector_backend", ["chroma", "mmap"])
+def test_filtered_search(project_dir, vector_backend):
+    """경로/언어/청크 종류/수정 시각 필터가 점수 계산 전에 후보를 제한하는지 테스트"""
+    for directory in ("services/billing", "services/billing_old", "web"):
+        (project_dir / directory).mkdir(parents=True)
+    source = "def charge_invoice(invoice):\n    return invoice.total * {}\n"
+    for i in range(6):
+        (project_dir / "services/billing_old" / f"legacy_{i}.py").write_text(source.format(i))
+    (project_dir / "services/billing/invoice.py").write_text(
+        "def send_receipt(customer):\n    return customer.email\n"
+    )
+    (project_dir / "web/invoice.ts").write_text(
+        "export function chargeInvoice(invoice: Invoice): number {\n  return invoice.total;\n}\n"
+    )
+    old = time.time() - 3600
+    for path in (project_dir / "services").rglob("*.py"):
+        os.utime(path, (old, old))
+    indexer = CodebaseIndexer(
+        str(project_dir),
+        embeddings=LocalHashEmbeddings(),
+        use_embedding_cache=False,
+        workers=1,
+        vector_backend=vector_backend
+    )
+    indexer.index_project()
+
+    docs = indexer.semantic_search("charge invoice", k=3, filters={"path": "services/billing"})
+    assert [d.metadata["file_path"] for d in docs] == ["services/billing/invoice.py"]
+    results = indexer.keyword_search("charge_invoice", k=3, filters={"language": "typescript"})
+    assert [r["metadata"]["file_path"] for r in results] == ["web/invoice.ts"]
+    recent = indexer.hybrid_search("charge invoice", k=3, filters={"modified_since": old + 60})
+    assert {r["metadata"]["file_path"] for r in recent} == {"web/invoice.ts"}
+    glob = indexer.semantic_search("charge invoice", k=3, filters={"path": "services/*/legacy_3.py"})
+    assert glob[0].metadata["file_path"] == "services/billing_old/legacy_3.py"
+    assert indexer.keyword_search("charge_invoice", k=3, filters={"chunk_type": "ClassDef"}) == []
+    with pytest.raises(ValueError):
+        indexer.semantic_search("charge invoice", filters={"folder": "web"})
+    assert indexer.query_cache.stats()["filters"]["entries"] > 0
+
+
+@pytest.mark.parametrize("vector_backend", ["chroma", "mmap"])
+def test_scored_search_with_cutoff_and_mmr(project_dir, vector_backend):
+    """코사인 점수, 최소 점수 컷오프, MMR 다양성 재순위 테스트"""
+    body = "    total = sum(line.amount for line in invoice.lines)\n    return total * rate\n"
+    for i in range(3):
+        (project_dir / f"copy_{i}.py").write_text(f"def invoice_total_{i}(invoice, rate):\n{body}")
+    (project_dir / "tax.py").write_text(
+        "def invoice_tax(invoice, rate):\n    return invoice.subtotal * rate\n"
+    )
+    (project_dir / "other.py").write_text("def open_socket(host):\n    return connect(host)\n")
+    indexer = CodebaseIndexer(
+        str(project_dir),
+        embeddings=LocalHashEmbeddings(),
+        use_embedding_cache=False,
+        workers=1,
+        vector_backend=vector_backend
+    )
+    indexer.index_project()
+
+    docs = indexer.semantic_search("invoice total rate", k=5)
+    scores = [d.metadata["score"] for d in docs]
+    assert scores == sorted(scores, reverse=True)
+    assert 0 < scores[0] <= 1.0
+    assert docs[-1].metadata["file_path"] == "other.py"
+
+    cutoff = (scores[-2] + scores[-1]) / 2
+    kept = indexer.semantic_search("invoice total rate", k=5, min_score=cutoff)
+    assert [d.metadata["file_path"] for d in kept] == [d.metadata["file_path"] for d in docs[:-1]]
+
+    plain = indexer.semantic_search("invoice total rate", k=2)
+    assert all(d.metadata["file_path"].startswith("copy_") for d in plain)
+    diverse = indexer.semantic_search("invoice total rate", k=2, mmr=True, lambda_mult=0.3)
+    assert diverse[0].metadata["file_path"] == plain[0].metadata["file_path"]
+    assert diverse[1].metadata["file_path"] in ("tax.py", "other.py")
+
+
+HIERARCHY_SOURCE = '''"""Service module."""
+import os
+
+TIMEOUT = 30
+
+
+class Service:
+    retries = 3
+
+    def start(self, port):
+        self.port = port
+        return os.getpid()
+
+    def stop(self):
+        def cleanup():
+            return None
+        cleanup()
+'''
+
+
+def test_hierarchical_chunks_do_not_overlap(project_dir):
+    """클래스는 골격, 메서드는 리프, 모듈 코드는 별도 청크로 겹치지 않게 추출"""
+    (project_dir / "service.py").write_text(HIERARCHY_SOURCE)
+    chunks = {
+        (c.chunk_type, c.name): c for c in extract_chunks(project_dir / "service.py", project_dir)
+    }
+    assert set(chunks) == {
+        ("ClassDef", "Service"), ("FunctionDef", "start"), ("FunctionDef", "stop"),
+        ("FunctionDef", "cleanup"), ("Module", ""),
+    }
+
+    skeleton = chunks[("ClassDef", "Service")]
+    assert (skeleton.start_line, skeleton.end_line) == (7, 17)
+    assert "retries = 3" in skeleton.content
+    assert "    def start(self, port):\n        ...\n" in skeleton.content
+    assert "self.port" not in skeleton.content and "cleanup" not in skeleton.content
+
+    assert "self.port = port" in chunks[("FunctionDef", "start")].content
+    assert "return None" not in chunks[("FunctionDef", "stop")].content
+    assert "return None" in chunks[("FunctionDef", "cleanup")].content
+
+    module = chunks[("Module", "")]
+    assert (module.start_line, module.end_line) == (1, 17)
+    assert "TIMEOUT = 30" in module.content and "import os" in module.content
+    assert module.content.endswith("class Service:\n    ...")
+
+
+def test_split_oversized_with_overlap(project_dir):
+    """큰 함수를 겹치는 부분 청크로 나누고 모든 줄을 덮는지 테스트"""
+    body = "".join(f"    value_{i} = {i}\n" for i in range(250))
+    (project_dir / "big.py").write_text(f"def big():\n{body}")
+    assert len(extract_chunks(project_dir / "big.py", project_dir)) == 3
+
+    content = "def big():\n" + body.rstrip("\n")
+    chunk = CodeChunk(content, "FunctionDef", 1, 251, "big.py", "python", name="big")
+    chunks = split_oversized([chunk], max_lines=100, overlap=10)
+
+    assert [(c.part, c.start_line, c.end_line) for c in chunks] == [
+        (1, 1, 100), (2, 91, 190), (3, 181, 251)
+    ]
+    assert all(c.chunk_type == "FunctionDef" and c.name == "big" for c in chunks)
+    assert chunks[1].content.splitlines()[0] == "    value_89 = 89"
+
+
+def test_slice_segment_matches_get_source_segment():
+    """오프셋 테이블 슬라이싱이 ast.get_source_segment와 같은지 테스트"""
+    source = (
+        "# 모듈 주석\r\n"
+        "class 클래스:\n"
+        "    def method(self, x=\"é\"): return \"ü\"\n"
+        "\n"
+        "def outer():\n"
+        "    def inner():\n"
+        "        return '한글'\n"
+        "    return inner\n"
+    )
+    tree = ast.parse(source)
+    offsets = line_offsets(source)
+    nodes = [n for n in ast.walk(tree) if isinstance(n, (ast.FunctionDef, ast.ClassDef))]
+    assert len(nodes) == 4
+    for node in nodes:
+        assert slice_segment(source, offsets, node) == ast.get_source_segment(source, node)
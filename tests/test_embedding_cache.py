@@ -0,0 +1,96 @@
+"""Tests for Embedding Cache."""
+import numpy as np
+import pytest
+import tempfile
+from pathlib import Path
+from src.indexing.embedding_cache import EmbeddingCache, CachedEmbeddings, text_digest
+from src.indexing.embeddings import LocalHashEmbeddings
+
+
+class CountingEmbeddings(LocalHashEmbeddings):
+    """임베딩 호출 횟수를 기록하는 테스트용 백엔드"""
+    def __init__(self):
+        super().__init__(dim=32)
+        self.calls = []
+
+    def embed_array(self, texts):
+        self.calls.append(len(texts))
+        return super().embed_array(texts)
+
+
+@pytest.fixture
+def cache_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir) / "cache.sqlite3"
+
+
+def test_cache_hits_skip_embedding(cache_path):
+    """캐시 적중 시 임베딩을 다시 하지 않는지 테스트"""
+    backend = CountingEmbeddings()
+    embeddings = CachedEmbeddings(backend, EmbeddingCache(cache_path), batch_size=2)
+
+    first = embeddings.embed_array(["a = 1", "b = 2", "a = 1", "c = 3"])
+    # 중복 제거 후 3개를 batch_size=2로 나누어 임베딩
+    assert backend.calls == [2, 1]
+    np.testing.assert_allclose(first[0], first[2])
+
+    # 새 프로세스처럼 캐시를 다시 열어도 적중
+    backend = CountingEmbeddings()
+    cache = EmbeddingCache(cache_path)
+    embeddings = CachedEmbeddings(backend, cache)
+    second = embeddings.embed_array(["c = 3", "a = 1"])
+    assert backend.calls == []
+    np.testing.assert_allclose(second, first[[3, 0]])
+    assert cache.stats()["hit_rate"] == 1.0
+    assert cache.stats()["entries"] == 3
+
+
+def test_cache_keys_include_model(cache_path):
+    """모델 이름이 다르면 별도로 캐시되는지 테스트"""
+    cache = EmbeddingCache(cache_path)
+    digest = text_digest("x")
+    cache.put_many("model-a", {digest: np.ones(4, dtype=np.float32)})
+    assert cache.get_many("model-b", [digest]) == {}
+    assert digest in cache.get_many("model-a", [digest])
+
+    # 출력이 다른 설정은 서로 다른 모델 키를 가짐
+    keys = {
+        CachedEmbeddings(embeddings, cache).model
+        for embeddings in (
+            LocalHashEmbeddings(dim=32),
+            LocalHashEmbeddings(dim=32, ngram=4),
+            LocalHashEmbeddings(dim=32, ngram_weight=0.25),
+        )
+    }
+    assert len(keys) == 3
+
+
+def test_lru_eviction_respects_size_cap(cache_path):
+    """크기 제한 초과 시 오래 사용하지 않은 항목부터 제거"""
+    cache = EmbeddingCache(cache_path, max_bytes=16 * 10)
+    digests = [text_digest(str(i)) for i in range(10)]
+    for digest in digests:
+        cache.put_many("m", {digest: np.zeros(4, dtype=np.float32)})
+    cache.get_many("m", [digests[0]])
+
+    cache.put_many("m", {text_digest("new"): np.zeros(4, dtype=np.float32)})
+    stats = cache.stats()
+    assert stats["size_bytes"] <= stats["max_bytes"]
+    assert stats["evictions"] > 0
+    assert digests[0] in cache.get_many("m", [digests[0]])
+    assert cache.get_many("m", [digests[1]]) == {}
+
+
+
+def test_replacing_entries_does_not_grow_size(cache_path):
+    """같은 다이제스트를 다시 저장해도 크기가 늘지 않아 가득 찬 캐시에서 제거가 일어나지 않는지 테스트"""
+    cache = EmbeddingCache(cache_path, max_bytes=16 * 10)
+    items = {text_digest(str(i)): np.zeros(4, dtype=np.float32) for i in range(10)}
+    cache.put_many("m", items)
+    for digest in items:
+        cache.put_many("m", {digest: np.ones(4, dtype=np.float32)})
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["size_bytes"]) == (10, 16 * 10)
+    assert stats["evictions"] == 0
+    assert len(cache.get_many("m", list(items))) == 10
@@ -0,0 +1,44 @@
+"""Tests for embedding backends."""
+import numpy as np
+import pytest
+from src.indexing.embeddings import LocalHashEmbeddings, create_embeddings
+from src.indexing.tokenizer import tokenize_code, split_identifier
+
+
+def test_split_identifier():
+    """snake_case / camelCase 분할 테스트"""
+    assert split_identifier("getHTTPResponse_code") == ["get", "http", "response", "code"]
+    assert split_identifier("parse_ast") == ["parse", "ast"]
+    assert "parse_ast" in tokenize_code("def parse_ast(): pass")
+
+
+def test_local_embeddings_are_normalized_and_deterministic():
+    """정규화 및 결정성 테스트"""
+    texts = ["def parse_ast(path): return ast.parse(path)", "class HttpServer: pass", ""]
+    first = LocalHashEmbeddings(dim=256).embed_array(texts)
+    second = LocalHashEmbeddings(dim=256).embed_array(list(reversed(texts)))[::-1]
+
+    assert first.shape == (3, 256)
+    assert first.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(first[:2], axis=1), 1.0, rtol=1e-5)
+    assert not first[2].any()
+    np.testing.assert_allclose(first, second, rtol=1e-5, atol=1e-6)
+
+
+def test_local_embeddings_rank_related_code_higher():
+    """관련 코드가 더 높은 유사도를 갖는지 테스트"""
+    embeddings = LocalHashEmbeddings()
+    docs = embeddings.embed_array([
+        "def parse_config_file(path):\n    return load(path)",
+        "def render_html_template(template):\n    return template",
+    ])
+    query = np.asarray(embeddings.embed_query("parseConfig"), dtype=np.float32)
+    scores = docs @ query
+    assert scores[0] > scores[1]
+
+
+def test_create_embeddings():
+    """백엔드 이름으로 생성 테스트"""
+    assert isinstance(create_embeddings("local"), LocalHashEmbeddings)
+    with pytest.raises(ValueError):
+        create_embeddings("unknown")
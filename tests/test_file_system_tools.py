@@ -1,8 +1,11 @@
 """Tests for File System Tools."""
+import asyncio
 import pytest
 import tempfile
 import os
+import time
 from pathlib import Path
+from src.mcp.tools import file_system
 from src.mcp.tools.file_system import FileSystemTools
 
 
@@ -51,3 +54,77 @@ async def test_list_files():
         files = await FileSystemTools.list_files(temp_dir, "*", recursive=True)
         assert len(files) >= 3
 
+
+
+@pytest.mark.asyncio
+async def test_read_many_and_stat_many(tmp_path):
+    """여러 파일 동시 읽기/상태 조회 테스트 (입력 순서 유지, 실패 처리)"""
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"file_{i}.txt"
+        path.write_text(f"content {i}")
+        paths.append(str(path))
+    missing = str(tmp_path / "missing.txt")
+
+    assert await FileSystemTools.read_many(paths) == [f"content {i}" for i in range(5)]
+    results = await FileSystemTools.read_many([paths[0], missing], return_exceptions=True)
+    assert results[0] == "content 0"
+    assert isinstance(results[1], FileNotFoundError)
+    with pytest.raises(FileNotFoundError):
+        await FileSystemTools.read_many([missing])
+
+    stats = await FileSystemTools.stat_many([paths[1], str(tmp_path), missing])
+    assert stats[0]["size"] == len("content 1") and stats[0]["is_file"]
+    assert stats[1]["is_dir"] and not stats[1]["is_file"]
+    assert stats[2] is None
+
+
+@pytest.mark.asyncio
+async def test_file_io_does_not_block_event_loop(tmp_path, monkeypatch):
+    """파일 I/O가 스레드 풀에서 실행되어 다른 코루틴이 계속 진행되는지 테스트"""
+    path = tmp_path / "slow.txt"
+    path.write_text("data")
+    original = file_system._read_text
+
+    def slow_read(file_path):
+        time.sleep(0.2)
+        return original(file_path)
+
+    monkeypatch.setattr(file_system, "_read_text", slow_read)
+    finished = []
+
+    async def read():
+        content = await FileSystemTools.read_file(str(path))
+        finished.append("read")
+        return content
+
+    async def ticker():
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+        finished.append("ticker")
+
+    content, _ = await asyncio.gather(read(), ticker())
+    assert content == "data"
+    # 읽기가 루프를 막았다면 ticker가 읽기보다 늦게 끝남
+    assert finished == ["ticker", "read"]
+
+
+@pytest.mark.asyncio
+async def test_search_files_and_grep(tmp_path):
+    """내용 검색, 줄 단위 grep, 스트리밍 grep 테스트"""
+    (tmp_path / "a.py").write_text("def Alpha():\n    pass\n")
+    (tmp_path / "b.py").write_text("alpha = 1\n")
+    (tmp_path / "c.txt").write_text("beta\n")
+    (tmp_path / "d.bin").write_bytes(b"alpha\x00")
+
+    files = await FileSystemTools.search_files(str(tmp_path), "ALPHA")
+    assert files == [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    assert await FileSystemTools.search_files(str(tmp_path), "alpha", [".txt"]) == []
+
+    matches = await FileSystemTools.grep(str(tmp_path), r"def \w+", regex=True, context=1)
+    assert [(m["line"], m["text"], m["after"]) for m in matches] == [(1, "def Alpha():", ["    pass"])]
+
+    streamed = [m async for m in FileSystemTools.grep_stream(str(tmp_path), "alpha", max_results=1)]
+    assert len(streamed) == 1
+    with pytest.raises(FileNotFoundError):
+        await FileSystemTools.grep(str(tmp_path / "missing"), "alpha")
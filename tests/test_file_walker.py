@@ -0,0 +1,115 @@
+"""Tests for File Walker."""
+from pathlib import Path
+
+from src.utils.file_walker import FileWalker, parse_ignore_lines, is_ignored
+
+
+def make_tree(root: Path, files):
+    for rel in files:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+
+
+def walked(root: Path, **kwargs):
+    return sorted(
+        p.relative_to(root).as_posix() for p in FileWalker(str(root), **kwargs).iter_files()
+    )
+
+
+def test_extensions_single_pass(tmp_path):
+    """여러 확장자를 한 번의 순회로 매칭"""
+    make_tree(tmp_path, ["a.py", "b.ts", "c.txt", "pkg/d.tsx", "pkg/e.md"])
+
+    assert walked(tmp_path, extensions=[".py", ".ts", ".tsx"]) == ["a.py", "b.ts", "pkg/d.tsx"]
+    assert walked(tmp_path, extensions=["py"]) == ["a.py"]
+    assert len(walked(tmp_path)) == 5
+
+
+def test_default_excludes_prune_directories(tmp_path):
+    """node_modules, .git 등은 기본으로 제외"""
+    make_tree(tmp_path, [
+        "src/app.js",
+        "node_modules/lib/index.js",
+        "src/node_modules/inner.js",
+        ".git/objects/x.js",
+    ])
+
+    assert walked(tmp_path, extensions=[".js"]) == ["src/app.js"]
+    assert len(walked(tmp_path, extensions=[".js"], exclude=[])) == 4
+
+
+def test_generic_excludes_only_at_root(tmp_path):
+    """build/env 같은 흔한 이름은 루트에서만 제외하고, 가상 환경은 pyvenv.cfg로 찾아 제외"""
+    make_tree(tmp_path, [
+        "src/env/settings.py",
+        "src/build/steps.py",
+        "pkg/target/t.py",
+        "src/ok.py",
+        "build/out.py",
+        "dist/pkg.py",
+        "tools/pyenv/lib/site.py",
+    ])
+    (tmp_path / "tools" / "pyenv" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+
+    assert walked(tmp_path, extensions=[".py"]) == [
+        "pkg/target/t.py", "src/build/steps.py", "src/env/settings.py", "src/ok.py"
+    ]
+    walker = FileWalker(str(tmp_path), extensions=[".py"])
+    assert walker.matches(tmp_path / "src" / "build" / "steps.py")
+    assert not walker.matches(tmp_path / "build" / "out.py")
+    assert not walker.matches(tmp_path / "tools" / "pyenv" / "lib" / "site.py")
+
+
+def test_gitignore_rules(tmp_path):
+    """gitignore 패턴, 디렉토리 전용 규칙, 부정 규칙"""
+    make_tree(tmp_path, [
+        "main.py",
+        "gen/out.py",
+        "logs/app.log",
+        "keep.log",
+        "debug.log",
+        "docs/build.py",
+        "gen_file.py",
+    ])
+    (tmp_path / ".gitignore").write_text(
+        "# comment\n"
+        "gen/\n"
+        "*.log\n"
+        "!keep.log\n"
+        "/docs/build.py\n"
+    )
+
+    assert walked(tmp_path, exclude=[]) == [".gitignore", "gen_file.py", "keep.log", "main.py"]
+
+
+def test_nested_ignore_files(tmp_path):
+    """하위 디렉토리의 ignore 파일은 해당 디렉토리 기준으로 적용"""
+    make_tree(tmp_path, ["a/secret.py", "a/ok.py", "b/secret.py"])
+    (tmp_path / "a" / ".cursorignore").write_text("secret.py\n")
+
+    assert walked(tmp_path, extensions=[".py"]) == ["a/ok.py", "b/secret.py"]
+
+
+def test_ignored_directory_is_not_entered(tmp_path):
+    """무시된 디렉토리 내부의 ! 규칙은 적용되지 않음 (git과 동일)"""
+    make_tree(tmp_path, ["vendor/lib/keep.py", "vendor/lib/other.py"])
+    (tmp_path / ".gitignore").write_text("vendor/\n!vendor/lib/keep.py\n")
+
+    assert walked(tmp_path, extensions=[".py"]) == []
+
+
+def test_max_depth_and_hidden(tmp_path):
+    """최대 깊이와 숨김 항목 필터"""
+    make_tree(tmp_path, ["top.py", "a/mid.py", "a/b/deep.py", ".hidden/x.py"])
+
+    assert walked(tmp_path, max_depth=2, include_hidden=False) == ["a/mid.py", "top.py"]
+
+
+def test_is_ignored_last_match_wins():
+    """마지막으로 매칭된 규칙이 우선"""
+    rules = parse_ignore_lines(["*.py", "!main.py", "**/tests/*.py"])
+
+    assert is_ignored([("", rules)], "util.py", "util.py", False)
+    assert not is_ignored([("", rules)], "main.py", "main.py", False)
+    assert is_ignored([("", rules)], "pkg/tests/main.py", "main.py", False)
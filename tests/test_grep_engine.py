@@ -0,0 +1,76 @@
+"""Tests for Grep Engine."""
+import pytest
+from src.utils import grep_engine
+from src.utils.grep_engine import compile_pattern, grep_file, iter_grep, scan_buffer
+
+
+def make_tree(root):
+    (root / "src").mkdir()
+    (root / "src" / "app.py").write_text(
+        "import os\n\ndef Handler(request):\n    return handler_impl(request)\n\n# TODO: cleanup\n"
+    )
+    (root / "src" / "util.ts").write_text("export const HANDLER = 1;\r\nconst x = 2;\r\n")
+    (root / "src" / "data.bin").write_bytes(b"handler\x00\x01\x02")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "lib.js").write_text("handler()\n")
+    (root / "notes.md").write_text("Über handler\nÜBER alles\n")
+
+
+def test_literal_and_regex_matches_with_line_numbers(tmp_path):
+    """리터럴/정규식 검색, 줄/열 번호, 대소문자 구분 테스트"""
+    make_tree(tmp_path)
+    matches = sorted(iter_grep(tmp_path, "handler"), key=lambda m: (m["file_path"], m["line"]))
+    found = [(m["file_path"].rsplit("/", 1)[-1], m["line"], m["column"]) for m in matches]
+    # 바이너리 파일과 node_modules는 건너뛰고, 줄마다 한 번만 보고
+    assert found == [("notes.md", 1, 6), ("app.py", 3, 5), ("app.py", 4, 12), ("util.ts", 1, 14)]
+    assert matches[3]["text"] == "export const HANDLER = 1;"
+
+    exact = iter_grep(tmp_path, "handler", ignore_case=False, extensions=[".py", ".ts"])
+    assert [m["line"] for m in exact] == [4]
+    regex = list(iter_grep(tmp_path, r"^def \w+\(", regex=True, extensions=[".py"]))
+    assert [(m["line"], m["text"]) for m in regex] == [(3, "def Handler(request):")]
+    # 정규식 문자는 리터럴 모드에서 그대로 검색
+    assert list(iter_grep(tmp_path, "handler_impl(")) and not list(iter_grep(tmp_path, "a.b"))
+
+
+def test_case_folding(tmp_path, monkeypatch):
+    """대소문자 무시 리터럴 검색 테스트 (접기 구간 경계, 비 ASCII)"""
+    monkeypatch.setattr(grep_engine, "FOLD_WINDOW_BYTES", 4)
+    data = b"xxxNeedle\nneedleNEEDLE\nno\nneeDLE"
+    assert list(compile_pattern("needle").iter_starts(data)) == [3, 10, 16, 26]
+    assert [m["line"] for m in scan_buffer(data, compile_pattern("NEEDLE"))] == [1, 2, 4]
+
+    make_tree(tmp_path)
+    matches = list(iter_grep(tmp_path, "über", extensions=[".md"]))
+    assert [m["line"] for m in matches] == [1, 2]
+    assert compile_pattern("über").search("ÜBER".encode("utf-8"))
+    assert not compile_pattern("über", ignore_case=False).search("ÜBER".encode("utf-8"))
+
+
+def test_context_lines_and_mmap(tmp_path, monkeypatch):
+    """앞뒤 문맥 줄과 mmap 경로 테스트"""
+    path = tmp_path / "big.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(20)) + "needle\nafter 1\nafter 2\nafter 3")
+    for threshold in (1 << 20, 1):
+        monkeypatch.setattr(grep_engine, "MMAP_MIN_BYTES", threshold)
+        [match] = grep_file(path, compile_pattern("NEEDLE"), context=2)
+        assert match["line"] == 21
+        assert match["before"] == ["line 18", "line 19"]
+        assert match["after"] == ["after 1", "after 2"]
+
+    [first] = grep_file(path, compile_pattern("line 0"), context=2)
+    assert first["before"] == [] and first["after"] == ["line 1", "line 2"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_max_results_and_files_only(tmp_path, monkeypatch, workers):
+    """최대 결과 수에서 조기 종료, 파일 단위 검색, 병렬 스캔 테스트"""
+    monkeypatch.setattr(grep_engine, "PARALLEL_MIN_FILES", 4)
+    monkeypatch.setattr(grep_engine, "FILES_PER_TASK", 3)
+    for i in range(20):
+        (tmp_path / f"module_{i}.py").write_text("match\nmatch\nother\n")
+
+    assert len(list(iter_grep(tmp_path, "match", workers=workers))) == 40
+    assert len(list(iter_grep(tmp_path, "match", max_results=5, workers=workers))) == 5
+    files = list(iter_grep(tmp_path, "match", files_only=True, workers=workers))
+    assert len(files) == 20 and len({m["file_path"] for m in files}) == 20
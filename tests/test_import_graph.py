@@ -0,0 +1,116 @@
+"""Tests for the project import graph."""
+import pytest
+from src.indexing.import_graph import (
+    IMPORT_GRAPH_FILE, ImportGraph, js_import_candidates, python_import_candidates
+)
+
+
+FILES = {
+    "src/app/__init__.py": "",
+    "src/app/core.py": "import os\n\ndef run():\n    pass\n",
+    "src/app/service.py": "from .core import run\n\ndef serve():\n    run()\n",
+    "src/app/api.py": "from src.app import service\nimport src.app.core\n",
+    "tests/test_api.py": "from app.api import *\n",
+    "tests/test_core.py": "from src.app.core import run\n",
+}
+
+
+@pytest.fixture
+def indexer(tmp_path, indexed_project):
+    return indexed_project(tmp_path, FILES)
+
+
+def test_python_import_candidates():
+    """상대/절대 import 및 from import 이름의 하위 모듈 후보"""
+    assert python_import_candidates("pkg/sub/mod.py", "util", level=2, names=["x"]) == [
+        ("pkg/util/x.py", "pkg/util/x/__init__.py", "pkg/util.py", "pkg/util/__init__.py")
+    ]
+    assert python_import_candidates("mod.py", "a.b") == [
+        ("a/b.py", "a/b/__init__.py", "src/a/b.py", "src/a/b/__init__.py")
+    ]
+    assert python_import_candidates("pkg/mod.py", None, level=1, names=["x"]) == [
+        ("pkg/x.py", "pkg/x/__init__.py", "pkg/__init__.py")
+    ]
+
+
+def test_js_import_candidates():
+    """상대 경로만 해석하고 확장자/index/.js→.ts 후보 생성"""
+    candidates = js_import_candidates("web/src/app.ts", "../lib/util.js")
+    assert candidates[:3] == ("web/lib/util.js", "web/lib/util.ts", "web/lib/util.tsx")
+    assert "web/src/components/index.tsx" in js_import_candidates("web/src/app.ts", "./components")
+    assert js_import_candidates("web/src/app.ts", "react") is None
+
+
+def test_dependents_and_dependencies(indexer):
+    """직접/간접 사용자와 의존성 조회"""
+    graph = indexer.import_graph
+
+    assert graph.dependencies("src/app/service.py") == ["src/app/core.py"]
+    assert graph.dependencies("src/app/api.py") == ["src/app/core.py", "src/app/service.py"]
+    assert graph.dependents("src.app.core") == [
+        "src/app/api.py", "src/app/service.py", "tests/test_core.py"
+    ]
+    assert graph.dependents("src/app/core.py", transitive=True) == [
+        "src/app/api.py", "src/app/service.py", "tests/test_api.py", "tests/test_core.py"
+    ]
+    assert graph.dependents("src/app/core.py", transitive=True, max_depth=1) == \
+        graph.dependents("src/app/core.py")
+    assert graph.affected_tests(["src/app/service.py"]) == ["tests/test_api.py"]
+    assert graph.dependents("missing.module") == []
+
+
+def test_incremental_update(indexer, tmp_path):
+    """파일 추가/수정/삭제 시 바뀐 간선만 갱신되고 디스크에 유지되는지 테스트"""
+    graph = indexer.import_graph
+
+    # 새 하위 모듈이 생기면 service.py를 다시 파싱하지 않고도 `from .core import run`이 재해석됨
+    (tmp_path / "src/app/core").mkdir()
+    (tmp_path / "src/app/core/run.py").write_text("import os\n")
+    (tmp_path / "src/app/api.py").write_text("import os\n")
+    indexer.update_files([tmp_path / "src/app/core/run.py", tmp_path / "src/app/api.py"])
+
+    assert graph.dependencies("src/app/service.py") == ["src/app/core/run.py"]
+    assert graph.dependents("src/app/service.py") == []
+    assert graph.affected_tests(["src/app/core/run.py"]) == ["tests/test_core.py"]
+
+    (tmp_path / "src/app/core/run.py").unlink()
+    indexer.index_project()
+    assert graph.dependencies("src/app/service.py") == ["src/app/core.py"]
+
+    reopened = ImportGraph(tmp_path / ".cursor_index" / IMPORT_GRAPH_FILE)
+    assert reopened.dependents("src/app/core.py") == ["src/app/service.py", "tests/test_core.py"]
+    assert "src/app/core/run.py" not in reopened
+    assert len(reopened) == len(FILES)
+
+
+def test_reader_refreshes_after_indexer_saves(indexer, tmp_path):
+    """읽기 전용으로 연 그래프가 인덱서의 저장 이후 refresh()로 새 간선을 보는지 테스트"""
+    reader = ImportGraph(tmp_path / ".cursor_index" / IMPORT_GRAPH_FILE)
+    assert reader.dependents("src/app/service.py") == ["src/app/api.py"]
+    reader.refresh()
+    assert reader.dependents("src/app/service.py") == ["src/app/api.py"]
+
+    (tmp_path / "src/app/api.py").write_text("import os\n")
+    indexer.update_files([tmp_path / "src/app/api.py"])
+    assert reader.dependents("src/app/service.py") == ["src/app/api.py"]
+
+    reader.refresh()
+    assert reader.dependents("src/app/service.py") == []
+
+
+def test_javascript_imports(tmp_path, indexed_project):
+    """ESM import, require, 재export가 프로젝트 파일로 해석되는지 테스트"""
+    pytest.importorskip("tree_sitter_typescript")
+    indexer = indexed_project(tmp_path, {
+        "lib/index.ts": "export * from './math.js';\n",
+        "lib/math.ts": "export function add(a, b) { return a + b; }\n",
+        "app.js": "const lib = require('./lib');\nimport React from 'react';\n",
+        "app.test.ts": "import { add } from './lib/math';\n",
+    })
+
+    graph = indexer.import_graph
+    assert graph.dependencies("app.js") == ["lib/index.ts"]
+    assert graph.dependents("lib/math.ts", transitive=True) == [
+        "app.js", "app.test.ts", "lib/index.ts"
+    ]
+    assert graph.affected_tests(["lib/math.ts"]) == ["app.test.ts"]
@@ -0,0 +1,53 @@
+"""Tests for Index Manifest."""
+import os
+import tempfile
+from pathlib import Path
+from src.indexing.manifest import IndexManifest
+
+
+def _write(path: Path, content: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_diff_classifies_files():
+    """추가/변경/삭제/유지 분류 테스트"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        _write(root / "a.py", "def a(): pass\n")
+        _write(root / "b.py", "def b(): pass\n")
+        manifest = IndexManifest(root / ".idx" / "manifest.json")
+
+        diff = manifest.diff([root / "a.py", root / "b.py"], root)
+        assert diff.summary() == {"added": 2, "changed": 0, "deleted": 0, "unchanged": 0}
+        for rel_path, (size, mtime_ns, content_hash) in diff.fingerprints.items():
+            manifest.update(rel_path, size, mtime_ns, content_hash, [f"{rel_path}-id"])
+        manifest.save()
+
+        # 새로 로드해도 동일한 상태
+        manifest = IndexManifest(root / ".idx" / "manifest.json")
+        _write(root / "a.py", "def a(): return 1\n")
+        (root / "b.py").unlink()
+        _write(root / "c.py", "x = 1\n")
+
+        diff = manifest.diff([root / "a.py", root / "c.py"], root)
+        assert [p.name for p in diff.changed] == ["a.py"]
+        assert [p.name for p in diff.added] == ["c.py"]
+        assert diff.deleted == ["b.py"]
+        assert manifest.chunk_ids_for(["a.py", "b.py"]) == ["a.py-id", "b.py-id"]
+
+
+def test_touch_without_content_change_is_unchanged():
+    """내용 변경 없는 mtime 변경은 유지로 분류"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        _write(root / "a.py", "def a(): pass\n")
+        manifest = IndexManifest(root / "manifest.json")
+        diff = manifest.diff([root / "a.py"], root)
+        size, mtime_ns, content_hash = diff.fingerprints["a.py"]
+        manifest.update("a.py", size, mtime_ns, content_hash, [])
+
+        os.utime(root / "a.py", ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+        diff = manifest.diff([root / "a.py"], root)
+        assert diff.to_index == []
+        assert len(diff.unchanged) == 1
@@ -0,0 +1,112 @@
+"""Tests for BM25 keyword index and hybrid search."""
+import numpy as np
+import pytest
+import tempfile
+from pathlib import Path
+from src.indexing.keyword_index import BM25Index
+from src.indexing.ranking import maximal_marginal_relevance, reciprocal_rank_fusion
+
+
+@pytest.fixture
+def index_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir) / "keyword_index.pkl"
+
+
+def test_bm25_matches_identifier_parts(index_path):
+    """snake_case/camelCase 식별자 부분 매칭 테스트"""
+    index = BM25Index(index_path)
+    index.add("a", "def parse_config_file(path):\n    return load(path)", {"file_path": "a.py"})
+    index.add("b", "class HttpRequestHandler:\n    pass", {"file_path": "b.py"})
+    index.add("c", "def unrelated(): return 1", {"file_path": "c.py"})
+
+    assert index.search("parse_config_file", k=1)[0]["id"] == "a"
+    assert index.search("request handler", k=1)[0]["id"] == "b"
+    assert index.search("HttpRequestHandler", k=3)[0]["metadata"] == {"file_path": "b.py"}
+    assert index.search("nonexistent_symbol", k=3) == []
+
+
+def test_bm25_persist_remove_and_replace(index_path):
+    """저장/재로드, 제거, 교체 테스트"""
+    index = BM25Index(index_path)
+    index.add("a", "def alpha(): pass")
+    index.add("b", "def beta(): pass")
+    index.save()
+
+    reloaded = BM25Index(index_path)
+    assert len(reloaded) == 2
+    reloaded.remove(["a"])
+    assert reloaded.search("alpha", k=5) == []
+
+    reloaded.add("b", "def gamma(): pass")
+    assert reloaded.search("beta", k=5) == []
+    assert reloaded.search("gamma", k=5)[0]["id"] == "b"
+    reloaded.add("d", "def delta(): pass")
+    assert len(reloaded) == 2
+
+
+def test_bm25_compacts_deleted_postings(index_path):
+    """삭제가 많을 때 저장 시 포스팅 압축 테스트"""
+    index = BM25Index(index_path)
+    for i in range(10):
+        index.add(str(i), f"def shared_name_{i}(): return shared")
+    index.remove([str(i) for i in range(8)])
+    index.save()
+
+    reloaded = BM25Index(index_path)
+    assert {r["id"] for r in reloaded.search("shared", k=10)} == {"8", "9"}
+    assert len(reloaded._postings["shared"][0]) == 2
+
+
+def test_bm25_saves_incrementally_and_upgrades_pickle(index_path):
+    """저장 시 전체 pickle을 다시 쓰지 않고, 이전 형식 색인을 변환하는지 테스트"""
+    import pickle
+    import sqlite3
+
+    index = BM25Index(index_path)
+    index.add("a", "def alpha(): pass")
+    index.save()
+    assert not index_path.exists()
+    index.add("b", "def beta(): pass")
+    index.save()
+    assert {r["id"] for r in BM25Index(index_path).search("alpha beta", k=5)} == {"a", "b"}
+
+    # 이전 형식: 포스팅 pickle + (slot, content, metadata) 본문 테이블
+    old_path = index_path.with_name("old.pkl")
+    conn = sqlite3.connect(str(old_path.with_suffix(".sqlite3")))
+    conn.execute("CREATE TABLE docs (slot INTEGER PRIMARY KEY, content TEXT, metadata TEXT)")
+    conn.executemany(
+        "INSERT INTO docs VALUES (?, ?, ?)",
+        [(0, "def gamma(): pass", '{"file_path": "g.py"}'), (2, "def delta(): pass", "{}")]
+    )
+    conn.commit()
+    conn.close()
+    with open(old_path, "wb") as f:
+        pickle.dump({"version": 2, "doc_ids": ["g", None, "d"]}, f)
+
+    upgraded = BM25Index(old_path)
+    assert len(upgraded) == 2
+    assert upgraded.search("gamma", k=1)[0]["metadata"] == {"file_path": "g.py"}
+    assert not old_path.exists()
+    upgraded.add("e", "def delta_two(): pass")
+    assert {r["id"] for r in upgraded.search("delta", k=5)} == {"d", "e"}
+
+
+def test_reciprocal_rank_fusion():
+    """RRF 결합 순위 테스트"""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "d"]])
+    assert [key for key, _ in fused][:2] == ["b", "c"]
+
+
+def test_maximal_marginal_relevance():
+    """MMR이 거의 같은 후보 대신 다른 후보를 고르는지 테스트"""
+    query = np.array([1.0, 0.0, 0.0])
+    candidates = np.array([
+        [0.9, 0.1, 0.0],
+        [0.9, 0.12, 0.0],
+        [0.6, 0.0, 0.8],
+    ])
+    assert maximal_marginal_relevance(query, candidates, 2, lambda_mult=1.0) == [0, 1]
+    assert maximal_marginal_relevance(query, candidates, 2, lambda_mult=0.5) == [0, 2]
+    assert maximal_marginal_relevance(query, candidates, 5) == [0, 2, 1]
+    assert maximal_marginal_relevance(query, candidates[:0], 3) == []
@@ -0,0 +1,43 @@
+"""Tests for indexing pipeline stages."""
+import threading
+import pytest
+from src.indexing.pipeline import threaded_stage
+
+
+def test_threaded_stage_preserves_order_and_bounds_queue():
+    """순서 유지 및 큐 크기 제한 테스트"""
+    produced = []
+    in_flight = []
+
+    def source():
+        for i in range(20):
+            produced.append(i)
+            in_flight.append(len(produced) - len(consumed))
+            yield i
+
+    consumed = []
+    for item in threaded_stage(source(), lambda x: x * 2, maxsize=2):
+        consumed.append(item)
+    assert consumed == [i * 2 for i in range(20)]
+    # 큐(2) + 스테이지가 처리 중인 항목 + 대기 중인 put 이상으로 앞서가지 않음
+    assert max(in_flight) <= 4
+
+
+def test_threaded_stage_propagates_errors():
+    """스테이지 예외가 소비자에게 전달되는지 테스트"""
+    def failing(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x
+
+    with pytest.raises(ValueError):
+        list(threaded_stage(iter(range(10)), failing))
+
+
+def test_threaded_stage_stops_when_consumer_stops():
+    """소비자가 중단하면 스테이지 스레드도 종료되는지 테스트"""
+    before = threading.active_count()
+    stage = threaded_stage(iter(range(1000)), maxsize=1)
+    assert next(stage) == 0
+    stage.close()
+    assert threading.active_count() == before
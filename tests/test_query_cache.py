@@ -0,0 +1,106 @@
+"""Tests for the search result / query embedding cache."""
+import pytest
+from src.indexing.embeddings import LocalHashEmbeddings
+from src.indexing.query_cache import LRUCache, QueryCache, normalize_query
+
+
+class CountingEmbeddings(LocalHashEmbeddings):
+    """embed_query 호출 횟수를 세는 임베딩"""
+    def __init__(self):
+        super().__init__()
+        self.query_calls = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return super().embed_query(text)
+
+
+@pytest.fixture
+def indexer(tmp_path, indexed_project):
+    return indexed_project(
+        tmp_path,
+        {"billing.py": "def compute_invoice_total(items):\n    return sum(items)\n"},
+        embeddings=CountingEmbeddings()
+    )
+
+
+def test_lru_eviction_and_stats():
+    """LRU 순서로 제거되고 적중 시 절약 시간이 집계되는지 테스트"""
+    cache = LRUCache(max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    assert cache.get_or_compute("a", lambda: -1) == 1
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.get_or_compute("b", lambda: 20) == 20
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 4, 2)
+    assert stats["saved_ms"] >= 0
+
+
+def test_results_keyed_by_generation_and_filters():
+    """generation이 바뀌면 이전 결과가 비워지고, 필터/k가 키에 포함되는지 테스트"""
+    cache = QueryCache()
+    assert cache.search(0, "semantic", "parse  config", 5, lambda: "g0") == "g0"
+    assert cache.search(0, "semantic", " parse config", 5, lambda: "miss") == "g0"
+    assert cache.search(0, "semantic", "parse config", 3, lambda: "k3") == "k3"
+    assert cache.search(0, "semantic", "parse config", 5, lambda: "f", filters={"language": ["python"]}) == "f"
+    assert cache.filter(0, ("ids", "src"), lambda: {"a"}) == {"a"}
+    assert cache.filter(0, ("ids", "src"), lambda: {"miss"}) == {"a"}
+
+    assert cache.search(1, "semantic", "parse config", 5, lambda: "g1") == "g1"
+    assert len(cache.results) == 1
+    assert len(cache.filters) == 0
+    assert normalize_query("  a\n\tb ") == "a b"
+
+
+def test_semantic_search_cache_invalidated_by_index_update(indexer, tmp_path):
+    """같은 쿼리는 임베딩/검색을 다시 하지 않고, 색인이 바뀌면 새 결과를 반환"""
+    embeddings = indexer.embeddings
+    first = indexer.semantic_search("invoice total", k=5)
+    assert indexer.semantic_search("invoice   total", k=5) == first
+    assert embeddings.query_calls == 1
+
+    (tmp_path / "invoice.py").write_text("def invoice_total():\n    return 0\n")
+    indexer.update_files([tmp_path / "invoice.py"])
+    refreshed = indexer.semantic_search("invoice total", k=5)
+
+    assert len(refreshed) == 2
+    # 쿼리 임베딩은 색인과 무관하므로 재사용
+    assert embeddings.query_calls == 1
+    stats = indexer.query_cache.stats()
+    assert stats["results"]["hits"] == 1
+    assert stats["embeddings"]["hits"] == 1
+
+
+def test_cached_results_are_copied_per_call(indexer):
+    """호출자가 반환된 문서를 수정해도 이후 캐시 적중 결과는 그대로인지 테스트"""
+    first = indexer.semantic_search("invoice total", k=2)
+    expected = [(doc.page_content, dict(doc.metadata)) for doc in first]
+    first[0].metadata["score"] = -1.0
+    first[0].page_content = "changed"
+    first.clear()
+    streamed = list(indexer.iter_semantic_search("sum items", k=2))[-1]
+    streamed[0].metadata["score"] = -1.0
+
+    for docs in (
+        indexer.semantic_search("invoice total", k=2),
+        indexer.semantic_search_many(["invoice total"], k=2)[0],
+        list(indexer.iter_semantic_search("invoice total", k=2))[-1],
+    ):
+        assert [(doc.page_content, doc.metadata) for doc in docs] == expected
+    assert indexer.semantic_search("sum items", k=2)[0].metadata["score"] != -1.0
+    assert indexer.query_cache.stats()["results"]["hits"] == 4
+
+
+def test_semantic_search_many_batches_misses(indexer):
+    """캐시된 쿼리는 재사용하고 나머지만 한 번에 임베딩/검색하는지 테스트"""
+    first = indexer.semantic_search("invoice total", k=2)
+    results = indexer.semantic_search_many(["invoice total", "sum items", "sum   items"], k=2)
+
+    assert results[0] == first
+    assert results[1] == results[2] == indexer.semantic_search("sum items", k=2)
+    # 배치 경로는 embed_query를 쿼리마다 부르지 않음
+    assert indexer.embeddings.query_calls == 1
+    stats = indexer.query_cache.stats()["results"]
+    assert (stats["hits"], stats["misses"]) == (2, 2)
@@ -0,0 +1,126 @@
+"""Tests for Search Engine MCP."""
+import asyncio
+import pytest
+import time
+from src.indexing.embeddings import LocalHashEmbeddings
+from src.mcp.tools.search_engine import SearchEngineMCP
+
+
+@pytest.fixture
+def search_engine(tmp_path, indexed_project):
+    indexer = indexed_project(tmp_path, {
+        "billing.py": "def compute_invoice_total(items):\n    return sum(items)\n",
+        "auth.py": (
+            "class SessionTokenValidator:\n"
+            "    def validate(self, token):\n"
+            "        return bool(token)\n"
+        ),
+    })
+    return SearchEngineMCP(indexer)
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_finds_exact_identifier(search_engine):
+    """정확한 식별자 키워드 검색 테스트"""
+    results = await search_engine.keyword_search("SessionTokenValidator", k=1)
+    assert results[0]["metadata"]["file_path"] == "auth.py"
+    assert results[0]["score"] > 0
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search(search_engine):
+    """하이브리드 검색 결과 테스트"""
+    results = await search_engine.hybrid_search("invoice total", k=2)
+    assert results[0]["metadata"]["file_path"] == "billing.py"
+    assert results[0]["score"] >= results[-1]["score"]
+
+
+@pytest.mark.asyncio
+async def test_search_without_indexer_returns_empty():
+    """인덱서 없이 검색 시 빈 결과"""
+    engine = SearchEngineMCP()
+    assert await engine.hybrid_search("anything") == []
+
+
+class SlowEmbeddings(LocalHashEmbeddings):
+    """임베딩 API 왕복을 흉내 내는 느린 임베딩"""
+    def embed_array(self, texts):
+        time.sleep(0.2)
+        return super().embed_array(texts)
+
+
+@pytest.mark.asyncio
+async def test_semantic_search_does_not_block_event_loop(search_engine):
+    """검색이 executor에서 실행되어 이벤트 루프와 다른 검색을 막지 않는지 테스트"""
+    search_engine.indexer.embeddings = SlowEmbeddings()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    start = time.perf_counter()
+    first, second, _ = await asyncio.gather(
+        search_engine.semantic_search("invoice total", k=1),
+        search_engine.semantic_search("session token", k=1),
+        ticker()
+    )
+    assert time.perf_counter() - start < 0.35
+    assert ticks == 10
+    assert first[0]["metadata"]["file_path"] == "billing.py"
+    assert first[0]["score"] > 0 and "score" not in first[0]["metadata"]
+    assert second[0]["metadata"]["file_path"] == "auth.py"
+
+    many = await search_engine.semantic_search_many(["invoice total", "session token"], k=1)
+    assert [r[0]["metadata"]["file_path"] for r in many] == ["billing.py", "auth.py"]
+
+
+@pytest.mark.asyncio
+async def test_search_stream_yields_keyword_first_then_complete(search_engine):
+    """스트리밍 검색이 키워드 결과 → 의미 결과 → complete 순으로 내보내는지 테스트"""
+    events = [event async for event in search_engine.search_stream("compute_invoice_total", k=2)]
+
+    assert events[0]["type"] == "result" and events[0]["source"] == "keyword"
+    assert events[0]["metadata"]["file_path"] == "billing.py"
+    assert events[-1]["type"] == "complete"
+    results = [event for event in events if event["type"] == "result"]
+    assert len({event["id"] for event in results}) == len(results) == events[-1]["results"]
+    assert events[-1]["ids"][0] == events[0]["id"]
+    semantic = [event for event in results if event["source"] == "semantic"]
+    assert all(0 < event["score"] <= 1.0 for event in semantic)
+
+    # 첫 결과만 받고 멈춰도 됨
+    async for event in search_engine.search_stream("session token", k=2):
+        assert event["type"] == "result"
+        break
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_executor_is_bounded():
+    """생산 스레드가 소비자보다 maxsize개 이상 앞서지 않고, 중단 시 이터레이터를 닫는지 테스트"""
+    from src.utils.async_iter import iterate_in_executor
+
+    produced, closed = [], []
+
+    def numbers():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            closed.append(True)
+
+    received = []
+    async for item in iterate_in_executor(numbers, maxsize=2):
+        received.append(item)
+        await asyncio.sleep(0.02)
+        assert len(produced) <= len(received) + 2
+        if len(received) == 5:
+            break
+    for _ in range(50):
+        if closed:
+            break
+        await asyncio.sleep(0.01)
+    assert closed and len(produced) <= 7
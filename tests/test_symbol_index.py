@@ -0,0 +1,78 @@
+"""Tests for Symbol Index."""
+import pytest
+from src.indexing.symbol_index import SymbolIndex, SYMBOL_INDEX_FILE
+
+
+SOURCE = '''
+class Config:
+    class Loader:
+        def load(self):
+            pass
+
+    def parse(self):
+        def helper():
+            pass
+        return helper
+
+    async def refresh(self):
+        pass
+
+
+def parse(text):
+    return text
+
+
+async def fetch():
+    pass
+'''
+
+
+@pytest.fixture
+def indexer(tmp_path, indexed_project):
+    return indexed_project(tmp_path, {"config.py": SOURCE})
+
+
+def locations(results):
+    return sorted((r["qualname"], r["kind"], r["start_line"]) for r in results)
+
+
+def test_find_definition(indexer):
+    """이름/정규화된 이름으로 정의 위치 조회"""
+    symbols = indexer.symbol_index
+
+    assert locations(symbols.find_definition("parse")) == [
+        ("Config.parse", "method", 7),
+        ("parse", "function", 16),
+    ]
+    assert locations(symbols.find_definition("Config.parse")) == [("Config.parse", "method", 7)]
+    assert locations(symbols.find_definition("parse", kind="function")) == [("parse", "function", 16)]
+    assert locations(symbols.find_definition("Loader.load")) == [("Config.Loader.load", "method", 4)]
+    # 함수 안의 지역 함수는 메서드가 아님
+    assert locations(symbols.find_definition("helper")) == [("helper", "function", 8)]
+    assert symbols.find_definition("Other.parse") == []
+
+
+def test_list_methods(indexer):
+    """클래스의 메서드 목록"""
+    symbols = indexer.symbol_index
+
+    assert [m["name"] for m in symbols.list_methods("Config")] == ["parse", "refresh"]
+    assert [m["name"] for m in symbols.list_methods("Config.Loader")] == ["load"]
+    assert symbols.list_methods("Missing") == []
+
+
+def test_incremental_update_and_reload(indexer, tmp_path):
+    """파일 변경 시 해당 파일의 심볼만 교체되고 디스크에 유지되는지 테스트"""
+    (tmp_path / "config.py").write_text("def parse_v2():\n    pass\n")
+    (tmp_path / "other.py").write_text("class Other:\n    def run(self):\n        pass\n")
+    indexer.index_project()
+
+    reopened = SymbolIndex(tmp_path / ".cursor_index" / SYMBOL_INDEX_FILE)
+    assert reopened.find_definition("parse") == []
+    assert locations(reopened.find_definition("parse_v2")) == [("parse_v2", "function", 1)]
+    assert [m["name"] for m in reopened.list_methods("Other")] == ["run"]
+    assert len(reopened) == 3
+
+    (tmp_path / "other.py").unlink()
+    indexer.index_project()
+    assert reopened.list_methods("Other") == []
@@ -0,0 +1,90 @@
+"""Tests for tree-sitter JS/TS chunking."""
+import pytest
+from pathlib import Path
+
+pytest.importorskip("tree_sitter_typescript")
+pytest.importorskip("tree_sitter_javascript")
+
+from src.indexing.codebase_indexer import extract_chunks
+from src.indexing.syntax_chunker import ParseCache, extract_syntax_chunks
+
+
+TS_SOURCE = b'''import { Base } from "./base";
+
+export class Store<T> extends Base {
+  private items: T[] = [];
+
+  add(item: T): void {
+    this.items.push(item);
+  }
+}
+
+export interface Props {
+  name: string;
+}
+
+const handler = async (req: Request) => {
+  return req.url;
+};
+
+const limit = 10;
+
+export default function main() {
+  return new Store<number>();
+}
+'''
+
+
+def test_typescript_chunks():
+    """클래스/메서드/인터페이스/함수 및 화살표 함수 선언 추출"""
+    chunks = extract_syntax_chunks(TS_SOURCE, ".ts")
+
+    assert [(c[0], c[1], c[2]) for c in chunks] == [
+        ("class_declaration", 3, 9),
+        ("method_definition", 6, 8),
+        ("interface_declaration", 11, 13),
+        ("arrow_function", 15, 17),
+        ("function_declaration", 21, 23),
+        ("program", 1, 23),
+    ]
+    assert chunks[1][3].startswith("add(item: T): void {")
+    # 클래스 청크는 메서드 본문을 접은 골격, 모듈 청크는 최상위 정의를 접은 파일
+    assert "add(item: T): void { ... }" in chunks[0][3]
+    assert "this.items.push" not in chunks[0][3]
+    assert "const limit = 10;" in chunks[5][3]
+    assert "return req.url" not in chunks[5][3]
+
+
+def test_jsx_and_tsx():
+    """JSX가 포함된 파일도 해당 문법으로 파싱"""
+    jsx = b"const App = () => <div>hi</div>;\nfunction Row() { return <tr/>; }\n"
+    tsx = b"export const App = (p: Props) => <div>{p.name}</div>;\n"
+
+    assert [c[0] for c in extract_syntax_chunks(jsx, ".jsx")] == ["arrow_function", "function_declaration"]
+    assert [c[0] for c in extract_syntax_chunks(tsx, ".tsx")] == ["arrow_function"]
+
+
+def test_incremental_reparse_matches_full_parse():
+    """증분 파싱 결과가 전체 파싱과 같은지 테스트"""
+    cache = ParseCache()
+    extract_syntax_chunks(TS_SOURCE, ".ts", key="store.ts", parse_cache=cache)
+
+    edited = TS_SOURCE.replace(b"this.items.push(item);", b"this.items.push(item);\n    this.emit();")
+    chunks = extract_syntax_chunks(edited, ".ts", key="store.ts", parse_cache=cache)
+
+    assert chunks == extract_syntax_chunks(edited, ".ts")
+    assert (cache.full_parses, cache.incremental_parses) == (1, 1)
+    assert chunks[4][1:3] == (22, 24)
+
+
+def test_extract_chunks_for_js_file(tmp_path):
+    """extract_chunks가 JS 파일을 청킹하는지 테스트"""
+    (tmp_path / "src").mkdir()
+    file_path = tmp_path / "src" / "util.js"
+    file_path.write_text("function add(a, b) {\n  return a + b;\n}\n")
+
+    chunks = extract_chunks(file_path, tmp_path)
+    assert len(chunks) == 1
+    assert chunks[0].language == "javascript"
+    assert chunks[0].chunk_type == "function_declaration"
+    assert chunks[0].file_path == str(Path("src") / "util.js")
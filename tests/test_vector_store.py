@@ -0,0 +1,344 @@
+"""Tests for Mmap Vector Store."""
+import numpy as np
+import pytest
+import tempfile
+from pathlib import Path
+from src.indexing.embeddings import LocalHashEmbeddings
+from src.indexing.vector_store import MmapVectorStore
+
+
+@pytest.fixture
+def store_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir) / "vectors"
+
+
+TEXTS = [
+    "def parse_config_file(path): return load(path)",
+    "def render_html_template(template): return template",
+    "class DatabaseConnection: pass",
+]
+
+
+def test_exact_search_matches_brute_force(store_dir):
+    """정확 top-k가 전수 계산 결과와 같은지 테스트"""
+    embeddings = LocalHashEmbeddings(dim=64)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 64)).astype(np.float32)
+    store = MmapVectorStore(str(store_dir), embeddings)
+    store.SCORE_BLOCK_ROWS = 128
+    store.add_vectors(vectors, [str(i) for i in range(500)], ids=[f"id{i}" for i in range(500)])
+
+    query = rng.normal(size=64).astype(np.float32)
+    rows, scores = store.top_k(query, 10)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+    assert list(rows) == list(expected)
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_persist_reopen_delete_and_upsert(store_dir):
+    """재오픈, 삭제, 같은 ID 교체 테스트"""
+    embeddings = LocalHashEmbeddings()
+    store = MmapVectorStore(str(store_dir), embeddings, dtype="float16")
+    store.add_texts(TEXTS, metadatas=[{"i": i} for i in range(3)], ids=["a", "b", "c"])
+
+    reopened = MmapVectorStore(str(store_dir), embeddings)
+    assert reopened.dtype == np.float16
+    doc, score = reopened.similarity_search_with_score("parse config", k=1)[0]
+    assert doc.metadata == {"i": 0}
+    assert 0 < score <= 1.0
+
+    reopened.delete(ids=["a"])
+    assert [d.metadata["i"] for d in reopened.similarity_search("parse config", k=3)] != [0]
+    assert len(reopened.similarity_search("parse config", k=3)) == 2
+
+    reopened.add_texts(["def parse_config_v2(): pass"], metadatas=[{"i": 9}], ids=["b"])
+    assert len(reopened) == 2
+    assert reopened.similarity_search("parse config", k=1)[0].metadata == {"i": 9}
+
+
+def test_compact_drops_deleted_rows(store_dir):
+    """압축 후에도 검색 결과가 유지되는지 테스트"""
+    store = MmapVectorStore(str(store_dir), LocalHashEmbeddings())
+    store.add_texts(TEXTS, ids=["a", "b", "c"])
+    store.delete(ids=["a", "b"])
+    store.persist()
+    assert store.num_rows == 1
+    assert store.similarity_search("database connection", k=5)[0].page_content == TEXTS[2]
+
+
+def clustered_vectors(rng, n, dim=32, clusters=20):
+    centers = rng.normal(size=(clusters, dim))
+    return (centers[rng.integers(clusters, size=n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+@pytest.mark.parametrize("kind, params", [
+    ("ivf", {"nlist": 16, "nprobe": 8}),
+    ("hnsw", {"m": 16, "ef_search": 64}),
+])
+def test_ann_search_incremental_and_persist(store_dir, kind, params):
+    """ANN 검색의 재현율, 증분 삽입, 삭제 필터링, 저장/재사용, 압축 후 재구축 테스트"""
+    pytest.importorskip("faiss")
+    from src.indexing.ann_index import AnnIndex
+
+    rng = np.random.default_rng(0)
+    embeddings = LocalHashEmbeddings(dim=32)
+    vectors = clustered_vectors(rng, 3000)
+    store = MmapVectorStore(str(store_dir), embeddings, ann=AnnIndex(kind, min_rows=1000, **params))
+    store.add_vectors(vectors[:2000], ["x"] * 2000, ids=[f"id{i}" for i in range(2000)])
+
+    queries = clustered_vectors(rng, 20)
+    exact = MmapVectorStore(str(store_dir.parent / "exact"), embeddings)
+    exact.add_vectors(vectors[:2000], ["x"] * 2000, ids=[f"id{i}" for i in range(2000)])
+    hits = sum(
+        len(set(store.top_k(q, 10)[0]) & set(exact.top_k(q, 10)[0])) for q in queries
+    )
+    assert hits / (10 * len(queries)) >= 0.9
+    assert store.ann.rows == 2000
+
+    # 새 행은 다음 검색 때 색인에 증분 삽입
+    store.add_vectors(vectors[2000:], ["x"] * 1000, ids=[f"id{i}" for i in range(2000, 3000)])
+    assert store.top_k(vectors[2500], 1)[0][0] == 2500
+    assert store.ann.rows == 3000
+
+    store.delete(ids=["id2500"])
+    assert 2500 not in store.top_k(vectors[2500], 5)[0]
+    store.persist()
+
+    reopened = MmapVectorStore(
+        str(store_dir), embeddings, ann=AnnIndex(kind, min_rows=1000, **params)
+    )
+    reopened._sync_ann()
+    assert reopened.ann.ntotal == 3000 and not reopened._ann_dirty
+
+    # 압축으로 행 번호가 바뀌면 색인을 다시 만든다
+    reopened.delete(ids=[f"id{i}" for i in range(1600)])
+    reopened.persist()
+    rows, _ = reopened.top_k(vectors[2999], 1)
+    assert reopened._fetch([int(rows[0])])[int(rows[0])][0] == "id2999"
+    assert reopened.ann.ntotal == 1399
+
+
+def test_int8_quantized_search_and_rescore(store_dir):
+    """int8 저장의 메모리 절감, 재현율, float32 재채점, 압축 후 일관성 테스트"""
+    rng = np.random.default_rng(1)
+    embeddings = LocalHashEmbeddings(dim=64)
+    vectors = clustered_vectors(rng, 2000, dim=64)
+    ids = [f"id{i}" for i in range(2000)]
+    exact = MmapVectorStore(str(store_dir.parent / "exact"), embeddings)
+    exact.add_vectors(vectors, ["x"] * 2000, ids=ids)
+    store = MmapVectorStore(str(store_dir), embeddings, dtype="int8", rescore=4)
+    store.add_vectors(vectors[:1000], ["x"] * 1000, ids=ids[:1000])
+    store.add_vectors(vectors[1000:], ["x"] * 1000, ids=ids[1000:])
+
+    assert store.memory_bytes() == 2000 * (64 + 4)
+    assert exact.memory_bytes() == 2000 * 64 * 4
+
+    queries = clustered_vectors(rng, 20, dim=64)
+    for query in queries:
+        expected_rows, expected_scores = exact.top_k(query, 10)
+        rows, scores = store.top_k(query, 10)
+        # 재채점된 점수는 float32 점수와 같음
+        assert list(rows) == list(expected_rows)
+        assert np.allclose(scores, expected_scores, atol=1e-5)
+
+    store.rescore = 0
+    hits = sum(len(set(store.top_k(q, 10)[0]) & set(exact.top_k(q, 10)[0])) for q in queries)
+    assert hits / 200 >= 0.9
+
+    store.rescore = 4
+    store.delete(ids=ids[:1500])
+    store.compact()
+    reopened = MmapVectorStore(str(store_dir), embeddings, rescore=4)
+    assert reopened.dtype == np.int8 and reopened.full_precision
+    rows, _ = reopened.top_k(vectors[1999], 1)
+    assert reopened._fetch([int(rows[0])])[int(rows[0])][0] == "id1999"
+
+
+def test_ivfpq_with_rescore(store_dir):
+    """PQ 근사 점수를 float32로 재채점하면 재현율이 회복되는지 테스트"""
+    pytest.importorskip("faiss")
+    from src.indexing.ann_index import AnnIndex
+
+    rng = np.random.default_rng(2)
+    embeddings = LocalHashEmbeddings(dim=32)
+    vectors = clustered_vectors(rng, 4000)
+    exact = MmapVectorStore(str(store_dir.parent / "exact"), embeddings)
+    exact.add_vectors(vectors, ["x"] * 4000, ids=[str(i) for i in range(4000)])
+    ann = AnnIndex("ivfpq", nlist=16, nprobe=16, pq_m=8, min_rows=1000)
+    store = MmapVectorStore(str(store_dir), embeddings, ann=ann)
+    store.add_vectors(vectors, ["x"] * 4000, ids=[str(i) for i in range(4000)])
+
+    queries = clustered_vectors(rng, 20)
+
+    def recall():
+        return sum(
+            len(set(store.top_k(q, 10)[0]) & set(exact.top_k(q, 10)[0])) for q in queries
+        ) / 200
+
+    approximate = recall()
+    store.rescore = 8
+    assert recall() >= max(approximate, 0.9)
+    assert ann.memory_bytes() == 4000 * (8 + 8)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_top_k_restricted_to_rows(store_dir, dtype):
+    """행 제한 검색이 후보 안에서의 전수 계산과 같은지 테스트 (후보 행 스캔/마스크 경로)"""
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(400, 32)).astype(np.float32)
+    store = MmapVectorStore(str(store_dir), LocalHashEmbeddings(dim=32), dtype=dtype, rescore=4)
+    store.add_vectors(vectors, [str(i) for i in range(400)], ids=[f"id{i}" for i in range(400)])
+    store.delete(ids=["id0", "id2"])
+
+    query = rng.normal(size=32).astype(np.float32)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normalized @ (query / np.linalg.norm(query))
+    for allowed in (range(0, 400, 10), range(0, 400, 2)):
+        rows = store.rows_for_ids([f"id{i}" for i in allowed] + ["missing"])
+        found, _ = store.top_k(query, 5, rows=rows)
+        live = [i for i in allowed if i not in (0, 2)]
+        expected = sorted(live, key=lambda i: -scores[i])[:5]
+        assert list(found) == expected
+
+    assert len(store.top_k(query, 5, rows=store.rows_for_ids(["id0"]))[0]) == 0
+
+
+@pytest.mark.parametrize("dtype", ["float32", "int8"])
+def test_top_k_many_matches_single_queries(store_dir, dtype):
+    """한 번의 스캔으로 계산한 다중 쿼리 결과가 쿼리별 top_k와 같은지 테스트"""
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(300, 32)).astype(np.float32)
+    store = MmapVectorStore(str(store_dir), LocalHashEmbeddings(dim=32), dtype=dtype, rescore=4)
+    store.add_vectors(vectors, [str(i) for i in range(300)], ids=[f"id{i}" for i in range(300)])
+    store.delete(ids=["id1"])
+
+    queries = rng.normal(size=(6, 32)).astype(np.float32)
+    rows = store.rows_for_ids([f"id{i}" for i in range(0, 300, 2)])
+    for restrict in (None, rows):
+        batched = store.top_k_many(queries, 7, rows=restrict)
+        for query, (found, scores) in zip(queries, batched):
+            expected, expected_scores = store.top_k(query, 7, rows=restrict)
+            assert list(found) == list(expected)
+            assert np.allclose(scores, expected_scores)
+
+    docs = store.similarity_search_by_vectors(queries[:2].tolist(), k=3)
+    assert [len(d) for d in docs] == [3, 3]
+    assert docs[0][0].page_content == str(store.top_k(queries[0], 1)[0][0])
+
+
+def test_iter_top_k_streams_shards(store_dir):
+    """샤드마다 중간 top-k를 내보내고 마지막 값이 top_k와 같은지 테스트"""
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(1000, 16)).astype(np.float32)
+    store = MmapVectorStore(str(store_dir), LocalHashEmbeddings(dim=16))
+    store.STREAM_SHARD_ROWS = 256
+    store.add_vectors(vectors, [str(i) for i in range(1000)], ids=[f"id{i}" for i in range(1000)])
+
+    query = rng.normal(size=16).astype(np.float32)
+    snapshots = list(store.iter_top_k(query, 5))
+    assert len(snapshots) == 4
+    # 본 행이 늘수록 k번째 점수는 줄지 않음
+    assert all(a[1][-1] <= b[1][-1] for a, b in zip(snapshots, snapshots[1:]))
+    assert all(rows.max() < 256 * (i + 1) for i, (rows, _) in enumerate(snapshots))
+    expected = store.top_k(query, 5)
+    assert list(snapshots[-1][0]) == list(expected[0])
+
+    # 선택적인 필터는 후보 행 스캔 한 번으로 끝남
+    assert len(list(store.iter_top_k(query, 5, rows=store.rows_for_ids(["id3", "id9"])))) == 1
+
+
+def test_compact_recovers_after_crash_and_waits_for_readers(store_dir, monkeypatch):
+    """압축 커밋 후 파일 교체 전 중단 시 재오픈 복구, 검색 중 압축 대기 테스트"""
+    import threading
+    from src.indexing import vector_store
+
+    embeddings = LocalHashEmbeddings(dim=32)
+    vectors = np.random.default_rng(3).normal(size=(200, 32)).astype(np.float32)
+    store = MmapVectorStore(str(store_dir), embeddings, dtype="int8")
+    store.add_vectors(vectors, [str(i) for i in range(200)], ids=[f"id{i}" for i in range(200)])
+    store.delete(ids=[f"id{i}" for i in range(150)])
+
+    def crash(src, dst):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(vector_store.os, "replace", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+
+    reopened = MmapVectorStore(str(store_dir), embeddings)
+    assert reopened.generation == 1 and reopened.num_rows == 50
+    assert not list(store_dir.glob("*.tmp"))
+    for i in (150, 199):
+        [(doc, _)] = reopened.similarity_search_by_vector_with_score(vectors[i], k=1)
+        assert doc.page_content == str(i)
+
+    # 검색이 공유 락을 잡고 있는 동안 압축은 기다린다
+    reopened.delete(ids=["id150"])
+    compacted = threading.Event()
+    with reopened.reading():
+        worker = threading.Thread(target=lambda: (reopened.compact(), compacted.set()))
+        worker.start()
+        assert not compacted.wait(0.2)
+    worker.join(5)
+    assert compacted.is_set() and reopened.generation == 2
+
+
+def test_paused_stream_does_not_block_persist(store_dir):
+    """멈춘 스트리밍 검색이 persist/압축을 막지 않고, 압축 후 다시 스캔하거나 멈추는지 테스트"""
+    import threading
+
+    rng = np.random.default_rng(11)
+    vectors = rng.normal(size=(1000, 16)).astype(np.float32)
+    store = MmapVectorStore(str(store_dir), LocalHashEmbeddings(dim=16))
+    store.STREAM_SHARD_ROWS = 256
+    store.add_vectors(vectors, [str(i) for i in range(1000)], ids=[f"id{i}" for i in range(1000)])
+    query = rng.normal(size=16).astype(np.float32)
+
+    stream = store.iter_similarity_search_by_vector_with_score(query, k=3)
+    filtered = store.iter_top_k(query, 3, rows=np.arange(0, 1000, 2))
+    next(stream)
+    next(filtered)
+    # 압축이 필요 없는 persist와 압축 모두 소비자를 기다리지 않음
+    store.persist()
+    store.delete(ids=[f"id{i}" for i in range(600)])
+    worker = threading.Thread(target=store.persist)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive() and store.generation == 1
+
+    # 전체 검색은 새 행 번호로 다시 스캔하고, 옛 행 번호로 제한된 검색은 멈춤
+    last = list(stream)[-1]
+    expected = store.similarity_search_by_vector_with_score(query, k=3)
+    assert [doc.page_content for doc, _ in last] == [doc.page_content for doc, _ in expected]
+    assert list(filtered) == []
+
+
+def test_waiting_compaction_is_not_starved_by_new_readers(store_dir):
+    """압축이 기다리는 동안 새 검색은 압축 뒤에 줄을 서는지 테스트"""
+    import threading
+
+    store = MmapVectorStore(str(store_dir), LocalHashEmbeddings(dim=16))
+    store.add_vectors(np.eye(16, dtype=np.float32), [str(i) for i in range(16)])
+    seen = []
+
+    def search():
+        with store.reading():
+            seen.append(store.generation)
+
+    with store.reading():
+        writer = threading.Thread(target=store.compact)
+        writer.start()
+        while not store._shared._waiting_writers:
+            threading.Event().wait(0.01)
+        reader = threading.Thread(target=search)
+        reader.start()
+        # 이미 공유 락을 가진 스레드의 재진입은 기다리지 않음
+        assert len(store.top_k(np.ones(16), 1)[0]) == 1
+        reader.join(0.2)
+        assert seen == []
+    writer.join(5)
+    reader.join(5)
+    assert seen == [1]
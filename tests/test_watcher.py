@@ -0,0 +1,91 @@
+"""Tests for Index Watcher."""
+import asyncio
+import sys
+import pytest
+from src.indexing.watcher import IndexWatcher
+from src.mcp.tools.file_system import FileSystemTools
+
+
+BACKENDS = ["polling"] + (["inotify"] if sys.platform.startswith("linux") else [])
+
+
+@pytest.fixture
+def indexer(tmp_path, indexed_project):
+    return indexed_project(tmp_path, {"app.py": "def original_handler():\n    return 1\n"})
+
+
+def indexed_names(indexer):
+    return {r["metadata"]["file_path"] for r in indexer.keyword_search("handler", k=20)}
+
+
+def test_update_files(indexer, tmp_path):
+    """지정한 파일만 갱신하고 generation 증가"""
+    generation = indexer.generation
+    (tmp_path / "new.py").write_text("def new_handler():\n    pass\n")
+    (tmp_path / "notes.txt").write_text("handler")
+
+    summary = indexer.update_files([tmp_path / "new.py", tmp_path / "notes.txt"])
+    assert summary["added"] == 1
+    assert indexer.generation == generation + 1
+    assert indexed_names(indexer) == {"app.py", "new.py"}
+
+    # 내용이 같으면 generation 유지
+    assert indexer.update_files([tmp_path / "new.py"])["unchanged"] == 1
+    assert indexer.generation == generation + 1
+
+    (tmp_path / "app.py").unlink()
+    assert indexer.update_files([tmp_path / "app.py"])["deleted"] == 1
+    assert indexed_names(indexer) == {"new.py"}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_watcher_picks_up_changes(indexer, tmp_path, backend):
+    """파일 생성/수정/삭제가 전체 재인덱싱 없이 반영되는지 테스트"""
+    with IndexWatcher(
+        indexer, debounce=0.05, backend=backend, poll_interval=0.1, hook_writes=False
+    ) as watcher:
+        generation = watcher.generation
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "views.py").write_text("def view_handler():\n    pass\n")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("function handler() {}\n")
+        assert watcher.wait_for_generation(generation + 1, timeout=5)
+        assert indexed_names(indexer) == {"app.py", "pkg/views.py"}
+
+        generation = watcher.generation
+        (tmp_path / "app.py").unlink()
+        assert watcher.wait_for_generation(generation + 1, timeout=5)
+        assert indexed_names(indexer) == {"pkg/views.py"}
+
+    assert watcher.last_error is None
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify only")
+def test_watcher_removed_directory(indexer, tmp_path):
+    """디렉토리 삭제 시 그 아래 색인 항목 제거"""
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "a.py").write_text("def a_handler():\n    pass\n")
+    (package / "b.py").write_text("def b_handler():\n    pass\n")
+    indexer.index_project()
+
+    with IndexWatcher(indexer, debounce=0.05, backend="inotify", hook_writes=False) as watcher:
+        generation = watcher.generation
+        for child in package.iterdir():
+            child.unlink()
+        package.rmdir()
+        assert watcher.wait_for_generation(generation + 1, timeout=5)
+        # 파일 삭제와 디렉토리 삭제 이벤트가 나뉘어 처리될 수 있으므로 잠시 더 대기
+        watcher.wait_for_generation(generation + 2, timeout=0.5)
+        assert indexed_names(indexer) == {"app.py"}
+
+
+def test_write_file_hook(indexer, tmp_path):
+    """FileSystemTools.write_file 알림으로 즉시 반영 (OS 이벤트 없이)"""
+    with IndexWatcher(indexer, debounce=0.05, backend="polling", poll_interval=60) as watcher:
+        generation = watcher.generation
+        asyncio.run(FileSystemTools.write_file(
+            str(tmp_path / "written.py"), "def written_handler():\n    pass\n"
+        ))
+        assert watcher.wait_for_generation(generation + 1, timeout=5)
+        assert "written.py" in indexed_names(indexer)